@@ -37,7 +37,9 @@ if __name__ == '__main__':
 	parser.add_argument('-r', '--result-folder', help='folder for storing benchmark result files, default is given by timestamp', default=None)
 	parser.add_argument('-g', '--generate-output', help='generate new report files', default='no', choices=['no','yes'])
 	parser.add_argument('-e', '--generate-evaluation', help='generate new evaluation file', default='no', choices=['no','yes'])
-	parser.add_argument('-w', '--working', help='working per query or connection', default='query', choices=['query','connection'])
+	parser.add_argument('-w', '--working', help='working per query or connection, or all connections in parallel', default='query', choices=['query','connection','parallel'])
+	parser.add_argument('-sh', '--serialize-hosts', help='in parallel working, connections sharing a host run one after the other', action='store_true', default=False)
+	parser.add_argument('-j', '--journal', help='append finished runs to a journal, so continue resumes from the last durable run', action='store_true', default=False)
 	parser.add_argument('-a', '--anonymize', help='anonymize all dbms', action='store_true', default=False)
 	parser.add_argument('-u', '--unanonymize', help='unanonymize some dbms, only sensible in combination with anonymize', nargs='*', default=[])
 	parser.add_argument('-p', '--numProcesses', help='Number of parallel client processes. Global setting, can be overwritten by connection. If None given, half of all available processes is taken', default=None)
@@ -83,6 +85,8 @@ if __name__ == '__main__':
 		unanonymize=args.unanonymize,
 		numProcesses=args.numProcesses,
 		seed=args.seed)
+	experiments.serializeHosts = args.serialize_hosts
+	experiments.journal = args.journal
 	experiments.getConfig(args.config_folder, args.connection_file, args.query_file)
 	# switch for args.mode
 	if args.mode == 'read':
@@ -114,6 +118,7 @@ if __name__ == '__main__':
 		experiments.reporter.append(benchmarker.reporter.ploter(experiments))
 		experiments.reporter.append(benchmarker.reporter.boxploter(experiments))
 		experiments.reporter.append(benchmarker.reporter.tps(experiments))
+		experiments.reporter.append(benchmarker.reporter.scalability(experiments))
 		experiments.reporter.append(benchmarker.reporter.hister(experiments))
 		# generate latex report
 		experiments.reporter.append(benchmarker.reporter.latexer(experiments, args.latex_template))
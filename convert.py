@@ -0,0 +1,43 @@
+"""
+    Command line interface for converting result folders of the Python Package DBMS Benchmarker into experiment databases
+    Copyright (C) 2020  Patrick Erdelt
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as
+    published by the Free Software Foundation, either version 3 of the
+    License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Affero General Public License for more details.
+
+    You should have received a copy of the GNU Affero General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import logging
+import argparse
+
+from dbmsbenchmarker import *
+
+logging.basicConfig(level=logging.ERROR)
+
+if __name__ == '__main__':
+	description = """Import result folders into experiment databases (one SQLite file per experiment)
+	"""
+	# argparse
+	parser = argparse.ArgumentParser(description=description)
+	parser.add_argument('-r', '--result-folder', help='folder containing result folders', default='./')
+	parser.add_argument('-c', '--code', help='code of experiment to convert, default is all experiments in the result folder', default=None)
+	parser.add_argument('-o', '--output', help='name of SQLite file, default is experiment.sqlite inside of the result folder of the experiment. Only together with -c', default=None)
+	args = parser.parse_args()
+	if args.output is not None and args.code is None:
+		# each experiment replaces the content of the file
+		parser.error('-o/--output needs -c/--code, a SQLite file contains a single experiment')
+	if args.code is None:
+		codes = inspector.inspector(args.result_folder).list_experiments
+	else:
+		codes = [str(args.code)]
+	for code in codes:
+		filename = experimentdb.convert(args.result_folder, code, args.output)
+		print("Experiment {} has been stored in {}".format(code, filename))
@@ -476,6 +476,7 @@ class Graph:
         preset_to_unit = {'heatmap_errors': 'bool',
                           'heatmap_warnings': 'bool',
                           'heatmap_total_time': 'ms',
+                          'heatmap_latency_percentiles': 'ms',
                           'barchart_ingestion_time': 's',
                           'heatmap_result_set_size': ''}
 
@@ -491,6 +492,9 @@ class Graph:
             if self.preset in ['heatmap_errors', 'heatmap_warnings', 'heatmap_result_set_size', 'heatmap_total_time']:
                 return title
 
+            if self.preset == 'heatmap_latency_percentiles':
+                return title.replace('percentiles', 'p99')
+
         else:
             if self.type == 'monitoring':
                 try:
@@ -914,7 +918,7 @@ class Graph:
         if 'heatmap' in self.preset:
             df_text = None
 
-            if self.preset in ['heatmap_result_set_size', 'heatmap_total_time']:
+            if self.preset in ['heatmap_result_set_size', 'heatmap_total_time', 'heatmap_latency_percentiles']:
 
                 if self.preset == 'heatmap_result_set_size':
                     # evaluate.get_total_resultsize()
@@ -925,8 +929,14 @@ class Graph:
                     #e.get_total_times_normalized()
                     #e.get_total_times_relative()
 
+                elif self.preset == 'heatmap_latency_percentiles':
+                    # uncorrected and corrected for coordinated omission side by side
+                    df = e.get_total_latency_percentiles('p99')
+                    if self.connection_ids:
+                        df = df[df.index.isin(self.connection_ids)]
+
                 if self.query_id:
-                    df = df[[f'Q{self.query_id}']]
+                    df = df[[column for column in [f'Q{self.query_id}', f'Q{self.query_id} corrected'] if column in df.columns]]
 
                 if self.connection_aggregate is not None:
                     df = self.calculate_connection_aggregate(df, e)
@@ -1768,7 +1778,7 @@ def toggle_settings_visibility(active_graph, store_dashboard_config, code):
                 elif graph['preset'] == 'barchart_ingestion_time':
                     to_show |= dd_connection_aggregate | dd_graph_colorby
 
-                elif graph['preset'] == 'heatmap_total_time':
+                elif graph['preset'] in ['heatmap_total_time', 'heatmap_latency_percentiles']:
                     to_show |= dd_connection_aggregate | dd_graph_colorby
 
                 # add xaxis dropdown and annotate option for all heatmaps except heatmap_errors and heatmap_warnings
@@ -1,4 +1,4 @@
 """
 The dbmsbenchmarker module
 """
-__all__ = ["benchmarker","reporter","tools","parameter","inspector","monitor","evaluator"]
+__all__ = ["benchmarker","reporter","tools","parameter","inspector","monitor","evaluator","distributed","experimentdb"]
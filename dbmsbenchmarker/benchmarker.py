@@ -29,17 +29,21 @@ import time
 import re
 import hashlib
 import pickle
+import copy
 import sys
 import json
 import math
+import statistics
 from operator import itemgetter
 from collections import Counter
 import multiprocessing as mp
+import threading
 from timeit import default_timer
 import random
 from operator import add
 from dbmsbenchmarker import tools, reporter, parameter, monitor, evaluator
 import pprint
+import glob
 #import dill
 #from jpype.pickle import JPickler, JUnpickler
 
@@ -54,10 +58,13 @@ class singleRunInput:
 	"""
 	Class for collecting info about a benchmark run
 	"""
-	def __init__(self, numRun, queryString, queryConfig):
+	def __init__(self, numRun, queryString, queryConfig, queryTemplate=None, parameter=None):
 		self.numRun = numRun
 		self.queryString = queryString
 		self.queryConfig = queryConfig
+		# prepared statements only: template and values of parameters
+		self.queryTemplate = queryTemplate
+		self.parameter = parameter
 
 
 
@@ -70,7 +77,7 @@ class singleRunOutput:
 
 
 
-def singleRun(connectiondata, inputConfig, numRuns, connectionname, numQuery, path=None, activeConnections = [], BENCHMARKER_VERBOSE_QUERIES=False):
+def singleRun(connectiondata, inputConfig, numRuns, connectionname, numQuery, path=None, activeConnections = [], BENCHMARKER_VERBOSE_QUERIES=False, schedule=None, activeConnection=None, journal=None):
 	"""
 	Function for running an actual benchmark run
 
@@ -80,6 +87,10 @@ def singleRun(connectiondata, inputConfig, numRuns, connectionname, numQuery, pa
 	:param connectionname: Name of the connection
 	:param numQuery: Number of the query, 1...
 	:param path: Result path, for optional storing received data
+	:param schedule: Open loop only: Dict containing queue (of numbers of runs), barrier, offsets (intended starts in seconds) and client (number of connection). numRuns is ignored then.
+		Duration mode only: Dict containing duration and durationWarmup (seconds), counter and lock (shared number of next run), barrier, client, template, parameters and seed. numRuns is ignored then.
+	:param activeConnection: Established connection (tools.dbms object) to use and keep open, for example of a stream
+	:param journal: Path and prefix of journal files. If set, each finished run is appended to the journal of this process.
 	:return: returns object of class singleRunOutput
 	"""
 	#global activeConnections
@@ -90,11 +101,21 @@ def singleRun(connectiondata, inputConfig, numRuns, connectionname, numQuery, pa
 	results = []
 	# compute number of (parallel) connection
 	# example: 5/6/7/8 yields number 1 (i.e. the second one)
+	bOpenLoop = schedule is not None and 'queue' in schedule
+	bDuration = schedule is not None and 'duration' in schedule
+	if schedule is not None:
+		# open loop / duration: runs are not known in advance, settings are taken from first run
+		numRuns = [0]
+		if bDuration:
+			parameter.defaultParameters = schedule['defaultParameters']
 	numActiveConnection = math.floor(numRuns[0]/len(numRuns))
 	#activeConnections = JUnpickler.loads(activeConnections)
 	#print(numActiveConnection)
 	#print(len(activeConnections))
-	if len(activeConnections) > numActiveConnection:
+	if activeConnection is not None:
+		connection = activeConnection
+		durationConnect = 0.0
+	elif len(activeConnections) > numActiveConnection:
 		print("Found active connection #"+str(numActiveConnection))
 		connection = activeConnections[numActiveConnection]
 		durationConnect = 0.0
@@ -110,18 +131,79 @@ def singleRun(connectiondata, inputConfig, numRuns, connectionname, numQuery, pa
 		connection.connect()
 		end = default_timer()
 		durationConnect = 1000.0*(end - start)
-	print(("singleRun batch size %i: " % len(numRuns)))
-	print(("numRun %s: " % ("/".join([str(i+1) for i in numRuns])))+"connection [ms]: "+str(durationConnect))
+	if schedule is None:
+		print(("singleRun batch size %i: " % len(numRuns)))
+		print(("numRun %s: " % ("/".join([str(i+1) for i in numRuns])))+"connection [ms]: "+str(durationConnect))
+	else:
+		print(("singleRun %s client %i: " % ("open loop" if bOpenLoop else "duration", schedule['client']))+"connection [ms]: "+str(durationConnect))
+		# all clients start together
+		schedule['barrier'].wait(schedule['timeout'])
+		startSchedule = time.monotonic()
+		startScheduleWall = time.time()
+	def getRuns():
+		# closed loop: fixed list of runs, open loop: pull next arrived run, duration: pull next run until deadline
+		if schedule is None:
+			for numRun in numRuns:
+				yield numRun
+		elif bDuration:
+			# warmup runs have negative numbers and are not reported
+			numWarmup = 0
+			while time.monotonic() < startSchedule + schedule['durationWarmup']:
+				numWarmup += 1
+				yield -numWarmup
+			while time.monotonic() < startSchedule + schedule['durationWarmup'] + schedule['duration']:
+				with schedule['lock']:
+					numRun = schedule['counter'].value
+					schedule['counter'].value += 1
+				yield numRun
+		else:
+			while True:
+				numRun = schedule['queue'].get()
+				if numRun is None:
+					return
+				wait = startSchedule + schedule['offsets'][numRun] - time.monotonic()
+				if wait > 0:
+					time.sleep(wait)
+				yield numRun
+	bFirstRun = True
+	# histograms of measured runs per timer, merged by the parent
+	histograms = {'connection': tools.histogram(), 'execution': tools.histogram(), 'datatransfer': tools.histogram(), 'prepare': tools.histogram()}
+	# prepared statements of this connection, per template
+	statements = {}
+	# finished runs survive a crash of the benchmarker
+	journalWriter = tools.journal(journal) if journal is not None else None
 	# perform runs for this connection
-	for numRun in numRuns:
-		workername = "numRun %i: " % (numRun+1)
-		queryString = inputConfig[numRun].queryString
+	for numRun in getRuns():
+		workername = "numRun %i: " % (numRun+1) if numRun >= 0 else "warmup: "
+		params = None
+		queryTemplate = None
+		if bDuration:
+			# parameters are generated lazily, reproducible per number of run
+			queryString = schedule['template']
+			query = tools.query(inputConfig[0].queryConfig)
+			if query.prepared:
+				queryTemplate = schedule['template']
+			if len(schedule['parameters']) > 0:
+				params = parameter.generateParametersForRun(schedule['parameters'], schedule['seed'], numRun)
+				queryString = parameter.parametrize(queryString, params, numRun)
+		else:
+			queryString = inputConfig[numRun].queryString
+			query = tools.query(inputConfig[numRun].queryConfig)
+			queryTemplate = inputConfig[numRun].queryTemplate
+		durationPrepare = 0.0
 		#print(workername+queryString)
-		query = tools.query(inputConfig[numRun].queryConfig)
-		if query.delay_run > 0:
+		if query.delay_run > 0 and schedule is None:
 			print(workername+"Delay Run by "+str(query.delay_run)+" seconds")
 			time.sleep(query.delay_run)
 		error = ""
+		# statement timeout: the watchdog cancels the statement and the run is recorded as timed out
+		# the watchdog appends whether the driver has been asked to cancel
+		timedOut = []
+		watchdog = None
+		bCancelled = False
+		# timestamps of run: wall clock for aligning with other sources, monotonic for intervals
+		startWall = time.time()
+		startMonotonic = time.monotonic()
 		try:
 			#start = default_timer()
 			if BENCHMARKER_VERBOSE_QUERIES:
@@ -130,12 +212,28 @@ def singleRun(connectiondata, inputConfig, numRuns, connectionname, numQuery, pa
 						print(workername+queryPart)
 				else:
 					print(workername+queryString)
+			if queryTemplate is not None and not queryTemplate in statements:
+				# prepare once per connection, bind values in each run
+				paramstyle = connection.getParamstyle()
+				preparedString, names = parameter.prepareTemplate(queryTemplate, paramstyle)
+				start = default_timer()
+				statements[queryTemplate] = (connection.prepareStatement(preparedString), names, paramstyle)
+				end = default_timer()
+				durationPrepare = 1000.0*(end - start)
+				print(workername+"prepare [ms]: "+str(durationPrepare))
 			connection.openCursor()
 			#end = default_timer()
 			#durationConnect += 1000.0*(end - start)
+			if query.statementTimeout > 0:
+				watchdog = threading.Timer(query.statementTimeout, lambda: timedOut.append(connection.cancelQuery()))
+				watchdog.start()
 			start = default_timer()
 			# if query is given as list of strings
-			if isinstance(queryString, list):
+			if queryTemplate is not None:
+				statement, names, paramstyle = statements[queryTemplate]
+				values = parameter.bindParameters(names, (params if bDuration else inputConfig[numRun].parameter) or {}, numRun, paramstyle)
+				connection.executePrepared(statement, values)
+			elif isinstance(queryString, list):
 				for queryPart in queryString:
 					connection.executeQuery(queryPart)
 			else:
@@ -148,52 +246,141 @@ def singleRun(connectiondata, inputConfig, numRuns, connectionname, numQuery, pa
 			columnnames = []
 			size = 0
 			durationTransfer = 0
+			sample = []
+			digest = None
 			if query.withData:
 				if len(queryString) != 0:
-					start = default_timer()
-					data=connection.fetchResult()
-					end = default_timer()
-					durationTransfer = 1000.0*(end - start)
+					# result set is reduced here, only digests travel back to the parent
+					columnnames = connection.getColumnNames()
+					filename = None
+					if query.storeResultSet and numRun==0 and path is not None:
+						filename = path+"/query_"+str(numQuery)+"_resultset_"+connectionname
+						print(workername+"Store result set to "+filename)
+					resultset = tools.resultset(query, columnnames, filename)
+					if query.fetchSize > 0:
+						# stream result set in chunks, only time spent fetching counts
+						while True:
+							start = default_timer()
+							chunk = connection.fetchResultChunk(query.fetchSize)
+							end = default_timer()
+							durationTransfer += 1000.0*(end - start)
+							if len(chunk) == 0:
+								break
+							resultset.addChunk(chunk)
+					else:
+						start = default_timer()
+						chunk = connection.fetchResult()
+						end = default_timer()
+						durationTransfer = 1000.0*(end - start)
+						resultset.addChunk(chunk)
+						chunk = []
+					resultset.finish()
 					print(workername+"transfer [ms]: "+str(durationTransfer))
-					data = [[str(item).strip() for item in sublist] for sublist in data]
-					size = sys.getsizeof(data)
-					print(workername+"Size of result list retrieved: "+str(size)+" bytes")
-					#logging.debug(data)
-					columnnames = [[i[0].upper() for i in connection.cursor.description]]
-					if not query.storeData:
+					size = resultset.size
+					print(workername+"Size of result set retrieved: "+str(size)+" bytes in "+str(resultset.numRows)+" rows")
+					if query.storeData:
+						data = resultset.getData()
+					else:
 						print(workername+"Forget result set")
-						data = []
-						columnnames = []
-					#logging.debug(columnnames)
+					sample = resultset.getSample()
+					digest = resultset.digest
+					columnnames = []
 		except Exception as e:
-			logging.exception(workername+'Caught an error: %s' % str(e))
-			error = '{workername}: {exception}'.format(workername=workername, exception=e)
-			durationConnect = 0
-			durationExecute = 0
+			if any(timedOut):
+				# cancelled by statement timeout, this is not an error
+				# time until cancel is kept in the run, but it is not a measured execution time
+				print(workername+"timeout after [s]: "+str(query.statementTimeout))
+				bCancelled = True
+				durationExecute = 1000.0*(time.monotonic() - startMonotonic) - durationPrepare
+				try:
+					connection.rollback()
+				except Exception as e:
+					logging.exception(workername+'Caught an error: %s' % str(e))
+			else:
+				logging.exception(workername+'Caught an error: %s' % str(e))
+				error = '{workername}: {exception}'.format(workername=workername, exception=e)
+				durationConnect = 0
+				durationExecute = 0
+				durationPrepare = 0
 			durationTransfer = 0
-			data = []
+			# placeholder: a cancelled run has no result set to compare
+			data = None if bCancelled else []
 			columnnames = []
 			size = 0
+			sample = []
+			digest = None
 		finally:
+			if watchdog is not None:
+				watchdog.cancel()
+				# a cancel that is already running must not hit the next run of this connection
+				watchdog.join()
 			#start = default_timer()
 			connection.closeCursor()
 			#end = default_timer()
 			#durationExecute += 1000.0*(end - start)
+		endWall = time.time()
+		endMonotonic = time.monotonic()
+		if numRun < 0:
+			# forget warmup run
+			continue
 		result = singleRunOutput()
 		# connection time is valid only for first run (making the connection)
-		if numRun==numRuns[0] and query.withConnect:
+		if bFirstRun and query.withConnect:
 			result.durationConnect = durationConnect
 		else:
 			result.durationConnect = 0.0
+		bFirstRun = False
 		result.durationExecute = durationExecute
 		result.durationTransfer = durationTransfer
+		result.durationPrepare = durationPrepare
 		result.error = error
 		result.data = data
 		result.size = size
 		result.columnnames = columnnames
-		#result.size = size
+		result.sample = sample
+		result.resultDigest = digest
+		result.numRun = numRun
+		result.worker = os.getpid()
+		result.start = startWall
+		result.end = endWall
+		result.startMonotonic = startMonotonic
+		result.endMonotonic = endMonotonic
+		result.parameter = params
+		result.histograms = None
+		result.stream = None
+		result.position = None
+		# run has exceeded the statement timeout, even if the driver could not cancel it
+		result.timeout = len(timedOut) > 0
+		# run has been aborted by the statement timeout, it is not part of statistics
+		result.cancelled = bCancelled
+		if not bCancelled and numRun >= query.numRunBegin and (query.numRunEnd is None or numRun < query.numRunEnd):
+			histograms['connection'].add(result.durationConnect)
+			histograms['execution'].add(result.durationExecute)
+			histograms['datatransfer'].add(result.durationTransfer)
+			histograms['prepare'].add(result.durationPrepare)
+		if bOpenLoop:
+			# time between arrival and actual start
+			result.client = schedule['client']
+			result.intended = startScheduleWall + schedule['offsets'][numRun]
+			result.queue = max(0.0, 1000.0*(startMonotonic - startSchedule - schedule['offsets'][numRun]))
+		elif bDuration:
+			result.client = schedule['client']
+			result.intended = None
+			result.queue = None
+		else:
+			result.client = None
+			result.intended = None
+			result.queue = None
+		if journalWriter is not None:
+			journalWriter.append(result)
 		results.append(result)
-	if not len(activeConnections) > numActiveConnection:
+	if journalWriter is not None:
+		journalWriter.close()
+	if len(results) > 0:
+		results[-1].histograms = histograms
+	for statement, names, paramstyle in statements.values():
+		connection.closeStatement(statement)
+	if activeConnection is None and not len(activeConnections) > numActiveConnection:
 		#start = default_timer()
 		connection.disconnect()
 		#end = default_timer()
@@ -202,108 +389,259 @@ def singleRun(connectiondata, inputConfig, numRuns, connectionname, numQuery, pa
 
 
 
-class singleResultInput:
+def singleStream(connectiondata, inputConfigs, permutation, numStream, connectionname, path=None, barrier=None, timeout=None):
 	"""
-	Class for collecting info about a benchmark run
+	Function for running a query stream: One connection sends all queries one after the other in the order of a permutation.
+	This is one of several concurrent streams of a throughput test.
+
+	:param connectiondata: Data about the connection, dict format
+	:param inputConfigs: Dict of input data (list of singleRunInput objects) per number of query
+	:param permutation: List of numbers of queries, order of execution in this stream
+	:param numStream: Number of the stream, 0... This is the number of the run of each query
+	:param connectionname: Name of the connection
+	:param path: Result path, for optional storing received data
+	:param barrier: Barrier for starting all streams together
+	:param timeout: Timeout for waiting at the barrier
+	:return: Dict of stream, results (list of singleRunOutput objects per number of query), start and end (monotonic and wall clock), elapsed time and error (empty if the stream has been completed)
 	"""
-	def __init__(self, numRun, data, columnnames, queryConfig):
-		self.numRun = numRun
-		self.data = data
-		self.columnnames = columnnames
-		self.queryConfig = queryConfig
+	import logging
+	logger = logging.getLogger()
+	logger.setLevel(logging.ERROR)
+	workername = "stream %i: " % numStream
+	result = {'stream': numStream, 'results': {}, 'start': None, 'end': None, 'startWall': None, 'endWall': None, 'elapsed_ms': 0.0, 'error': ''}
+	connection = tools.dbms(connectiondata)
+	durationConnect = 0.0
+	try:
+		start = default_timer()
+		connection.connect()
+		end = default_timer()
+		durationConnect = 1000.0*(end - start)
+		print(workername+"connection [ms]: "+str(durationConnect))
+	except Exception as e:
+		logging.exception(workername+'Caught an error: %s' % str(e))
+		result['error'] = workername+'ERROR ({}) - {}'.format(type(e).__name__, e)
+	try:
+		if barrier is not None:
+			# all streams start together, a stream that could not connect as well, so the others are not blocked
+			barrier.wait(timeout)
+		result['start'] = time.monotonic()
+		result['startWall'] = time.time()
+		if len(result['error']) > 0:
+			permutation = []
+		for position, numQuery in enumerate(permutation):
+			print(workername+"Q"+str(numQuery)+" at position "+str(position+1))
+			results = singleRun(connectiondata, inputConfigs[numQuery], [numStream], connectionname, numQuery, path, activeConnection=connection)
+			for r in results:
+				r.stream = numStream
+				r.position = position
+				r.client = numStream
+				if position == 0 and tools.query(inputConfigs[numQuery][numStream].queryConfig).withConnect:
+					# the stream connects once, before its first query
+					r.durationConnect = durationConnect
+					if r.histograms is not None:
+						r.histograms['connection'] = tools.histogram()
+						r.histograms['connection'].add(durationConnect)
+			result['results'][numQuery] = results
+	except Exception as e:
+		logging.exception(workername+'Caught an error: %s' % str(e))
+		result['error'] = workername+'ERROR ({}) - {}'.format(type(e).__name__, e)
+	result['end'] = time.monotonic()
+	result['endWall'] = time.time()
+	if result['start'] is not None:
+		result['elapsed_ms'] = 1000.0*(result['end'] - result['start'])
+	connection.disconnect()
+	print(workername+"elapsed [ms]: "+str(result['elapsed_ms']))
+	return result
 
 
 
-def singleResult(connectiondata, inputConfig, numRuns, connectionname, numQuery, path=None):
+def singleMix(connectiondata, inputConfigs, queue, numClient, connectionname, path=None, barrier=None, timeout=None):
 	"""
-	Function for treating result sets
+	Function for running a client of a query mix: One connection pulls the next run of any query from a common queue.
+	This is one of several concurrent clients.
 
 	:param connectiondata: Data about the connection, dict format
-	:param inputConfig: Data containing info about the benchmark run
-	:param numRun: Number of benchmark run
+	:param inputConfigs: Dict of input data (list of singleRunInput objects) per number of query
+	:param queue: Queue of (position, number of query, number of run), None stops the client
+	:param numClient: Number of the client, 0...
 	:param connectionname: Name of the connection
-	:param numQuery: Number of the query, 1...
 	:param path: Result path, for optional storing received data
-	:return: returns object of class singleRunOutput
+	:param barrier: Barrier for starting all clients together
+	:param timeout: Timeout for waiting at the barrier
+	:return: Dict of client, results (list of singleRunOutput objects per number of query), start and end (monotonic) and error (empty if the client has not failed)
 	"""
 	import logging
 	logger = logging.getLogger()
 	logger.setLevel(logging.ERROR)
-	# init list of results
-	results = []
-	# info about dbms
+	workername = "client %i: " % numClient
+	result = {'client': numClient, 'results': {}, 'start': None, 'end': None, 'error': ''}
 	connection = tools.dbms(connectiondata)
-	# perform runs for this connection
-	for numRun in numRuns:
-		workername = "numRun %i: " % (numRun+1)
-		query = tools.query(inputConfig[numRun].queryConfig)
-		error = ""
+	durationConnect = 0.0
+	try:
+		start = default_timer()
+		connection.connect()
+		end = default_timer()
+		durationConnect = 1000.0*(end - start)
+		print(workername+"connection [ms]: "+str(durationConnect))
+	except Exception as e:
+		logging.exception(workername+'Caught an error: %s' % str(e))
+		result['error'] = workername+'ERROR ({}) - {}'.format(type(e).__name__, e)
+	bFirstRun = True
+	try:
+		if barrier is not None:
+			# all clients start together, a client that could not connect as well, so the others are not blocked
+			barrier.wait(timeout)
+		result['start'] = time.monotonic()
+		# a client that could not connect does not take runs, they are left to the other clients
+		while len(result['error']) == 0:
+			item = queue.get()
+			if item is None:
+				break
+			position, numQuery, numRun = item
+			results = singleRun(connectiondata, inputConfigs[numQuery], [numRun], connectionname, numQuery, path, activeConnection=connection)
+			for r in results:
+				r.client = numClient
+				r.position = position
+				if bFirstRun and tools.query(inputConfigs[numQuery][numRun].queryConfig).withConnect:
+					# the client connects once, before its first query
+					r.durationConnect = durationConnect
+					if r.histograms is not None:
+						r.histograms['connection'] = tools.histogram()
+						r.histograms['connection'].add(durationConnect)
+				bFirstRun = False
+			result['results'].setdefault(numQuery, []).extend(results)
+	except Exception as e:
+		logging.exception(workername+'Caught an error: %s' % str(e))
+		result['error'] = workername+'ERROR ({}) - {}'.format(type(e).__name__, e)
+	result['end'] = time.monotonic()
+	connection.disconnect()
+	return result
+
+
+
+def singleIngest(connectiondata, ingest, numLoader, numLoaders):
+	"""
+	Function for loading local files into tables of a dbms, as one of several parallel loaders.
+	Method executemany: Each loader reads and inserts its share of every file (see tools.readBatches()).
+	Method copy: Each loader streams every numLoaders-th file by the bulk API of the driver.
+
+	:param connectiondata: Data about the connection, dict format
+	:param ingest: Dict of ingest settings (tables, batchSize, method)
+	:param numLoader: Number of this loader, 0...
+	:param numLoaders: Number of parallel loaders
+	:return: Dict of rows per table, start and end (monotonic) and error
+	"""
+	import logging
+	logger = logging.getLogger()
+	logger.setLevel(logging.ERROR)
+	workername = "loader %i: " % numLoader
+	result = {'tables': {}, 'start': None, 'end': None, 'error': ''}
+	connection = tools.dbms(connectiondata)
+	connection.connect()
+	paramstyle = connection.getParamstyle()
+	result['start'] = time.monotonic()
+	try:
+		for table in ingest['tables']:
+			name = table['table']
+			columns = table.get('columns', None)
+			options = table.get('options', {})
+			target = name if columns is None else name+" ("+", ".join(columns)+")"
+			rows = 0
+			for numFile, filename in enumerate(table['files']):
+				if ingest['method'] == 'copy':
+					if numFile % numLoaders != numLoader:
+						continue
+					connection.openCursor()
+					connection.copyFrom(target, filename, options)
+					rows += max(connection.cursor.rowcount, 0)
+					connection.commit()
+					connection.closeCursor()
+					continue
+				queryString = None
+				for batch in tools.readBatches(filename, ingest['batchSize'], table.get('format', None), columns, options, numLoader, numLoaders):
+					if len(batch) == 0:
+						continue
+					if queryString is None:
+						# bind parameters in the style of the driver
+						names = ['c'+str(i+1) for i in range(len(batch[0]))]
+						queryString, names = parameter.prepareTemplate("INSERT INTO "+target+" VALUES ("+", ".join(['{'+n+'}' for n in names])+")", paramstyle)
+					if paramstyle in ['named', 'pyformat']:
+						batch = [dict(zip(names, row)) for row in batch]
+					connection.openCursor()
+					connection.executeMany(queryString, batch)
+					connection.commit()
+					connection.closeCursor()
+					rows += len(batch)
+			print(workername+"{} rows into {}".format(rows, name))
+			result['tables'][name] = rows
+	except Exception as e:
+		logging.exception(workername+'Caught an error: %s' % str(e))
+		result['error'] = '{workername}: {exception}'.format(workername=workername, exception=e)
+	finally:
+		connection.closeCursor()
+	result['end'] = time.monotonic()
+	connection.disconnect()
+	return result
+
+
+
+def singleConnectionGroup(result_path, connectionnames, settings):
+	"""
+	Function for benchmarking a group of connections one after the other in an isolated process.
+	Each connection is benchmarked connectionwise by its own benchmarker object, results are stored in a subfolder named after the connection.
+
+	:param result_path: Result folder of the experiment, containing connections.config and queries.config
+	:param connectionnames: List of names of connections
+	:param settings: Dict of settings of the parent benchmarker (fixedQuery, anonymize, unanonymize, numProcesses, batch, overwrite, template, journal, seed, parameters)
+	:return: returns nothing
+	"""
+	tools.query.template = settings['template']
+	for c in connectionnames:
+		print("Benchmark "+c+" in process "+str(os.getpid()))
 		try:
-			# transfer
-			data = inputConfig[numRun].data
-			columnnames = inputConfig[numRun].columnnames
-			size = 0
-			#print(data)
-			if query.result:
-				data = [[str(item).strip() for item in sublist] for sublist in data]
-				if query.restrict_precision is not None:
-					data = [[round(float(item), int(query.restrict_precision)) if tools.convertToFloat(item) == float else item for item in sublist] for sublist in data]
-				if query.sorted and len(data) > 0:
-					logging.debug(workername+"Begin sorting")
-					data = sorted(data, key=itemgetter(*list(range(0,len(data[0])))))
-					logging.debug(workername+"Finished sorting")
-			logging.debug(workername+"Size of sorted result list retrieved: "+str(sys.getsizeof(data))+" bytes")
-			# convert to dataframe
-			#columnnames = [[i[0].upper() for i in connection.cursor.description]]
-			df = pd.DataFrame.from_records(data)
-			if not df.empty:
-				df.columns = columnnames
-			size = int(df.memory_usage(index=True).sum())
-			# store result set for connection and query
-			storeResultSet = query.storeResultSet
-			if storeResultSet and numRun==0:
-				if path is not None:
-					if 'dataframe' in query.storeResultSetFormat:
-						filename = path+"/query_"+str(numQuery)+"_resultset_"+connectionname+".pickle"
-						print(workername+"Store pickle of result set to "+filename)
-						f = open(filename, "wb")
-						pickle.dump(df, f)
-						f.close()
-					if 'csv' in query.storeResultSetFormat:
-						filename = path+"/query_"+str(numQuery)+"_resultset_"+connectionname+".csv"
-						print(workername+"Store csv of result set to "+filename)
-						f = open(filename, "w")
-						f.write(df.to_csv(index_label=False,index=False))
-						f.close()
-			# store (compressed) data for comparison
-			if query.result == 'hash':
-				# replace by hash information
-				columnnames = [['hash']]
-				data = columnnames + [[hashlib.sha224(pickle.dumps(data)).hexdigest()]]
-				logging.debug(workername+"Compressed by hash")
-			elif query.result == 'size':
-				# replace by size information
-				columnnames = [['size']]
-				data = columnnames + [[size]]
-				#data = columnnames + [[sys.getsizeof(data)]]
-				logging.debug(workername+"Compressed by size")
+			experiment = benchmarker(
+				result_path=result_path,
+				working='connection',
+				batch=settings['batch'],
+				subfolder=c,
+				fixedQuery=settings['fixedQuery'],
+				fixedConnection=c,
+				anonymize=settings['anonymize'],
+				unanonymize=settings['unanonymize'],
+				numProcesses=settings['numProcesses'],
+				seed=settings['seed'])
+			experiment.journal = settings['journal']
+			experiment.getConfig(connectionfile=result_path+'/connections.config', queryfile=result_path+'/queries.config')
+			# all connections get the parameters generated by the parent
+			for numQuery, parameters in settings['parameters'].items():
+				experiment.protocol['query'][numQuery].update(parameters)
+			if path.isfile(experiment.path+'/protocol.json'):
+				experiment.continueBenchmarks(overwrite=settings['overwrite'])
 			else:
-				#columnnames = [[n[0].upper() for n in connection.cursor.description]]
-				data = columnnames + data
-			logging.debug(workername+"Size of sorted result list stored: "+str(sys.getsizeof(data))+" bytes")
+				experiment.runBenchmarks()
 		except Exception as e:
-			logging.exception(workername+'Caught an error: %s' % str(e))
-			error = '{workername}: {exception}'.format(workername=workername, exception=e)
-			data = []
-			size = 0
-		finally:
-			pass
-		result = singleRunOutput()
-		result.error = error
-		result.data = data
-		result.size = size
-		results.append(result)
-	return results
+			logging.exception('Caught an error: %s' % str(e))
+
+
+
+def initWorker(jars, workers=None):
+	"""
+	Initializes a process of the worker pool.
+	The JVM is started and the JDBC jars are loaded once per worker, so runs only have to connect.
+	The worker registers itself with pid and duration of initialization.
+
+	:param jars: List of JDBC jar files
+	:param workers: Queue the worker registers itself in, optional
+	:return: returns nothing
+	"""
+	start = default_timer()
+	try:
+		tools.startJVM(jars)
+	except Exception as e:
+		logging.exception('Caught an error: %s' % str(e))
+	end = default_timer()
+	if workers is not None:
+		workers.put({'pid': os.getpid(), 'durationInit': 1000.0*(end - start)})
 
 
 
@@ -318,7 +656,7 @@ class benchmarker():
 		A result folder is created if not existing already.
 
 		:param result_path: Path for storing result files. If None is given, a folder is created using time.
-		:param working: Process benchmarks query-wise or connection-wise
+		:param working: Process benchmarks query-wise or connection-wise, or all connections in parallel
 		:param batch: Script is running in batch mode (more protocol-like output)
 		:param fixedQuery: Number of only query to be benchmarked
 		:param fixedConnection: Name of only connection to be benchmarked
@@ -329,26 +667,32 @@ class benchmarker():
 		:param code: Optional code for result folder
 		:return: returns nothing
 		"""
+		self.seed = seed
 		if seed is not None:
 			random.seed(seed)
 		## connection management:
-		self.connectionmanagement = {'numProcesses': numProcesses, 'runsPerConnection': None, 'timeout': None, 'singleConnection': False}
+		self.connectionmanagement = {'numProcesses': numProcesses, 'runsPerConnection': None, 'timeout': None, 'singleConnection': False, 'arrivalRate': None, 'arrivalProcess': 'constant', 'sweep': None, 'sweepMax': None, 'sweepThreshold': 0.1}
 		# set number of parallel client processes
 		#self.connectionmanagement['numProcesses'] = numProcesses
 		if self.connectionmanagement['numProcesses'] is None:
 			self.connectionmanagement['numProcesses'] = 1#math.ceil(mp.cpu_count()/2) #If None, half of all available processes is taken
 		else:
-			self.connectionmanagement['numProcesses'] = int(self.numProcesses)
+			self.connectionmanagement['numProcesses'] = int(numProcesses)
 		# for connections staying active for all benchmarks
 		self.activeConnections = []
 		#self.runsPerConnection = 4
 		#self.timeout = 600
-		# there is no general pool
+		# general pool of workers, lives as long as benchmarks are running
 		self.pool = None
+		self.numProcessesPool = 0
 		# printer is first and fixed reporter
 		self.reporter = [reporter.printer(self)]
 		# store is fixed reporter and cannot be removed
 		self.reporterStore = reporter.storer(self)
+		# optional reporter sending measurements of each query, for example to a coordinator
+		self.reporterSender = None
+		# optional function called before runs of a query start, for example to wait for other agents
+		self.startBarrier = None
 		# dict of dbms
 		self.dbms = {}
 		# list of queries
@@ -409,6 +753,10 @@ class benchmarker():
 		# anonymize dbms
 		self.anonymize = anonymize# True or False
 		self.unanonymize = unanonymize# Name of connection
+		# parallel working: connections sharing a host run one after the other
+		self.serializeHosts = False
+		# append finished runs to a journal, so continuing resumes from the last durable run
+		self.journal = False
 	def clearBenchmarks(self):
 		"""
 		Clears all benchmark related protocol data.
@@ -420,12 +768,21 @@ class benchmarker():
 		self.timerExecution = tools.timer("execution")
 		self.timerTransfer = tools.timer("datatransfer")
 		self.timerConnect = tools.timer("connection")
+		self.timerPrepare = tools.timer("prepare")
 		self.timerSession = tools.timer("session")
 		self.timerSession.stackable = False
 		self.timerSession.perRun = False
 		self.timerRun = tools.timer("run")
 		self.timerRun.stackable = False
-		self.timers = [self.timerSession, self.timerRun, self.timerExecution, self.timerTransfer, self.timerConnect]
+		self.timers = [self.timerSession, self.timerRun, self.timerExecution, self.timerTransfer, self.timerConnect, self.timerPrepare]
+		# timestamps per query, connection and run
+		self.timeseries = {}
+		# cache of data per query, if result folder is read lazily
+		self.queryCache = None
+		# streams and mix: results of runs of concurrent queries per connection and query, until they are stored
+		self.workloadResults = {}
+		# streams and mix: errors per connection and query with missing runs, until they are stored
+		self.workloadErrors = {}
 	def getConfig(self,configfolder=None, connectionfile=None, queryfile=None):
 		"""
 		Reads all queries and connections from given config files.
@@ -476,6 +833,20 @@ class benchmarker():
 					self.queryconfig['queries'][i] = {**q, **tools.query.template}
 					with open(self.path+'/queries.config','w') as outp:
 						pprint.pprint(self.queryconfig, outp)
+			if "streams" in self.queryconfig:
+				# throughput test: each stream runs each query once, number of run is number of stream
+				numStreams = int(self.queryconfig['streams'].get('numStreams', 1))
+				for i,q in enumerate(self.queryconfig['queries']):
+					q = {k: v for k, v in q.items() if k not in ['duration', 'durationWarmup', 'targetPrecision']}
+					self.queryconfig['queries'][i] = {**q, 'numRun': numStreams, 'numWarmup': 0, 'numCooldown': 0}
+			elif "mix" in self.queryconfig:
+				# query mix: runs are distributed to the queries by their weights
+				numRun = int(self.queryconfig['mix'].get('numRun', 100))
+				weights = [float(q.get('weight', 1)) if q.get('active', True) else 0.0 for q in self.queryconfig['queries']]
+				for i,q in enumerate(self.queryconfig['queries']):
+					if weights[i] > 0:
+						q = {k: v for k, v in q.items() if k not in ['duration', 'durationWarmup', 'targetPrecision']}
+						self.queryconfig['queries'][i] = {**q, 'numRun': max(1, round(numRun*weights[i]/sum(weights))), 'numWarmup': 0, 'numCooldown': 0}
 			self.queries = self.queryconfig["queries"].copy()
 			if not "name" in self.queryconfig:
 				self.queryconfig["name"] = "No name"
@@ -586,7 +957,7 @@ class benchmarker():
 		"""
 		newdataframe = dataframe
 		for index, row in dataframe.iterrows():
-			if not self.dbms[row[0]].connectiondata['active']:
+			if not self.dbms[row.iloc[0]].connectiondata['active']:
 				newdataframe = newdataframe.drop([index], axis=0)
 		newdataframe.reset_index(drop=True, inplace=True)
 		return newdataframe
@@ -671,21 +1042,17 @@ class benchmarker():
 		dataframe = dataframe.set_index('DBMS')
 		#dataframe.index = dataframe.index.map(tools.dbms.anonymizer)
 		return dataframe, numSuccessfulQueries
-	def getQueryString(self, numQuery, connectionname=None, numRun=0):
+	def getQueryTemplate(self, numQuery, connectionname=None):
 		"""
-		Returns query string.
-		This might depend on the number of benchmark run and on the connection.
+		Returns query string, before parameters are replaced.
+		This might depend on the connection (SQL dialect).
 
 		:param numQuery: Number of query
 		:param connectionname: Name of connection
-		:param numRun: Number of benchmark run
-		:return: String of (SQL) query
+		:return: String of (SQL) query or list of strings
 		"""
 		q = self.queries[numQuery-1]
 		query = tools.query(q)
-		if len(query.queryList) > 0 and len(self.protocol['query'][str(numQuery)]['runs']) > 0:
-			queryString = self.getQueryString(query.queryList[numRun % len(query.queryList)], connectionname, self.protocol['query'][str(numQuery)]['runs'][numRun])
-			return queryString
 		queryString = query.query
 		# overwrite default query string with dialect
 		if connectionname is not None and len(query.DBMS) > 0 and 'dialect' in self.dbms[connectionname].connectiondata:
@@ -697,31 +1064,33 @@ class benchmarker():
 			for c, q in query.DBMS.items():
 				if connectionname.startswith(c):
 					queryString = q
-		def parametrize(queryTemplate, numQuery, numRun):
-			params = self.protocol['query'][str(numQuery)]['parameter'][numRun]
-			params['numRun'] = numRun
-			params = tools.joinDicts(params, parameter.defaultParameters)
-			return queryTemplate.format(**params)
+		return queryString
+	def getQueryString(self, numQuery, connectionname=None, numRun=0):
+		"""
+		Returns query string.
+		This might depend on the number of benchmark run and on the connection.
+
+		:param numQuery: Number of query
+		:param connectionname: Name of connection
+		:param numRun: Number of benchmark run
+		:return: String of (SQL) query
+		"""
+		q = self.queries[numQuery-1]
+		query = tools.query(q)
+		if len(query.queryList) > 0 and len(self.protocol['query'][str(numQuery)]['runs']) > 0:
+			queryString = self.getQueryString(query.queryList[numRun % len(query.queryList)], connectionname, self.protocol['query'][str(numQuery)]['runs'][numRun])
+			return queryString
+		queryString = self.getQueryTemplate(numQuery, connectionname)
 		# if query is given as a list of strings (create view, ..., drop view)
 		if isinstance(queryString,list):
 			queryPart = []
-			for queryTemplate in queryString:
-				if len(self.protocol['query'][str(numQuery)]['parameter']) > 0:
-					queryPart.append(parametrize(queryTemplate, numQuery, numRun))
+			if len(self.protocol['query'][str(numQuery)]['parameter']) > 0:
+				queryPart = parameter.parametrize(queryString, self.protocol['query'][str(numQuery)]['parameter'][numRun], numRun)
 			#print(queryPart)
 			queryString = queryPart
 		else:
 			if len(self.protocol['query'][str(numQuery)]['parameter']) > 0:
-				queryString = parametrize(queryString, numQuery, numRun)
-		# it is a query template
-		#if len(self.protocol['query'][str(numQuery)]['parameter']) > 0:
-		#	bParametrized = True
-		#	#queryTemplate = queryString
-		#	#params = self.protocol['query'][str(numQuery)]['parameter'][numRun]
-		#	#queryString = queryTemplate.format(**params)
-		#	queryString = parametrize(queryString, numQuery, numRun)
-		#else:
-		#	bParametrized = False
+				queryString = parameter.parametrize(queryString, self.protocol['query'][str(numQuery)]['parameter'][numRun], numRun)
 		return queryString
 	def getRandomRun(self, numQuery):#, connectionname, numRun=None):
 		q = self.queries[numQuery-1]
@@ -731,8 +1100,10 @@ class benchmarker():
 		#print(queryString)
 		#return queryString, 
 		return numRun
-	def getConnectionManager(self, numQuery, connectionname):
+	def getConnectionManager(self, numQuery, connectionname, numProcesses=None):
 		# connection management for parallel connections
+		# numProcesses overwrites all settings (level of sweep)
+		numProcessesLevel = numProcesses
 		q = self.queries[numQuery-1]
 		# prepare query object
 		query = tools.query(q)
@@ -741,6 +1112,11 @@ class benchmarker():
 		batchsize = self.connectionmanagement['runsPerConnection']#self.runsPerConnection
 		timeout = self.connectionmanagement['timeout']#self.timeout
 		singleConnection = self.connectionmanagement['singleConnection']#self.timeout
+		arrivalRate = self.connectionmanagement.get('arrivalRate', None)
+		arrivalProcess = self.connectionmanagement.get('arrivalProcess', 'constant')
+		sweep = self.connectionmanagement.get('sweep', None)
+		sweepMax = self.connectionmanagement.get('sweepMax', None)
+		sweepThreshold = self.connectionmanagement.get('sweepThreshold', 0.1)
 		# overwrite by benchmark (query file)
 		if 'connectionmanagement' in self.queryconfig:
 			connectionmanagement = self.queryconfig['connectionmanagement']
@@ -754,6 +1130,16 @@ class benchmarker():
 				timeout = connectionmanagement['timeout']
 			if('singleConnection' in connectionmanagement):# and connectionmanagement['timeout'] != 0):
 				singleConnection = connectionmanagement['singleConnection']
+			if('arrivalRate' in connectionmanagement):
+				arrivalRate = connectionmanagement['arrivalRate']
+			if('arrivalProcess' in connectionmanagement):
+				arrivalProcess = connectionmanagement['arrivalProcess']
+			if('sweep' in connectionmanagement):
+				sweep = connectionmanagement['sweep']
+			if('sweepMax' in connectionmanagement):
+				sweepMax = connectionmanagement['sweepMax']
+			if('sweepThreshold' in connectionmanagement):
+				sweepThreshold = connectionmanagement['sweepThreshold']
 		# overwrite by connection
 		if 'connectionmanagement' in self.dbms[connectionname].connectiondata:
 			connectionmanagement = self.dbms[connectionname].connectiondata['connectionmanagement']
@@ -767,6 +1153,16 @@ class benchmarker():
 				timeout = connectionmanagement['timeout']
 			if('singleConnection' in connectionmanagement):# and connectionmanagement['timeout'] != 0):
 				singleConnection = connectionmanagement['singleConnection']
+			if('arrivalRate' in connectionmanagement):
+				arrivalRate = connectionmanagement['arrivalRate']
+			if('arrivalProcess' in connectionmanagement):
+				arrivalProcess = connectionmanagement['arrivalProcess']
+			if('sweep' in connectionmanagement):
+				sweep = connectionmanagement['sweep']
+			if('sweepMax' in connectionmanagement):
+				sweepMax = connectionmanagement['sweepMax']
+			if('sweepThreshold' in connectionmanagement):
+				sweepThreshold = connectionmanagement['sweepThreshold']
 		# overwrite by query
 		if 'connectionmanagement' in q:
 			connectionmanagement = q['connectionmanagement']
@@ -778,16 +1174,444 @@ class benchmarker():
 			if('timeout' in connectionmanagement):# and connectionmanagement['timeout'] != 0):
 				# 0=unlimited
 				timeout = connectionmanagement['timeout']
+			if('arrivalRate' in connectionmanagement):
+				arrivalRate = connectionmanagement['arrivalRate']
+			if('arrivalProcess' in connectionmanagement):
+				arrivalProcess = connectionmanagement['arrivalProcess']
+			if('sweep' in connectionmanagement):
+				sweep = connectionmanagement['sweep']
+			if('sweepMax' in connectionmanagement):
+				sweepMax = connectionmanagement['sweepMax']
+			if('sweepThreshold' in connectionmanagement):
+				sweepThreshold = connectionmanagement['sweepThreshold']
 		if numProcesses == 0 or numProcesses is None:
 			numProcesses = 1
+		# sweep: list of numbers of parallel clients, or doubling numProcesses up to sweepMax
+		if sweep is None or sweep is False or (isinstance(sweep, list) and len(sweep) == 0):
+			sweep = None
+		elif isinstance(sweep, list):
+			sweep = sorted([int(n) for n in sweep])
+		else:
+			if sweepMax is None or sweepMax == 0:
+				sweepMax = 2*mp.cpu_count()
+			sweep = []
+			n = int(numProcesses)
+			while n <= int(sweepMax):
+				sweep.append(n)
+				n = 2*n
+		if numProcessesLevel is not None:
+			numProcesses = numProcessesLevel
+		elif sweep is not None and len(self.protocol['query'][str(numQuery)].get('sweep', {}).get(connectionname, [])) > 0:
+			# results are those of the last level of the sweep
+			numProcesses = self.protocol['query'][str(numQuery)]['sweep'][connectionname][-1]['numProcesses']
 		if timeout == 0:
 			timeout = None
 		if batchsize == 0 or batchsize is None:
 			batchsize = math.ceil(query.numRun/numProcesses)
+		# 0=closed loop
+		if arrivalRate == 0 or arrivalRate is None:
+			arrivalRate = None
+		else:
+			arrivalRate = float(arrivalRate)
 		# unless pickling of java objects is possible
 		# we cannot have global connections
 		singleConnection = False
-		return {'numProcesses': numProcesses, 'runsPerConnection': batchsize, 'timeout': timeout, 'singleConnection': singleConnection}
+		return {'numProcesses': numProcesses, 'runsPerConnection': batchsize, 'timeout': timeout, 'singleConnection': singleConnection, 'arrivalRate': arrivalRate, 'arrivalProcess': arrivalProcess, 'sweep': sweep, 'sweepThreshold': float(sweepThreshold)}
+	def getNumProcessesMax(self):
+		"""
+		Returns the maximum number of parallel client processes of all pairs of query and connection.
+		This is the size of the worker pool.
+
+		:return: Number of processes
+		"""
+		numProcesses = 1
+		for numQuery in range(1, len(self.queries)+1):
+			for c in self.dbms.keys():
+				connectionmanagement = self.getConnectionManager(numQuery, c)
+				numProcesses = max(numProcesses, int(connectionmanagement['numProcesses']))
+				if connectionmanagement['sweep'] is not None:
+					numProcesses = max([numProcesses] + connectionmanagement['sweep'])
+		for c in self.dbms.keys():
+			ingest = self.getIngestConfig(c)
+			if ingest is not None:
+				numProcesses = max(numProcesses, ingest['numProcesses'])
+		streams = self.getStreamsConfig()
+		if streams is not None:
+			numProcesses = max(numProcesses, streams['numStreams'])
+		mix = self.getMixConfig()
+		if mix is not None:
+			numProcesses = max(numProcesses, mix['numProcesses'])
+		return numProcesses
+	def getIngestConfig(self, connectionname):
+		"""
+		Returns settings of the ingest phase of a connection.
+		Global settings are given in the query file as 'ingest', they can be overwritten per connection.
+		Patterns of files are expanded.
+
+		:param connectionname: Name of connection
+		:return: Dict of settings, None if there is nothing to ingest
+		"""
+		ingest = self.queryconfig.get('ingest', {})
+		if 'ingest' in self.dbms[connectionname].connectiondata:
+			ingest = tools.joinDicts(ingest, self.dbms[connectionname].connectiondata['ingest'])
+		if len(ingest.get('tables', [])) == 0:
+			return None
+		ingest = copy.deepcopy(ingest)
+		ingest['numProcesses'] = int(ingest.get('numProcesses', 1))
+		ingest['batchSize'] = int(ingest.get('batchSize', 1000))
+		ingest['method'] = ingest.get('method', 'executemany')
+		ingest['init'] = ingest.get('init', [])
+		for table in ingest['tables']:
+			files = table['files'] if isinstance(table['files'], list) else [table['files']]
+			table['files'] = [f for pattern in files for f in (sorted(glob.glob(pattern)) or [pattern])]
+		return ingest
+	def runIngest(self, connectionname):
+		"""
+		Loads local CSV or Parquet files into tables of a connection by parallel loaders and stores throughput in the protocol.
+		init statements are sent once before and are not measured.
+		The measured time is stored as timeLoad of the connection.
+
+		:param connectionname: Name of connection
+		:return: True if ingest has been done, False if skipped
+		"""
+		c = connectionname
+		ingest = self.getIngestConfig(c)
+		if ingest is None or not self.dbms[c].connectiondata['active']:
+			return False
+		if c in self.protocol.get('ingest', {}) and not self.overwrite:
+			print("Ingest into "+c+" has been done before")
+			return False
+		print("Ingest into "+c+": "+str(ingest['numProcesses'])+" loaders, batch size "+str(ingest['batchSize'])+", method "+ingest['method'])
+		numBytes = sum([os.path.getsize(f) for table in ingest['tables'] for f in table['files'] if path.isfile(f)])
+		error = ''
+		try:
+			if len(ingest['init']) > 0:
+				connection = tools.dbms(self.dbms[c].connectiondata)
+				connection.connect()
+				for queryString in ingest['init']:
+					connection.openCursor()
+					connection.executeQuery(queryString)
+					connection.closeCursor()
+				connection.commit()
+				connection.disconnect()
+			args = [(self.dbms[c].connectiondata, ingest, i, ingest['numProcesses']) for i in range(ingest['numProcesses'])]
+			if self.pool is not None:
+				results = [res.get() for res in [self.pool.apply_async(singleIngest, a) for a in args]]
+			else:
+				with mp.Pool(processes=ingest['numProcesses']) as pool:
+					results = [res.get() for res in [pool.apply_async(singleIngest, a) for a in args]]
+		except Exception as e:
+			logging.exception('Caught an error: %s' % str(e))
+			results = []
+			error = 'ERROR ({}) - {}'.format(type(e).__name__, e)
+		for result in results:
+			if len(result['error']) > 0 and len(error) == 0:
+				error = result['error']
+		durationIngest = 0.0
+		if len(results) > 0:
+			durationIngest = 1000.0*(max([r['end'] for r in results]) - min([r['start'] for r in results]))
+		numRows = sum([sum(r['tables'].values()) for r in results])
+		if not 'ingest' in self.protocol:
+			self.protocol['ingest'] = {}
+		self.protocol['ingest'][c] = {
+			'numProcesses': ingest['numProcesses'],
+			'batchSize': ingest['batchSize'],
+			'method': ingest['method'],
+			'tables': {table['table']: sum([r['tables'].get(table['table'], 0) for r in results]) for table in ingest['tables']},
+			'rows': numRows,
+			'bytes': numBytes,
+			'time_ms': durationIngest,
+			'rows_per_s': numRows/durationIngest*1000.0 if durationIngest > 0 else 0.0,
+			'mb_per_s': numBytes/1024.0/1024.0/durationIngest*1000.0 if durationIngest > 0 else 0.0,
+			'error': error,
+		}
+		print("Ingest into {}: {} rows in {:.2f} s, {:.1f} rows/s, {:.2f} MB/s".format(c, numRows, durationIngest/1000.0, self.protocol['ingest'][c]['rows_per_s'], self.protocol['ingest'][c]['mb_per_s']))
+		if len(error) == 0:
+			# load time enters evaluation like a given one
+			self.dbms[c].connectiondata['timeLoad'] = durationIngest/1000.0
+			with open(self.path+'/connections.config','w') as outp:
+				pprint.pprint(self.connections, outp)
+		else:
+			print(error)
+		self.reporterStore.writeProtocol()
+		return True
+	def runIngestAll(self):
+		"""
+		Runs the ingest phase for all connections.
+
+		:return: returns nothing
+		"""
+		for c in sorted(self.dbms.keys()):
+			if self.fixedConnection is not None and self.fixedConnection != c:
+				continue
+			self.runIngest(c)
+	def getStreamsConfig(self):
+		"""
+		Returns settings of the throughput test.
+		These are given in the query file as 'streams'.
+
+		:return: Dict of settings, None if there are no streams
+		"""
+		if not 'streams' in self.queryconfig:
+			return None
+		streams = copy.deepcopy(self.queryconfig['streams'])
+		streams['numStreams'] = int(streams.get('numStreams', 1))
+		streams['permutation'] = streams.get('permutation', 'random')
+		streams['scaleFactor'] = streams.get('scaleFactor', None)
+		return streams
+	def getStreamPermutations(self):
+		"""
+		Returns the order of queries per stream.
+		Permutations are either given in the query file or random, one per stream.
+		They are generated once and stored in the protocol, so all connections receive the same order.
+
+		:return: List of lists of numbers of queries, one per stream
+		"""
+		if not 'streamPermutations' in self.protocol:
+			streams = self.getStreamsConfig()
+			queries = [numQuery for numQuery in range(1, len(self.queries)+1) if tools.query(self.queries[numQuery-1]).active]
+			if streams['permutation'] == 'random':
+				permutations = [random.sample(queries, len(queries)) for i in range(streams['numStreams'])]
+			else:
+				# given permutations are used cyclically
+				permutations = [[int(q) for q in streams['permutation'][i % len(streams['permutation'])]] for i in range(streams['numStreams'])]
+			self.protocol['streamPermutations'] = permutations
+		return self.protocol['streamPermutations']
+	def runStreams(self, connectionname):
+		"""
+		Runs the throughput test of a connection: numStreams concurrent streams, each sends all active queries in the order of its own permutation.
+		Each run of a query belongs to a stream (number of run = number of stream).
+		Results of runs are kept until performBenchmark() stores them per query, so timers are the same as without streams.
+		Elapsed time per stream and queries per hour are stored in the protocol.
+
+		:param connectionname: Name of connection
+		:return: True if streams have been run, False if skipped
+		"""
+		c = connectionname
+		streams = self.getStreamsConfig()
+		if streams is None or not self.dbms[c].connectiondata['active']:
+			return False
+		queries = [numQuery for numQuery in range(1, len(self.queries)+1) if tools.query(self.queries[numQuery-1]).active and self.isBenchmarkWanted(numQuery, c)]
+		if len(queries) == 0:
+			return False
+		numStreams = streams['numStreams']
+		permutations = [[numQuery for numQuery in permutation if numQuery in queries] for permutation in self.getStreamPermutations()]
+		print("Streams at "+c+": "+str(numStreams)+" streams of "+str(len(queries))+" queries")
+		inputConfigs = {}
+		for numQuery in queries:
+			self.startBenchmarkingQuery(numQuery)
+			inputConfigs[numQuery] = self.getInputConfig(numQuery, c)
+		timeout = self.getConnectionManager(queries[0], c)['timeout']
+		manager = mp.Manager()
+		barrier = manager.Barrier(numStreams)
+		args = [(self.dbms[c].connectiondata, inputConfigs, permutations[i], i, c, self.path, barrier, timeout) for i in range(numStreams)]
+		if self.startBarrier is not None:
+			# start together with others
+			self.startBarrier(queries[0], c)
+		errors = []
+		try:
+			if self.pool is not None:
+				results = [res.get() for res in [self.pool.apply_async(singleStream, a) for a in args]]
+			else:
+				with mp.Pool(processes=numStreams) as pool:
+					results = [res.get() for res in [pool.apply_async(singleStream, a) for a in args]]
+		except Exception as e:
+			logging.exception('Caught an error: %s' % str(e))
+			errors.append('ERROR ({}) - {}'.format(type(e).__name__, e))
+			results = []
+		finally:
+			manager.shutdown()
+		self.workloadResults[c] = {numQuery: sorted([l for result in results for l in result['results'].get(numQuery, [])], key=lambda l: l.numRun) for numQuery in queries}
+		errors.extend([r['error'] for r in results if len(r['error']) > 0])
+		self.setWorkloadErrors(c, {numQuery: numStreams for numQuery in queries}, errors)
+		# throughput test: Ts is the time from start of first to end of last stream
+		durationStreams = 0.0
+		started = [r for r in results if r['start'] is not None]
+		if len(started) > 0:
+			durationStreams = 1000.0*(max([r['end'] for r in started]) - min([r['start'] for r in started]))
+		if not 'streams' in self.protocol:
+			self.protocol['streams'] = {}
+		self.protocol['streams'][c] = {
+			'numStreams': numStreams,
+			'numQueries': len(queries),
+			'streams': [{'stream': r['stream'], 'permutation': permutations[r['stream']], 'elapsed_ms': r['elapsed_ms'], 'start': r['startWall'], 'end': r['endWall'], 'error': r['error']} for r in results],
+			'elapsed_ms': durationStreams,
+			'queries_per_hour': sum([len(l) for l in self.workloadResults[c].values()])*3600.0*1000.0/durationStreams if durationStreams > 0 else 0.0,
+		}
+		if streams['scaleFactor'] is not None:
+			self.protocol['streams'][c]['throughput_at_size'] = self.protocol['streams'][c]['queries_per_hour']*float(streams['scaleFactor'])
+		print("Streams at {}: {:.2f} s, {:.1f} queries per hour".format(c, durationStreams/1000.0, self.protocol['streams'][c]['queries_per_hour']))
+		self.reporterStore.writeProtocol()
+		return True
+	def setWorkloadErrors(self, connectionname, expected, errors):
+		"""
+		Keeps an error for each query of a workload (streams, mix) that has received fewer runs than expected, for example because a client has failed.
+		The error is stored in the protocol by performBenchmark(), like errors of runs.
+
+		:param connectionname: Name of connection
+		:param expected: Dict of number of query and expected number of runs
+		:param errors: List of errors of clients
+		:return: Number of missing runs
+		"""
+		c = connectionname
+		self.workloadErrors[c] = {}
+		numMissingTotal = 0
+		for numQuery, numRuns in expected.items():
+			numMissing = numRuns - len(self.workloadResults[c].get(numQuery, []))
+			if numMissing > 0:
+				numMissingTotal += numMissing
+				self.workloadErrors[c][numQuery] = 'ERROR - {} of {} runs missing: {}'.format(numMissing, numRuns, '; '.join(errors) if len(errors) > 0 else 'client failed')
+		return numMissingTotal
+	def getMixConfig(self):
+		"""
+		Returns settings of the query mix.
+		These are given in the query file as 'mix', weights are given per query.
+		Queries with weight 0 are not part of the mix.
+
+		:return: Dict of settings, None if there is no mix (or there are streams)
+		"""
+		if not 'mix' in self.queryconfig or 'streams' in self.queryconfig:
+			return None
+		mix = copy.deepcopy(self.queryconfig['mix'])
+		mix['numProcesses'] = int(mix.get('numProcesses', 1))
+		mix['numRun'] = int(mix.get('numRun', 100))
+		mix['weights'] = {numQuery: float(q.get('weight', 1)) for numQuery, q in enumerate(self.queries, 1) if q.get('active', True) and float(q.get('weight', 1)) > 0}
+		return mix
+	def getMixSequence(self):
+		"""
+		Returns the order of runs of the query mix.
+		This is a random interleaving of all runs of all queries of the mix.
+		It is generated once and stored in the protocol, so all connections receive the same sequence.
+
+		:return: List of pairs (number of query, number of run)
+		"""
+		if not 'mixSequence' in self.protocol:
+			mix = self.getMixConfig()
+			sequence = [[numQuery, numRun] for numQuery in mix['weights'] for numRun in range(tools.query(self.queries[numQuery-1]).numRun)]
+			random.shuffle(sequence)
+			self.protocol['mixSequence'] = sequence
+		return self.protocol['mixSequence']
+	def runMix(self, connectionname):
+		"""
+		Runs the query mix of a connection: numProcesses concurrent clients pull the next run of any query of the mix.
+		Each query receives a share of all runs according to its weight.
+		Results of runs are kept until performBenchmark() stores them per query, so latencies are recorded per query.
+		Elapsed time and throughput of the whole workload are stored in the protocol.
+
+		:param connectionname: Name of connection
+		:return: True if mix has been run, False if skipped
+		"""
+		c = connectionname
+		mix = self.getMixConfig()
+		if mix is None or not self.dbms[c].connectiondata['active']:
+			return False
+		queries = [numQuery for numQuery in mix['weights'] if self.isBenchmarkWanted(numQuery, c)]
+		if len(queries) == 0:
+			return False
+		numProcesses = mix['numProcesses']
+		sequence = [(position, numQuery, numRun) for position, (numQuery, numRun) in enumerate(self.getMixSequence()) if numQuery in queries]
+		print("Mix at "+c+": "+str(numProcesses)+" clients, "+str(len(sequence))+" runs of "+str(len(queries))+" queries")
+		inputConfigs = {}
+		for numQuery in queries:
+			self.startBenchmarkingQuery(numQuery)
+			inputConfigs[numQuery] = self.getInputConfig(numQuery, c)
+		timeout = self.getConnectionManager(queries[0], c)['timeout']
+		manager = mp.Manager()
+		queue = manager.Queue()
+		for item in sequence:
+			queue.put(item)
+		for i in range(numProcesses):
+			queue.put(None)
+		barrier = manager.Barrier(numProcesses)
+		args = [(self.dbms[c].connectiondata, inputConfigs, queue, i, c, self.path, barrier, timeout) for i in range(numProcesses)]
+		if self.startBarrier is not None:
+			# start together with others
+			self.startBarrier(queries[0], c)
+		errors = []
+		try:
+			if self.pool is not None:
+				results = [res.get() for res in [self.pool.apply_async(singleMix, a) for a in args]]
+			else:
+				with mp.Pool(processes=numProcesses) as pool:
+					results = [res.get() for res in [pool.apply_async(singleMix, a) for a in args]]
+		except Exception as e:
+			logging.exception('Caught an error: %s' % str(e))
+			errors.append('ERROR ({}) - {}'.format(type(e).__name__, e))
+			results = []
+		finally:
+			manager.shutdown()
+		self.workloadResults[c] = {numQuery: sorted([l for result in results for l in result['results'].get(numQuery, [])], key=lambda l: l.numRun) for numQuery in queries}
+		errors.extend([r['error'] for r in results if len(r['error']) > 0])
+		numMissing = self.setWorkloadErrors(c, {numQuery: sum([1 for item in sequence if item[1] == numQuery]) for numQuery in queries}, errors)
+		durationMix = 0.0
+		started = [r for r in results if r['start'] is not None]
+		if len(started) > 0:
+			durationMix = 1000.0*(max([r['end'] for r in started]) - min([r['start'] for r in started]))
+		numRuns = sum([len(l) for l in self.workloadResults[c].values()])
+		numErrors = sum([1 for l in self.workloadResults[c].values() for r in l if len(r.error) > 0])
+		if not 'mix' in self.protocol:
+			self.protocol['mix'] = {}
+		self.protocol['mix'][c] = {
+			'numProcesses': numProcesses,
+			'numRun': numRuns,
+			'errors': numErrors,
+			'missing': numMissing,
+			'clientErrors': errors,
+			'elapsed_ms': durationMix,
+			'throughput_per_s': numRuns*1000.0/durationMix if durationMix > 0 else 0.0,
+			'queries': {str(numQuery): {
+				'weight': mix['weights'][numQuery],
+				'numRun': len(l),
+				'errors': sum([1 for r in l if len(r.error) > 0]),
+				'throughput_per_s': len(l)*1000.0/durationMix if durationMix > 0 else 0.0,
+				} for numQuery, l in self.workloadResults[c].items()},
+		}
+		print("Mix at {}: {} runs in {:.2f} s, {:.1f} runs per second".format(c, numRuns, durationMix/1000.0, self.protocol['mix'][c]['throughput_per_s']))
+		self.reporterStore.writeProtocol()
+		return True
+	def startPool(self):
+		"""
+		Starts the pool of worker processes for the experiment.
+		Each worker starts the JVM and loads the JDBC jars once.
+		The pool is reused by all pairs of query and connection.
+		Startup time is stored in the protocol.
+
+		:return: returns nothing
+		"""
+		if self.pool is not None:
+			return
+		self.numProcessesPool = self.getNumProcessesMax()
+		print("Start pool of {} workers".format(self.numProcessesPool))
+		start_pool = str(datetime.datetime.now())
+		start = default_timer()
+		queueWorkers = mp.Queue()
+		self.pool = mp.Pool(processes=self.numProcessesPool, initializer=initWorker, initargs=(tools.dbms.jars, queueWorkers))
+		# wait until all workers are initialized, each registers itself once
+		workers = {}
+		for i in range(self.numProcessesPool):
+			info = queueWorkers.get()
+			workers[str(info['pid'])] = info['durationInit']
+		end = default_timer()
+		durationPool = 1000.0*(end - start)
+		print("Pool started [ms]: "+str(durationPool))
+		if not 'pool' in self.protocol:
+			self.protocol['pool'] = []
+		self.protocol['pool'].append({'numProcesses': self.numProcessesPool, 'start': start_pool, 'duration': durationPool, 'workers': workers})
+	def stopPool(self, terminate=False):
+		"""
+		Stops the pool of worker processes.
+
+		:param terminate: Kill workers immediately (for example after a timeout) instead of waiting for them
+		:return: returns nothing
+		"""
+		if self.pool is None:
+			return
+		if terminate:
+			self.pool.terminate()
+		else:
+			self.pool.close()
+		self.pool.join()
+		self.pool = None
 	def runSingleBenchmarkRun(self, numQuery, connectionname, numRun=0):
 		"""
 		Runs a single benchmark run.
@@ -863,6 +1687,23 @@ class benchmarker():
 		:param connectionname: Name of connection to benchmark
 		:return: True if benchmark has been done, False if skipped
 		"""
+		if not self.isBenchmarkWanted(numQuery, connectionname):
+			return False
+		if numQuery in self.workloadResults.get(connectionname, {}):
+			# runs have been done by streams or mix
+			return self.performBenchmark(numQuery, connectionname)
+		if self.getConnectionManager(numQuery, connectionname)['sweep'] is not None:
+			return self.runSweep(numQuery, connectionname)
+		return self.runAdaptive(numQuery, connectionname)
+	def isBenchmarkWanted(self, numQuery, connectionname):
+		"""
+		Checks if a benchmark (fixed query and connection) should be done.
+		This is the case if we haven't already benchmarked that pair or it is explicitly wished to rerun the benchmark.
+
+		:param numQuery: Number of query to benchmark
+		:param connectionname: Name of connection to benchmark
+		:return: True if benchmark should be done
+		"""
 		#global activeConnections
 		# check if benchmark should be done
 		if self.timerExecution.checkForSuccessfulBenchmarks(numQuery, connectionname):
@@ -882,6 +1723,68 @@ class benchmarker():
 					# not this benchmark
 					logging.debug("Benchmarks of Q"+str(numQuery)+" at dbms "+connectionname+" not wanted right now")
 					return False
+		return True
+	def getJournalPrefix(self, numQuery, connectionname):
+		"""
+		Returns path and prefix of journal files of a query and connection.
+		Each worker appends finished runs to a file of its own, see tools.journal.
+
+		:param numQuery: Number of query
+		:param connectionname: Name of connection
+		:return: Path and prefix of journal files
+		"""
+		return self.path+'/query_'+str(numQuery)+'_journal_'+connectionname
+	def getTimeoutRate(self, timeouts, cancelled=[]):
+		"""
+		Counts runs that have exceeded the statement timeout.
+
+		:param timeouts: List of flags, one per run
+		:param cancelled: List of flags, one per run, if the run has been cancelled (and is not part of statistics)
+		:return: Dict of number of timeouts, number of cancelled runs, number of runs and rate of timeouts
+		"""
+		return {'count': sum(timeouts), 'cancelled': sum(cancelled), 'runs': len(timeouts), 'rate': sum(timeouts)/len(timeouts) if len(timeouts) > 0 else 0.0}
+	def getInputConfig(self, numQuery, connectionname):
+		"""
+		Returns input data of all runs of a query for the client processes.
+		This contains the query strings with replaced parameters.
+
+		:param numQuery: Number of query
+		:param connectionname: Name of connection
+		:return: List of singleRunInput objects, one per run (only the template in duration mode)
+		"""
+		c = connectionname
+		query = tools.query(self.queries[numQuery-1])
+		inputConfig = []
+		if query.duration > 0:
+			# query strings are generated lazily by the workers
+			inputConfig.append(singleRunInput(0, self.getQueryTemplate(numQuery, c), self.queries[numQuery-1]))
+		for i in range(query.numRun if query.duration == 0 else 0):
+			#print(self.protocol['query'][str(numQuery)]['runs'])
+			# replace parameter in query template
+			#if len(self.protocol['query'][str(numQuery)]['runs']) > 0:
+			#	queryString = self.getQueryString(query.queryList[i % len(query.queryList)], c, self.protocol['query'][str(numQuery)]['runs'][i])
+			#else:
+			#	queryString = self.getQueryString(numQuery, c, i)
+			queryString = self.getQueryString(numQuery, c, i)
+			#print(queryString)
+			logging.debug(queryString)
+			if query.prepared:
+				# template is prepared once per connection, values are bound per run
+				params = self.protocol['query'][str(numQuery)]['parameter'][i] if len(self.protocol['query'][str(numQuery)]['parameter']) > 0 else None
+				inputConfig.append(singleRunInput(i, queryString, self.queries[numQuery-1], self.getQueryTemplate(numQuery, c), params))
+			else:
+				inputConfig.append(singleRunInput(i, queryString, self.queries[numQuery-1]))
+		return inputConfig
+	def performBenchmark(self, numQuery, connectionname, numProcesses=None):
+		"""
+		Performs a benchmark run (fixed query and connection) and stores results.
+		This does not check if the benchmark has been done before.
+
+		:param numQuery: Number of query to benchmark
+		:param connectionname: Name of connection to benchmark
+		:param numProcesses: Number of parallel clients, overwrites connection management (level of sweep)
+		:return: True if benchmark has been done, False if skipped
+		"""
 		# prepare basic setting
 		logging.debug("Starting benchmarks of Q"+str(numQuery)+" at dbms "+connectionname)
 		self.startBenchmarkingQuery(numQuery)
@@ -893,12 +1796,17 @@ class benchmarker():
 		logger.setLevel(logging.ERROR)
 		# prepare query object
 		query = tools.query(q)
+		# level of a sweep: runs of different levels cannot be told apart in a journal
+		bSweepLevel = numProcesses is not None
 		# connection management for parallel connections
-		connectionmanagement = self.getConnectionManager(numQuery, c)
+		connectionmanagement = self.getConnectionManager(numQuery, c, numProcesses)
 		numProcesses = connectionmanagement['numProcesses']#self.numProcesses
 		batchsize = connectionmanagement['runsPerConnection']#self.runsPerConnection
 		timeout = connectionmanagement['timeout']#self.timeout
 		singleConnection = connectionmanagement['singleConnection']
+		arrivalRate = connectionmanagement['arrivalRate']
+		arrivalProcess = connectionmanagement['arrivalProcess']
+		manager = None
 		if singleConnection and len(self.activeConnections) < numProcesses:
 			print("More active connections from {} to {}".format(len(self.activeConnections), numProcesses))
 			for i in range(len(self.activeConnections), numProcesses):
@@ -946,6 +1854,7 @@ class benchmarker():
 			self.timerExecution.skipTimer(numQuery, query, connectionname)
 			self.timerTransfer.skipTimer(numQuery, query, connectionname)
 			self.timerConnect.skipTimer(numQuery, query, connectionname)
+			self.timerPrepare.skipTimer(numQuery, query, connectionname)
 			self.stopBenchmarkingQuery(numQuery)
 			return False
 		# skip connection if not active
@@ -955,6 +1864,7 @@ class benchmarker():
 			self.timerExecution.skipTimer(numQuery, query, connectionname)
 			self.timerTransfer.skipTimer(numQuery, query, connectionname)
 			self.timerConnect.skipTimer(numQuery, query, connectionname)
+			self.timerPrepare.skipTimer(numQuery, query, connectionname)
 			self.stopBenchmarkingQuery(numQuery)
 			return False
 		# always reset parts of protocol
@@ -980,12 +1890,16 @@ class benchmarker():
 				self.connectDBMS(c)
 			else:
 				self.timerConnect.startTimer(numQuery, query, connectionname)
+			if query.prepared:
+				self.timerPrepare.startTimer(numQuery, query, connectionname)
+			else:
+				self.timerPrepare.skipTimer(numQuery, query, connectionname)
 			#queryString = query.query
 			#if c in query.DBMS:
 			#	queryString = query.DBMS[c]
 			#logging.debug(queryString)
 			# it is a query template
-			if len(self.protocol['query'][str(numQuery)]['parameter']) > 0 or len(self.protocol['query'][str(numQuery)]['runs']) > 0:
+			if len(self.protocol['query'][str(numQuery)]['parameter']) > 0 or len(self.protocol['query'][str(numQuery)]['runs']) > 0 or (query.duration > 0 and len(query.parameter) > 0):
 				#queryTemplate = queryString
 				bParametrized = True
 			else:
@@ -997,39 +1911,102 @@ class benchmarker():
 			else:
 				range_runs = tqdm(range(0, query.numRun))
 			# prepare input data for processes
-			inputConfig = []
-			for i in range(query.numRun):
-				#print(self.protocol['query'][str(numQuery)]['runs'])
-				# replace parameter in query template
-				#if len(self.protocol['query'][str(numQuery)]['runs']) > 0:
-				#	queryString = self.getQueryString(query.queryList[i % len(query.queryList)], c, self.protocol['query'][str(numQuery)]['runs'][i])
-				#else:
-				#	queryString = self.getQueryString(numQuery, c, i)
-				queryString = self.getQueryString(numQuery, c, i)
-				#print(queryString)
-				logging.debug(queryString)
-				inputConfig.append(singleRunInput(i, queryString, self.queries[numQuery-1]))
+			inputConfig = self.getInputConfig(numQuery, c)
 			lists = []
+			# runs finished before a crash, and journal for this attempt
+			durable = []
+			journal = None
+			# list of tasks (runs, schedule), one per connection
+			if query.duration > 0:
+				# duration mode: clients pull runs until deadline
+				print("duration: "+str(query.duration)+" seconds, warmup: "+str(query.durationWarmup)+" seconds")
+				if arrivalRate is not None:
+					print("arrivalRate is ignored in duration mode")
+				manager = mp.Manager()
+				counter = manager.Value('i', 0)
+				lock = manager.Lock()
+				barrier = manager.Barrier(numProcesses)
+				batches = [([], {'duration': query.duration, 'durationWarmup': query.durationWarmup, 'counter': counter, 'lock': lock, 'barrier': barrier, 'client': i, 'timeout': timeout, 'template': inputConfig[0].queryString, 'parameters': query.parameter, 'seed': self.protocol['query'][str(numQuery)]['parameterSeed'], 'defaultParameters': parameter.defaultParameters}) for i in range(numProcesses)]
+			elif arrivalRate is not None:
+				# open loop: runs arrive at given rate, each client pulls the next arrived run
+				print("arrivalRate: "+str(arrivalRate)+" per second, "+arrivalProcess)
+				offsets = tools.getArrivalOffsets(query.numRun, arrivalRate, arrivalProcess)
+				manager = mp.Manager()
+				queue = manager.Queue()
+				for i in runs:
+					queue.put(i)
+				for i in range(numProcesses):
+					queue.put(None)
+				barrier = manager.Barrier(numProcesses)
+				batches = [([], {'queue': queue, 'barrier': barrier, 'offsets': offsets, 'client': i, 'timeout': timeout}) for i in range(numProcesses)]
+			else:
+				if query.targetPrecision == 0 and not bSweepLevel and not numQuery in self.workloadResults.get(c, {}):
+					# fixed list of runs in a single round: resume from journal
+					prefix = self.getJournalPrefix(numQuery, c)
+					if self.overwrite:
+						tools.journal.remove(prefix)
+					durable = [l for numRun, l in sorted(tools.journal.readRuns(prefix).items()) if numRun < query.numRun]
+					if len(durable) > 0:
+						print("Resume from journal: {} of {} runs have been done".format(len(durable), query.numRun))
+						runsDone = [l.numRun for l in durable]
+						runs = [i for i in runs if not i in runsDone]
+						numBatches = math.ceil(len(runs)/batchsize)
+					if self.journal:
+						journal = prefix
+						# parameters of runs must survive a crash as well
+						self.reporterStore.writeProtocol(numQuery)
+				batches = [(runs[i*batchsize:(i+1)*batchsize], None) for i in range(numBatches)]
+			if self.startBarrier is not None:
+				# start together with others
+				self.startBarrier(numQuery, c)
 			# perform required number of warmup and benchmark runs of query
 			durationBenchmark = 0.0
 			start = default_timer()
 			# store start time for query / connection
 			self.protocol['query'][str(numQuery)]['starts'][c] = str(datetime.datetime.now())
 			# pooling
-			if self.pool is not None:
+			bWorkload = numQuery in self.workloadResults.get(c, {})
+			if bWorkload:
+				# streams and mix: runs have been done by runStreams() or runMix()
+				lists = self.workloadResults[c].pop(numQuery)
+			elif self.pool is not None:
 				#multiple_results = [self.pool.apply_async(singleRun, (self.dbms[c].connectiondata, inputConfig, runs[i*batchsize:(i+1)*batchsize], connectionname, numQuery, self.path, JPickler.dumps(self.activeConnections))) for i in range(numBatches)]
-				multiple_results = [self.pool.apply_async(singleRun, (self.dbms[c].connectiondata, inputConfig, runs[i*batchsize:(i+1)*batchsize], connectionname, numQuery, self.path, [], BENCHMARKER_VERBOSE_QUERIES)) for i in range(numBatches)]
+				# pool may be larger than numProcesses, so we limit the number of batches running in parallel
+				slots = threading.BoundedSemaphore(numProcesses)
+				multiple_results = []
+				for batch, schedule in batches:
+					if not slots.acquire(timeout=timeout):
+						raise mp.TimeoutError()
+					multiple_results.append(self.pool.apply_async(singleRun, (self.dbms[c].connectiondata, inputConfig, batch, connectionname, numQuery, self.path, [], BENCHMARKER_VERBOSE_QUERIES, schedule), {'journal': journal}, callback=lambda result: slots.release(), error_callback=lambda e: slots.release()))
 				lists = [res.get(timeout=timeout) for res in multiple_results]
 				lists = [i for j in lists for i in j]
 			else:
 				with mp.Pool(processes=numProcesses) as pool:
 					#multiple_results = [pool.apply_async(singleRun, (self.dbms[c].connectiondata, inputConfig, runs[i*batchsize:(i+1)*batchsize], connectionname, numQuery, self.path, JPickler.dumps(self.activeConnections))) for i in range(numBatches)]
-					multiple_results = [pool.apply_async(singleRun, (self.dbms[c].connectiondata, inputConfig, runs[i*batchsize:(i+1)*batchsize], connectionname, numQuery, self.path, [], BENCHMARKER_VERBOSE_QUERIES)) for i in range(numBatches)]
+					multiple_results = [pool.apply_async(singleRun, (self.dbms[c].connectiondata, inputConfig, batch, connectionname, numQuery, self.path, [], BENCHMARKER_VERBOSE_QUERIES, schedule), {'journal': journal}) for batch, schedule in batches]
 					lists = [res.get(timeout=timeout) for res in multiple_results]
 					lists = [i for j in lists for i in j]
+			# open loop yields runs in order of clients
+			lists = sorted(durable + lists, key=lambda l: l.numRun)
 			# store end time for query / connection
 			end = default_timer()
 			durationBenchmark = 1000.0*(end - start)
+			if len(durable) > 0:
+				# time of runs before the crash
+				durationBenchmark += 1000.0*(max([l.end for l in durable]) - min([l.start for l in durable]))
+				if not 'resumed' in self.protocol['query'][str(numQuery)]:
+					self.protocol['query'][str(numQuery)]['resumed'] = {}
+				self.protocol['query'][str(numQuery)]['resumed'][c] = len(durable)
+			if query.duration > 0 and len(lists) > 0:
+				# warmup does not count
+				durationBenchmark = 1000.0*(max([l.endMonotonic for l in lists]) - min([l.startMonotonic for l in lists]))
+				# parameters of runs not seen before
+				for l in lists[len(self.protocol['query'][str(numQuery)]['parameter']):]:
+					if l.parameter is not None:
+						self.protocol['query'][str(numQuery)]['parameter'].append(l.parameter)
+			elif bWorkload and len(lists) > 0:
+				# runs are concurrent with other queries
+				durationBenchmark = 1000.0*(max([l.endMonotonic for l in lists]) - min([l.startMonotonic for l in lists]))
 			self.protocol['query'][str(numQuery)]['ends'][c] = str(datetime.datetime.now())
 			#pool.close()
 			#pool.join()
@@ -1040,28 +2017,48 @@ class benchmarker():
 				if len(l_error[i]) > 0:
 					error = l_error[i]
 					break
+			if bWorkload and len(error) == 0:
+				# runs that have not been done, because a client of the workload has failed
+				error = self.workloadErrors.get(c, {}).pop(numQuery, "")
 			print(error)
+			l_timeout = [l.timeout for l in lists]
+			# cancelled runs have no result set (placeholder None), they are not compared
+			l_cancelled = [getattr(l, 'cancelled', False) for l in lists]
+			numRunReference = next((i for i in range(len(l_data)) if l_data[i] is not None), 0)
+			if not 'timeouts' in self.protocol['query'][str(numQuery)]:
+				self.protocol['query'][str(numQuery)]['timeouts'] = {}
+			self.protocol['query'][str(numQuery)]['timeouts'][c] = self.getTimeoutRate(l_timeout, l_cancelled)
+			if sum(l_timeout) > 0:
+				print("Timeouts: "+str(sum(l_timeout))+" of "+str(len(l_timeout))+" runs")
+			# time until cancel is not a measured time, so cancelled runs are excluded from statistics (NaN)
+			l_execute = [float('nan') if cancelled else t for t, cancelled in zip(l_execute, l_cancelled)]
+			l_transfer = [float('nan') if cancelled else t for t, cancelled in zip(l_transfer, l_cancelled)]
 			self.timerConnect.time_c = l_connect
 			self.timerExecution.time_c = l_execute
 			self.timerTransfer.time_c = l_transfer
+			self.timerPrepare.time_c = [l.durationPrepare for l in lists]
+			# merge histograms of workers
+			for t in [self.timerConnect, self.timerExecution, self.timerTransfer, self.timerPrepare]:
+				t.histogram_c = tools.histogram()
+				if len(durable) > 0:
+					# runs from journal have no histograms, so it is rebuilt from all runs
+					t.histogram_c = tools.histogram.fromValues(t.time_c[query.numRunBegin:query.numRunEnd])
+					continue
+				for l in lists:
+					if l.histograms is not None:
+						t.histogram_c.merge(l.histograms[t.name])
+			# batch i is sent via (client) connection i
+			if not numQuery in self.timeseries:
+				self.timeseries[numQuery] = {}
+			self.timeseries[numQuery][c] = [{'numRun': l.numRun, 'worker': l.worker, 'client': l.client if l.client is not None else l.numRun // batchsize, 'stream': l.stream, 'position': l.position, 'timeout': l.timeout, 'cancelled': getattr(l, 'cancelled', False), 'intended': l.intended, 'queue': l.queue, 'start': l.start, 'end': l.end, 'startMonotonic': l.startMonotonic, 'endMonotonic': l.endMonotonic} for l in lists]
 			self.protocol['query'][str(numQuery)]['durations'][c] = durationBenchmark
 			self.protocol['query'][str(numQuery)]['errors'][c] = error
-			# prepare input data for processing result sets
-			inputConfig = []
-			for i in range(query.numRun):
-				inputConfig.append(singleResultInput(i, l_data[i], l_columnnames[i], self.queries[numQuery-1]))
-			lists = []
-			numProcesses_data = mp.cpu_count()
-			batchsize_data = 1
-			numBatches_data = math.ceil(query.numRun/batchsize_data)
-			runs_data = list(range(0,query.numRun))
-			if query.storeData != False:
-				with mp.Pool(processes=numProcesses_data) as pool:
-					multiple_results = [pool.apply_async(singleResult, (self.dbms[c].connectiondata, inputConfig, runs[i*batchsize_data:(i+1)*batchsize_data], connectionname, numQuery, self.path)) for i in range(numBatches_data)]
-					lists = [res.get(timeout=timeout) for res in multiple_results]
-					lists = [i for j in lists for i in j]
-				l_data = [l.data for l in lists]
-				l_size = [l.size for l in lists]
+			# result sets have already been reduced by the workers
+			l_sample = [l.sample for l in lists]
+			if len(l_sample) > 0 and len(l_sample[0]) > 0:
+				if 'samples' not in self.protocol['query'][str(numQuery)]:
+					self.protocol['query'][str(numQuery)]['samples'] = {}
+				self.protocol['query'][str(numQuery)]['samples'][c] = l_sample[0]
 			#print("Size:")
 			#print(l_size)
 			#print("Data:")
@@ -1069,6 +2066,12 @@ class benchmarker():
 			size = int(sum(l_size))
 			print("Size of data storage: "+str(size))
 			self.protocol['query'][str(numQuery)]['sizes'][c] = size
+			# result set of first run is in result store, connection references it by digest
+			l_digest = [l.resultDigest for l in lists if getattr(l, 'resultDigest', None) is not None]
+			if len(l_digest) > 0:
+				if 'resultDigests' not in self.protocol['query'][str(numQuery)]:
+					self.protocol['query'][str(numQuery)]['resultDigests'] = {}
+				self.protocol['query'][str(numQuery)]['resultDigests'][c] = l_digest[0]
 			# result set of query / connection
 			# only for comparion
 			# will be dropped if comparison is successful
@@ -1077,7 +2080,9 @@ class benchmarker():
 				if not bParametrized:
 					# shall be constant for all runs
 					for i in range(len(l_data)):
-						if not l_data[i] == l_data[0]:
+						if l_data[i] is None:
+							continue
+						if not l_data[i] == l_data[numRunReference]:
 							#print("Received data %i:" % i)
 							#print(l_data[i])
 							#print("Received data 0:")
@@ -1093,13 +2098,19 @@ class benchmarker():
 			else:
 				# all runs have same data store
 				dataIndex = 1
-				data = [l_data[0]]
+				data = [l_data[numRunReference]]
 			# store result set for query only
 			# shall be the same for all connections
 			#print(self.protocol['query'][str(numQuery)]['dataStorage'])
-			if len(self.protocol['query'][str(numQuery)]['dataStorage']) < dataIndex:
+			if len(self.protocol['query'][str(numQuery)]['dataStorage']) == 0 and dataIndex > 0:
 				self.protocol['query'][str(numQuery)]['dataStorage'].extend(data)
+				self.protocol['query'][str(numQuery)]['dataStorageConnection'] = c
 			else:
+				if len(self.protocol['query'][str(numQuery)]['dataStorage']) < dataIndex:
+					# duration mode: number of runs differs per connection, compare common runs and keep the others
+					data = data[len(self.protocol['query'][str(numQuery)]['dataStorage']):]
+					dataIndex = len(self.protocol['query'][str(numQuery)]['dataStorage'])
+					self.protocol['query'][str(numQuery)]['dataStorage'].extend(data)
 				numRunStorage = len(self.protocol['query'][str(numQuery)]['dataStorage'])
 				numRunReceived = len(l_data)
 				if BENCHMARKER_VERBOSE_STATISTICS:
@@ -1109,19 +2120,34 @@ class benchmarker():
 					if BENCHMARKER_VERBOSE_STATISTICS:
 						print("NumRuns to compare: "+str(dataIndex))
 					for i in range(dataIndex):
+						if l_data[i] is None:
+							continue
+						if list.__getitem__(self.protocol['query'][str(numQuery)]['dataStorage'], i) is None:
+							# run has been cancelled at the connection of the reference, so this result set becomes the reference
+							self.protocol['query'][str(numQuery)]['dataStorage'][i] = l_data[i]
+							continue
 						#print("Stored data #%i:" % i)
 						#print(self.protocol['query'][str(numQuery)]['dataStorage'][i])#, floatfmt=".10f"))
 						#print("Received data #%i:" % i)
 						#print(l_data[i])
-						if not l_data[i] == self.protocol['query'][str(numQuery)]['dataStorage'][i]:
+						if not tools.isEqualResultSet(self.protocol['query'][str(numQuery)]['dataStorage'], i, l_data[i]):
 							self.protocol['query'][str(numQuery)]['warnings'][c] = 'NumRun '+str(i+1)+': Received differing result set'
 							logging.debug('Received differing result set')
 							keepResultsets = True
+							if query.result == 'multiset' and self.protocol['query'][str(numQuery)].get('dataStorageConnection', c) != c:
+								# hash does not tell what differs, rows can be compared later by getResultSetDiff()
+								if not 'mismatches' in self.protocol['query'][str(numQuery)]:
+									self.protocol['query'][str(numQuery)]['mismatches'] = {}
+								self.protocol['query'][str(numQuery)]['mismatches'][c] = {'reference': self.protocol['query'][str(numQuery)]['dataStorageConnection'], 'numRun': i}
 							break
 							#raise ValueError('Received differing result set')
 		except Exception as e:
 			logging.exception('Caught an error: %s' % str(e))
 			self.protocol['query'][str(numQuery)]['errors'][c] = 'ERROR ({}) - {}'.format(type(e).__name__, e)
+			if isinstance(e, mp.TimeoutError) and self.pool is not None:
+				# workers may still be busy with the aborted batches
+				self.stopPool(terminate=True)
+				self.startPool()
 			# store end time for query / connection
 			self.protocol['query'][str(numQuery)]['ends'][c] = str(datetime.datetime.now())
 			# benchmark is 0 due to error
@@ -1130,12 +2156,16 @@ class benchmarker():
 			if query.withConnect:
 				# we do benchmark connection time, so we connect every run
 				self.timerConnect.abortTimerRun()
+			if query.prepared:
+				self.timerPrepare.abortTimerRun()
 			# this means ignore benchmark for this query/connection due to error
 			self.timerExecution.cancelTimer()
 			self.timerTransfer.cancelTimer()
 			if query.withConnect:
 				# we do benchmark connection time, so we connect every run
 				self.timerConnect.cancelTimer()
+			if query.prepared:
+				self.timerPrepare.cancelTimer()
 			# this means store results even if error happend
 			#self.timerExecution.abortTimer()
 			#self.timerTransfer.abortTimer()
@@ -1143,12 +2173,16 @@ class benchmarker():
 			# https://github.com/tqdm/tqdm/issues/613
 			breakLoop = True
 		finally:
+			if manager is not None:
+				manager.shutdown()
 			self.timerExecution.finishTimer()
 			self.timerTransfer.finishTimer()
 			if query.withConnect:
 				# we do benchmark connection time, so we connect every run
 				#self.disconnectDBMS(c)
 				self.timerConnect.finishTimer()
+			if query.prepared:
+				self.timerPrepare.finishTimer()
 		if not keepResultsets:
 			self.protocol['query'][str(numQuery)]['resultSets'][c] = []
 		self.stopBenchmarkingQuery(numQuery)
@@ -1156,6 +2190,160 @@ class benchmarker():
 		#	metricsReporter = monitor.metrics(self)
 		#	metricsReporter.generatePlotForQuery(numQuery)
 		return True
+	def runSweep(self, numQuery, connectionname):
+		"""
+		Performs benchmark runs (fixed query and connection) for increasing numbers of parallel clients.
+		Stops as soon as throughput does not improve by more than sweepThreshold (relative) compared to the best level so far.
+		This level is the knee of the curve.
+		Throughput and latency per level are stored in the protocol, the timers keep the results of the last level.
+
+		:param numQuery: Number of query to benchmark
+		:param connectionname: Name of connection to benchmark
+		:return: True if benchmark has been done, False if skipped
+		"""
+		connectionmanagement = self.getConnectionManager(numQuery, connectionname)
+		if not 'sweep' in self.protocol['query'][str(numQuery)]:
+			self.protocol['query'][str(numQuery)]['sweep'] = {}
+		levels = []
+		self.protocol['query'][str(numQuery)]['sweep'][connectionname] = levels
+		knee = None
+		bBenchmarkDone = False
+		for numProcesses in connectionmanagement['sweep']:
+			print("Sweep Q{} at dbms {}: numProcesses {}".format(numQuery, connectionname, numProcesses))
+			if not self.runAdaptive(numQuery, connectionname, numProcesses):
+				break
+			bBenchmarkDone = True
+			if len(self.protocol['query'][str(numQuery)]['errors'][connectionname]) > 0:
+				break
+			query = tools.query(self.queries[numQuery-1])
+			# same measures as evaluator: throughput_run_total_ps and latency_run_mean_ms
+			times = [self.timerExecution.times[numQuery-1][connectionname], self.timerTransfer.times[numQuery-1].get(connectionname, []), self.timerConnect.times[numQuery-1].get(connectionname, []), self.timerPrepare.times[numQuery-1].get(connectionname, [])]
+			l = [sum(t[i] for t in times if i < len(t)) for i in range(len(times[0]))][query.numRunBegin:query.numRunEnd]
+			# cancelled runs have no latency
+			l = [x for x in l if not math.isnan(x)]
+			totaltime_ms = self.protocol['query'][str(numQuery)]['durations'][connectionname]
+			level = {
+				'numProcesses': numProcesses,
+				'runs': len(times[0]),
+				'totaltime_ms': totaltime_ms,
+				'throughput_run_total_ps': len(times[0])/totaltime_ms*1000.0 if totaltime_ms > 0 else 0.0,
+				'latency_run_mean_ms': sum(l)/len(l) if len(l) > 0 else 0.0,
+				'knee': False}
+			levels.append(level)
+			print("Sweep Q{} at dbms {}: numProcesses {}, throughput {:.2f} per second, latency {:.2f} ms".format(numQuery, connectionname, numProcesses, level['throughput_run_total_ps'], level['latency_run_mean_ms']))
+			best = max(levels[:-1], key=lambda x: x['throughput_run_total_ps'], default=None)
+			if best is not None and level['throughput_run_total_ps'] < best['throughput_run_total_ps']*(1.0+connectionmanagement['sweepThreshold']):
+				# saturated
+				knee = best
+				break
+		if knee is None and len(levels) > 0:
+			knee = max(levels, key=lambda x: x['throughput_run_total_ps'])
+		if knee is not None:
+			knee['knee'] = True
+			print("Sweep Q{} at dbms {}: knee at numProcesses {}".format(numQuery, connectionname, knee['numProcesses']))
+		return bBenchmarkDone
+	def runAdaptive(self, numQuery, connectionname, numProcesses=None):
+		"""
+		Performs benchmark runs (fixed query and connection) in rounds of numRun runs.
+		After each round the confidence interval of mean or median of the run times (connect, execution and transfer) is computed.
+		Stops when the relative half-width is at most targetPrecision or numRunMax runs have been done.
+		Warmup runs are only done in the first round.
+		Without targetPrecision set for the query this is a single round.
+		The timers and timeseries keep all runs of all rounds.
+		A round with an error ends the benchmark, its runs are kept and the error stays in the protocol.
+
+		:param numQuery: Number of query to benchmark
+		:param connectionname: Name of connection to benchmark
+		:param numProcesses: Number of parallel clients, overwrites connection management (level of sweep)
+		:return: True if benchmark has been done, False if skipped
+		"""
+		query = tools.query(self.queries[numQuery-1])
+		if query.targetPrecision == 0:
+			return self.performBenchmark(numQuery, connectionname, numProcesses)
+		c = connectionname
+		protocol = self.protocol['query'][str(numQuery)]
+		timers = [self.timerExecution, self.timerTransfer, self.timerConnect, self.timerPrepare]
+		times = {t.name: [] for t in timers}
+		timeseries = []
+		durationBenchmark = 0.0
+		start = None
+		warning = ""
+		resultSets = []
+		rounds = []
+		bBenchmarkDone = False
+		queryConfig = self.queries[numQuery-1]
+		while len(times[self.timerExecution.name]) < query.numRunMax:
+			try:
+				if len(rounds) > 0:
+					# warmup only in first round, so all runs of later rounds count
+					self.queries[numQuery-1] = {**queryConfig, 'numWarmup': 0}
+				bRoundDone = self.performBenchmark(numQuery, c, numProcesses)
+			finally:
+				self.queries[numQuery-1] = queryConfig
+			if not bRoundDone:
+				break
+			bBenchmarkDone = True
+			numRunsDone = len(times[self.timerExecution.name])
+			for t in timers:
+				if c in t.times[numQuery-1]:
+					times[t.name].extend(t.times[numQuery-1][c])
+			timeseries.extend([tools.joinDicts(run, {'numRun': run['numRun']+numRunsDone}) for run in self.timeseries[numQuery][c]])
+			durationBenchmark += protocol['durations'][c]
+			if start is None:
+				start = protocol['starts'][c]
+			if len(protocol['errors'][c]) > 0:
+				# runs of failed round are kept together with the previous rounds, error stays in protocol
+				resultSets = protocol['resultSets'][c]
+				break
+			if len(protocol['warnings'][c]) > 0 and len(warning) == 0:
+				warning = protocol['warnings'][c]
+				resultSets = protocol['resultSets'][c]
+			# run times, without warmup and without cancelled runs
+			l = [sum(x) for x in zip(*[v for v in times.values() if len(v) > 0])][query.numRunBegin:]
+			l = [x for x in l if not math.isnan(x)]
+			center, halfwidth = tools.timer.getConfidenceInterval(l, query.confidence, query.precisionStatistic)
+			precision = halfwidth/center if center > 0 else float('inf')
+			rounds.append({'runs': len(times[self.timerExecution.name]), query.precisionStatistic+'_ms': center, 'halfwidth_ms': halfwidth, 'precision': precision})
+			print("Round {}: {} runs, {} {:.4f} ms +/- {:.4f} ms ({:.2%} at confidence {})".format(len(rounds), len(l), query.precisionStatistic, center, halfwidth, precision, query.confidence))
+			if precision <= query.targetPrecision:
+				break
+		if not bBenchmarkDone:
+			return False
+		# all rounds together
+		for t in timers:
+			if c in t.times[numQuery-1]:
+				t.times[numQuery-1][c] = times[t.name]
+				# histogram is rebuilt from all rounds, warmup runs are at the beginning of the first round
+				hist = tools.histogram.fromValues(times[t.name][query.numRunBegin:query.numRunEnd])
+				t.setHistogram(numQuery, c, hist)
+				t.stats[numQuery-1][c] = t.getStats(times[t.name][query.numRunBegin:query.numRunEnd], hist)
+		self.timeseries[numQuery][c] = timeseries
+		protocol['timeouts'][c] = self.getTimeoutRate([run.get('timeout', False) for run in timeseries], [run.get('cancelled', False) for run in timeseries])
+		protocol['durations'][c] = durationBenchmark
+		protocol['starts'][c] = start
+		protocol['warnings'][c] = warning
+		protocol['resultSets'][c] = resultSets
+		if not 'adaptive' in protocol:
+			protocol['adaptive'] = {}
+		protocol['adaptive'][c] = rounds
+		return True
+	def generateParameters(self, numQuery):
+		"""
+		Generates parameters of a query, if not present in the protocol already.
+		In duration mode only a common seed is generated, parameters of runs are derived from it lazily.
+
+		:param numQuery: Number of query
+		:return: Dict of parameters of the protocol (parameter and possibly parameterSeed)
+		"""
+		query = tools.query(self.queries[numQuery-1])
+		if query.duration > 0:
+			# number of runs is unknown, parameters are generated lazily per run from a common seed
+			if 'parameterSeed' not in self.protocol['query'][str(numQuery)]:
+				self.protocol['query'][str(numQuery)]['parameterSeed'] = random.random()
+		elif len(query.parameter) > 0 and len(self.protocol['query'][str(numQuery)]['parameter']) == 0:
+			params = parameter.generateParameters(query.parameter, query.numRun)
+			self.protocol['query'][str(numQuery)]['parameter'] = params
+		return {k: v for k, v in self.protocol['query'][str(numQuery)].items() if k in ['parameter', 'parameterSeed']}
 	def startBenchmarkingQuery(self, numQuery):
 		"""
 		Starts protocol for that specific query.
@@ -1169,9 +2357,7 @@ class benchmarker():
 		self.start_query = timer()
 		q = self.queries[numQuery-1]
 		query = tools.query(q)
-		if len(query.parameter) > 0 and len(self.protocol['query'][str(numQuery)]['parameter']) == 0:
-			params = parameter.generateParameters(query.parameter, query.numRun)
-			self.protocol['query'][str(numQuery)]['parameter'] = params
+		self.generateParameters(numQuery)
 		if len(query.queryList) > 0:
 			numRunList = []
 			for queryElement in range(query.numRun): # query.queryList:
@@ -1208,12 +2394,17 @@ class benchmarker():
 				# if benchmark has been done: store and generate reports
 				if bBenchmarkDoneForThisQuery:
 					# store results
-					self.reporterStore.generate(numQuery, [self.timerExecution, self.timerTransfer, self.timerConnect])
+					self.reporterStore.generate(numQuery, [self.timerExecution, self.timerTransfer, self.timerConnect, self.timerPrepare])
+					# runs are durable in result folder now
+					tools.journal.remove(self.getJournalPrefix(numQuery, c))
+					if self.reporterSender is not None:
+						# send measurements immediately, also in batch mode
+						self.reporterSender.generate(numQuery, [self.timerExecution, self.timerTransfer, self.timerConnect, self.timerPrepare])
 					if not self.bBatch:
 						# generate reports
 						for r in self.reporter:
 							r.init()
-							r.generate(numQuery, [self.timerExecution, self.timerTransfer, self.timerConnect])
+							r.generate(numQuery, [self.timerExecution, self.timerTransfer, self.timerConnect, self.timerPrepare])
 	def runBenchmarksConnection(self):
 		"""
 		Performs connectionwise benchmark runs.
@@ -1222,17 +2413,95 @@ class benchmarker():
 		:return: returns nothing
 		"""
 		for c in sorted(self.dbms.keys()):
+			# throughput test or query mix: all queries of this connection run concurrently first
+			if not self.runStreams(c):
+				self.runMix(c)
 			for numQuery in range(1, len(self.queries)+1):
 				bBenchmarkDone = self.runBenchmark(numQuery, c)
 				# if benchmark has been done: store and generate reports
 				if bBenchmarkDone:
 					# store results
-					self.reporterStore.generate(numQuery, [self.timerExecution, self.timerTransfer, self.timerConnect])
+					self.reporterStore.generate(numQuery, [self.timerExecution, self.timerTransfer, self.timerConnect, self.timerPrepare])
+					# runs are durable in result folder now
+					tools.journal.remove(self.getJournalPrefix(numQuery, c))
+					if self.reporterSender is not None:
+						# send measurements immediately, also in batch mode
+						self.reporterSender.generate(numQuery, [self.timerExecution, self.timerTransfer, self.timerConnect, self.timerPrepare])
 					if not self.bBatch:
 						# generate reports
 						for r in self.reporter:
 							r.init()
-							r.generate(numQuery, [self.timerExecution, self.timerTransfer, self.timerConnect])
+							r.generate(numQuery, [self.timerExecution, self.timerTransfer, self.timerConnect, self.timerPrepare])
+			self.workloadResults.pop(c, None)
+			self.workloadErrors.pop(c, None)
+	def getConnectionGroups(self):
+		"""
+		Returns groups of connections for parallel working.
+		Groups run in parallel, connections of a group run one after the other.
+		Each connection is a group of its own, unless serializeHosts is set: then connections sharing a host form a group.
+
+		:return: List of lists of names of connections
+		"""
+		groups = {}
+		for c in sorted(self.dbms.keys()):
+			if not self.dbms[c].connectiondata['active'] or (self.fixedConnection is not None and self.fixedConnection != c):
+				continue
+			host = self.dbms[c].getHost() if self.serializeHosts else None
+			key = ('host', host) if host is not None else ('connection', c)
+			if not key in groups:
+				groups[key] = []
+			groups[key].append(c)
+		return list(groups.values())
+	def runBenchmarksParallel(self):
+		"""
+		Performs benchmarks of all connections in parallel.
+		Each group of connections runs in an isolated process, that works connectionwise and stores results in subfolders named after the connections.
+		Partial results are merged by tools.merge_partial_results() and read back afterwards.
+
+		:return: returns nothing
+		"""
+		groups = self.getConnectionGroups()
+		settings = {
+			'fixedQuery': self.fixedQuery,
+			'anonymize': self.anonymize,
+			'unanonymize': self.unanonymize,
+			'numProcesses': self.connectionmanagement['numProcesses'],
+			'batch': self.bBatch,
+			'overwrite': self.overwrite,
+			'template': tools.query.template,
+			'journal': self.journal,
+			'seed': self.seed,
+			# parameters are generated once, so all connections get the same
+			'parameters': {str(numQuery): self.generateParameters(numQuery) for numQuery in range(1, len(self.queries)+1) if self.fixedQuery is None or self.fixedQuery == numQuery},
+		}
+		print("Benchmark {} connections in {} parallel processes".format(sum([len(group) for group in groups]), len(groups)))
+		# processes must not be daemonic, because they start pools of their own
+		processes = [mp.Process(target=singleConnectionGroup, args=(self.path, group, settings)) for group in groups]
+		for p in processes:
+			p.start()
+		for p, group in zip(processes, groups):
+			p.join()
+			if p.exitcode != 0:
+				print("Process of "+", ".join(group)+" has failed with exit code "+str(p.exitcode))
+		folder = path.normpath(self.path)
+		tools.merge_partial_results(folder[:-len(self.code)], self.code)
+		self.readResultfolder()
+		self.setTimeLoadFromIngest()
+	def setTimeLoadFromIngest(self):
+		"""
+		Sets timeLoad of connections to the time measured by an ingest phase in another process, as found in the protocol.
+		The connections.config of the result folder is updated.
+
+		:return: returns nothing
+		"""
+		bLoaded = False
+		for c, ingest in self.protocol.get('ingest', {}).items():
+			if c in self.dbms and len(ingest['error']) == 0:
+				self.dbms[c].connectiondata['timeLoad'] = ingest['time_ms']/1000.0
+				bLoaded = True
+		if bLoaded:
+			with open(self.path+'/connections.config','w') as outp:
+				pprint.pprint(self.connections, outp)
 	def runBenchmarks(self):
 		"""
 		Runs benchmarks or possibly reruns specific benchmarks.
@@ -1242,28 +2511,52 @@ class benchmarker():
 		"""
 		# clean evaluation dict
 		evaluator.evaluator.evaluation = {}
-		if self.working == 'query':
-			self.runBenchmarksQuery()
+		if self.working == 'parallel':
+			# isolated processes per connection, each with its own pool
+			self.runBenchmarksParallel()
 		else:
-			self.runBenchmarksConnection()
+			# workers are started once and reused for all queries and connections
+			self.startPool()
+			try:
+				self.runIngestAll()
+				if self.working == 'query' and self.getStreamsConfig() is None and self.getMixConfig() is None:
+					self.runBenchmarksQuery()
+				else:
+					self.runBenchmarksConnection()
+			finally:
+				self.stopPool()
 		if self.bBatch:
 			# generate reports at the end only
 			self.generateReportsAll()
-	def readResultfolder(self):
+	def readResultfolder(self, lazy=False, cacheSize=32):
 		"""
 		Reads data of previous benchmark from folder.
+		If lazy, times, statistics, histograms and timeseries of a query are read at first access and kept in a bounded cache.
+		This is for inspecting a result folder only: changes of lazily read data may be forgotten.
 
+		:param lazy: Read data of queries at first access
+		:param cacheSize: Number of queries kept in cache, if lazy
 		:return: returns nothing
 		"""
 		self.clearBenchmarks()
 		# read from stored results
 		logging.debug("Read from "+self.path)
 		self.reporterStore.readProtocol()
+		if lazy:
+			derive = {'run': lambda numQuery: self.computeQueryTimer(numQuery, self.timerRun), 'session': lambda numQuery: self.computeQueryTimer(numQuery, self.timerSession)}
+			self.queryCache = tools.queryCache(self.loadQuery, derive, cacheSize)
+			for t in self.timers:
+				t.times = tools.lazyQueryList(self.queryCache, len(self.queries), t.name, 'times')
+				t.stats = tools.lazyQueryList(self.queryCache, len(self.queries), t.name, 'stats')
+				t.histograms = tools.lazyQueryDict(self.queryCache, len(self.queries), t.name, 'histograms')
+			self.timeseries = tools.lazyQueryDict(self.queryCache, len(self.queries), 'timeseries')
+			return
 		for numQuery,q in enumerate(self.queries):
 			query = tools.query(q)
-			loaded = self.reporterStore.load(query, numQuery+1, [self.timerExecution, self.timerTransfer, self.timerConnect])
+			loaded = self.reporterStore.load(query, numQuery+1, [self.timerExecution, self.timerTransfer, self.timerConnect, self.timerPrepare])
 			if not loaded:
 				break
+			self.reporterStore.loadTimeseries(numQuery+1)
 		# show finished benchmarks
 		for numQuery,q in enumerate(self.timerExecution.times):
 			logging.debug("Q"+str(numQuery+1))
@@ -1272,6 +2565,35 @@ class benchmarker():
 			for c, v in q.items():
 				logging.debug("C"+str(numConnection)+" "+c+"="+str(len(v))+" runs")
 				numConnection = numConnection + 1
+	def loadQuery(self, numQuery):
+		"""
+		Reads times, statistics and histograms of the measured timers and the timestamps of runs of a query from folder.
+		This is the entry of the query in the cache of a lazily read result folder.
+
+		:param numQuery: Number of query
+		:return: Dict of names of timers (and timeseries)
+		"""
+		query = tools.query(self.queries[numQuery-1])
+		timers = [tools.timer(t.name) for t in [self.timerExecution, self.timerTransfer, self.timerConnect, self.timerPrepare]]
+		self.reporterStore.load(query, numQuery, timers)
+		entry = {t.name: {'times': t.times[0], 'stats': t.stats[0], 'histograms': t.histograms.get(1, {})} for t in timers}
+		timeseries = self.reporterStore.readTimeseries(numQuery)
+		entry['timeseries'] = timeseries if timeseries is not None else {}
+		return entry
+	def computeQueryTimer(self, numQuery, timer):
+		"""
+		Computes times and statistics of timer run or session of a query.
+		This is a derived part of the entry of the query in the cache of a lazily read result folder.
+
+		:param numQuery: Number of query
+		:param timer: Timer run or session
+		:return: Dict of times, statistics and histograms
+		"""
+		t = tools.timer(timer.name)
+		t.perRun = timer.perRun
+		times = self.getTimesRun(numQuery) if timer.name == 'run' else self.getTimesSession(numQuery)
+		t.appendTimes(times, tools.query(self.queries[numQuery-1]))
+		return {'times': t.times[0], 'stats': t.stats[0], 'histograms': {}}
 	def readBenchmarks(self):
 		"""
 		Reads data of previous benchmark from folder.
@@ -1282,73 +2604,90 @@ class benchmarker():
 		self.readResultfolder()
 		# generate reports
 		self.generateReportsAll()
+	def getTimesSum(self, numQuery, connection):
+		"""
+		Returns sum of times of all measured timers per run of a query and connection.
+
+		:param numQuery: Number of query
+		:param connection: Name of connection
+		:return: List of times per run
+		"""
+		q = numQuery-1
+		l = self.timerExecution.times[q][connection]
+		if connection in self.timerTransfer.times[q]:
+			l = list(map(add, l, self.timerTransfer.times[q][connection]))
+		if connection in self.timerConnect.times[q]:
+			l = list(map(add, l, self.timerConnect.times[q][connection]))
+		if connection in self.timerPrepare.times[q]:
+			l = list(map(add, l, self.timerPrepare.times[q][connection]))
+		return l
+	def getTimesRun(self, numQuery):
+		"""
+		Returns total time per run of a query.
+
+		:param numQuery: Number of query
+		:return: Dict (connections) of lists (runs)
+		"""
+		times = {}
+		for c in self.timerExecution.times[numQuery-1].keys():
+			l = self.getTimesSum(numQuery, c)
+			# open loop: latency includes waiting time since arrival
+			queue = self.getQueueTimes(numQuery, c)
+			if queue is not None and len(queue) == len(l):
+				l = list(map(add, l, queue))
+			times[c] = l
+		return times
+	def getTimesSession(self, numQuery):
+		"""
+		Returns total time per session (runs of a client connection) of a query.
+
+		:param numQuery: Number of query
+		:return: Dict (connections) of lists (sessions)
+		"""
+		times = {}
+		for c in self.timerExecution.times[numQuery-1].keys():
+			l = self.getTimesSum(numQuery, c)
+			connectionmanagement = self.getConnectionManager(numQuery, c)
+			batchsize = connectionmanagement['runsPerConnection']#self.runsPerConnection
+			numBatches = math.ceil(len(l)/batchsize)
+			# aggregation changes number of results (warmup!)
+			times[c] = [sum(l[i*batchsize:(i+1)*batchsize]) for i in range(numBatches)]
+		return times
 	def computeTimerRun(self):
 		"""
 		Adds a timer for total time per run.
 
 		:return: returns nothing
 		"""
+		if self.queryCache is not None:
+			# lazily read result folder: computed at first access
+			self.timers = [self.timerSession, self.timerRun, self.timerExecution, self.timerTransfer, self.timerConnect, self.timerPrepare]
+			return
 		self.timerRun = tools.timer("run")
 		self.timerRun.stackable = False
 		for q,t in enumerate(self.timerExecution.times):
-			#print("Q"+str(q+1))
 			query = tools.query(self.queries[q])
-			#print(query.timer['sum']['active'])
-			self.timerRun.times.append({})
-			self.timerRun.stats.append({})
-			for c,times in t.items():
-				#print(self.timerExecution.times[q][c])
-				#print(self.timerTransfer.times[q][c])
-				#print(self.timerConnect.times[q][c])
-				l = self.timerExecution.times[q][c]
-				if c in self.timerTransfer.times[q]:
-					l = list(map(add, l, self.timerTransfer.times[q][c]))
-				if c in self.timerConnect.times[q]:
-					l = list(map(add, l, self.timerConnect.times[q][c]))
-				#l = list(map(add, list(map(add, self.timerExecution.times[q][c], self.timerTransfer.times[q][c])), self.timerConnect.times[q][c]))
-				#print(l)
-				self.timerRun.times[q][c] = l
-				self.timerRun.stats[q][c] = self.timerRun.getStats(l[query.numRunBegin:query.numRunEnd])
+			self.timerRun.appendTimes(self.getTimesRun(q+1), query)
 		#self.timers = [self.timerRun] + self.timers#, self.timerExecution, self.timerTransfer, self.timerConnect]
-		self.timers = [self.timerSession, self.timerRun, self.timerExecution, self.timerTransfer, self.timerConnect]
+		self.timers = [self.timerSession, self.timerRun, self.timerExecution, self.timerTransfer, self.timerConnect, self.timerPrepare]
 	def computeTimerSession(self):
 		"""
-		Adds a timer for total time per run.
+		Adds a timer for total time per session.
 
 		:return: returns nothing
 		"""
+		if self.queryCache is not None:
+			# lazily read result folder: computed at first access
+			self.timers = [self.timerSession, self.timerRun, self.timerExecution, self.timerTransfer, self.timerConnect, self.timerPrepare]
+			return
 		self.timerSession = tools.timer("session")
 		self.timerSession.stackable = False
 		self.timerSession.perRun = False
 		for q,t in enumerate(self.timerExecution.times):
-			#print("Q"+str(q+1))
 			query = tools.query(self.queries[q])
-			self.timerSession.times.append({})
-			self.timerSession.stats.append({})
-			#if query.warmup > 0:
-			#	continue
-			for c,times in t.items():
-				#print(self.timerExecution.times[q][c])
-				#print(self.timerTransfer.times[q][c])
-				#print(self.timerConnect.times[q][c])
-				l = self.timerExecution.times[q][c]
-				if c in self.timerTransfer.times[q]:
-					l = list(map(add, l, self.timerTransfer.times[q][c]))
-				if c in self.timerConnect.times[q]:
-					l = list(map(add, l, self.timerConnect.times[q][c]))
-				#print(l)
-				connectionmanagement = self.getConnectionManager(q+1, c)
-				batchsize = connectionmanagement['runsPerConnection']#self.runsPerConnection
-				numBatches = math.ceil(query.numRun/batchsize)
-				#print(l)
-				#print(batchsize)
-				#print(numBatches)
-				# aggregation changes number of results (warmup!)
-				l_agg = [sum(l[i*batchsize:(i+1)*batchsize]) for i in range(numBatches)]
-				self.timerSession.times[q][c] = l_agg
-				self.timerSession.stats[q][c] = self.timerSession.getStats(l_agg)
+			self.timerSession.appendTimes(self.getTimesSession(q+1), query)
 		#self.timers = [self.timerSession] + self.timers#, self.timerExecution, self.timerTransfer, self.timerConnect]
-		self.timers = [self.timerSession, self.timerRun, self.timerExecution, self.timerTransfer, self.timerConnect]
+		self.timers = [self.timerSession, self.timerRun, self.timerExecution, self.timerTransfer, self.timerConnect, self.timerPrepare]
 	def generateReportsAll(self):
 		"""
 		Generates all reports.
@@ -1382,11 +2721,16 @@ class benchmarker():
 			print("No result found")
 	def getResultSetDF(self, query, connection):
 		filename=self.path+"/query_"+str(query)+"_resultset_"+connection+".pickle"
+		digest = self.protocol['query'].get(str(query), {}).get('resultDigests', {}).get(connection, None)
 		if os.path.isfile(filename):
 			f = open(filename, "rb")
 			result = pickle.load(f)
 			f.close()
 			return result
+		elif digest is not None:
+			# result set is in result store
+			data = tools.readResultBlob(self.path, digest)
+			return pd.DataFrame(data[1:], columns=data[0])
 		else:
 			print("No result found")
 	def getBenchmarks(self, query):
@@ -1397,9 +2741,26 @@ class benchmarker():
 		return result
 	def getBenchmarksCSV(self, query, timer="execution"):
 		filename=self.path+"/query_"+str(query)+"_"+timer+".csv"
+		if not os.path.isfile(filename):
+			# measurements are stored in NumPy container only
+			return self.getMeasurementsDF(query, timer)
 		df = pd.read_csv(filename)
 		df_t = df.transpose()
 		return df_t
+	def getMeasurementsDF(self, numQuery, timer="execution", connection=None):
+		"""
+		Returns measured times of a query and timer as a DataFrame (rows=connections, columns=runs).
+		Times are read from the result folder, only the arrays of the given timer and connection are loaded.
+
+		:param numQuery: Number of query
+		:param timer: Name of timer
+		:param connection: Name of connection, None means all connections
+		:return: DataFrame of times in ms
+		"""
+		filename = self.path+"/query_"+str(numQuery)+"_measurements.npz"
+		measurements = tools.loadMeasurements(filename, timers=[timer], connections=None if connection is None else [connection])
+		times = measurements.get(timer, {})
+		return pd.DataFrame({c: pd.Series(l, dtype='float64') for c,l in times.items()}).transpose()
 	def getStatistics(self, query):
 		filename=self.path+"/query_"+str(query)+"_execution_statistics.pickle"
 		f = open(filename, "rb")
@@ -1476,7 +2837,15 @@ class benchmarker():
 			df = pd.DataFrame()
 		return df
 	def readResultSet(self, query, connection, numRun=0):
-		df = pd.DataFrame(self.protocol['query'][str(query)]['resultSets'][connection][numRun])
+		protocol = self.protocol['query'][str(query)]
+		resultsets = protocol['resultSets'][connection]
+		if len(resultsets) == 0 and len(protocol['errors'].get(connection, '')) == 0:
+			# connection has received the data storage, so its result sets have been dropped after comparison
+			resultsets = protocol['dataStorage']
+		if resultsets[numRun] is None:
+			# run has been cancelled
+			return pd.DataFrame()
+		df = pd.DataFrame(resultsets[numRun])
 		# set column names
 		df.columns = df.iloc[0]
 		# remove first row
@@ -1547,11 +2916,189 @@ class benchmarker():
 		result = pickle.load(f)
 		f.close()
 		return result
+	def getResultSetDiff(self, numQuery, connection1, connection2, numRun=0, limit=100):
+		"""
+		Computes a row-level diff of the result sets of a query at two connections.
+		The query is run again at both connections and rows are compared as multisets, i.e. ignoring order.
+		If the pool of workers is running, the query is run by a worker.
+		This is slow and meant for the case of differing (multiset) hash values, as recorded in the protocol (entry 'mismatches').
+		It is never called during benchmarks, so it does not add load to the DBMS.
+
+		:param numQuery: Number of query
+		:param connection1: Name of first connection
+		:param connection2: Name of second connection
+		:param numRun: Number of benchmark run, this selects the parameters of a parametrized query
+		:param limit: Maximum number of differing rows per connection
+		:return: Dict containing column names and differing rows per connection, last column is the number of occurrences
+		"""
+		queryConfig = copy.deepcopy(self.queries[numQuery-1])
+		if not 'timer' in queryConfig:
+			queryConfig['timer'] = {}
+		queryConfig['timer']['datatransfer'] = tools.joinDicts(queryConfig['timer'].get('datatransfer', {}), {'active': True, 'compare': 'result', 'sorted': False, 'store': False, 'sample': 0})
+		queryConfig['timer']['connection'] = {'active': False}
+		queryConfig['delay'] = 0
+		rows = {}
+		columnnames = []
+		for c in [connection1, connection2]:
+			queryString = self.getQueryString(numQuery, c, numRun)
+			input = singleRunInput(numRun=0, queryString=queryString, queryConfig=queryConfig)
+			args = {'connectiondata': self.dbms[c].connectiondata,
+				'inputConfig': [input],
+				'numRuns': [0],
+				'connectionname': c,
+				'numQuery': numQuery,
+				'path': None,
+				'BENCHMARKER_VERBOSE_QUERIES': BENCHMARKER_VERBOSE_QUERIES}
+			if self.pool is not None:
+				# run in a worker, so the parent does not start a JVM during the experiment
+				output = self.pool.apply(singleRun, kwds=args)[0]
+			else:
+				output = singleRun(**args)[0]
+			if len(output.error) > 0:
+				raise ValueError(output.error)
+			columnnames = output.data[0]
+			rows[c] = Counter([tuple(row) for row in output.data[1:]])
+		diff = {'columns': columnnames + ['count']}
+		diff[connection1] = [list(row)+[count] for row, count in (rows[connection1] - rows[connection2]).items()][:limit]
+		diff[connection2] = [list(row)+[count] for row, count in (rows[connection2] - rows[connection1]).items()][:limit]
+		return diff
 	def getParameterDF(self, numQuery):
 		listParameter = self.protocol['query'][str(numQuery)]['parameter']
 		dataframeParameter = pd.DataFrame.from_records(listParameter)
 		dataframeParameter.index=range(1,len(listParameter)+1)
 		return dataframeParameter
+	def getQueueTimes(self, numQuery, connection):
+		"""
+		Returns waiting times (in ms) of runs between arrival and start in open loop mode.
+
+		:param numQuery: Number of query
+		:param connection: Name of connection
+		:return: List of waiting times per run, None if runs have not been scheduled by arrival rate
+		"""
+		runs = self.timeseries.get(numQuery, {}).get(connection, [])
+		queue = [run.get('queue', None) for run in runs]
+		if len(queue) == 0 or any(t is None or t != t for t in queue):
+			return None
+		return queue
+	def getLatencyPercentiles(self, numQuery, connection):
+		"""
+		Returns percentiles of latency of measured runs (timer run), uncorrected and corrected for coordinated omission.
+		In open loop the intended start of each run is known, so the corrected latency includes the waiting time since arrival and the uncorrected one does not.
+		In closed loop runs are expected to start every expectedInterval ms (query setting, number or 'median' of run latencies).
+		Runs that have been missed while waiting for a slow run are back-filled.
+		Corrected percentiles are None if there is no such schedule.
+
+		:param numQuery: Number of query
+		:param connection: Name of connection
+		:return: Dict of uncorrected and corrected percentiles, expected interval and number of back-filled samples
+		"""
+		query = tools.query(self.queries[numQuery-1])
+		times = self.timerRun.times[numQuery-1][connection]
+		queue = self.getQueueTimes(numQuery, connection)
+		if queue is None or len(queue) != len(times):
+			queue = None
+		else:
+			# timer run already contains waiting time since intended start
+			queue = [y for x, y in zip(times[query.numRunBegin:query.numRunEnd], queue[query.numRunBegin:query.numRunEnd]) if x > 0]
+		l = [x for x in times[query.numRunBegin:query.numRunEnd] if x > 0]
+		expectedInterval = None
+		numMissing = 0
+		if queue is not None:
+			uncorrected = tools.histogram.fromValues([max(x-y, 0.0) for x, y in zip(l, queue)])
+			corrected = tools.histogram.fromValues(l)
+		elif query.expectedInterval is not None and len(l) > 0:
+			uncorrected = tools.histogram.fromValues(l)
+			if query.expectedInterval == 'median':
+				expectedInterval = float(statistics.median(l))
+			else:
+				expectedInterval = float(query.expectedInterval)
+			corrected = tools.histogram()
+			for x in l:
+				numMissing += corrected.addWithExpectedInterval(x, expectedInterval)
+		else:
+			uncorrected = tools.histogram.fromValues(l)
+			corrected = None
+		result = {}
+		result['uncorrected'] = {'p'+str(p): uncorrected.getPercentile(p) for p in tools.timer.percentiles}
+		result['corrected'] = {'p'+str(p): corrected.getPercentile(p) for p in tools.timer.percentiles} if corrected is not None else None
+		result['expectedInterval_ms'] = expectedInterval
+		result['numBackfilled'] = numMissing
+		return result
+	def getTimeseriesDF(self, numQuery, connection=None):
+		"""
+		Returns timestamps of all runs of a query as a DataFrame (rows=runs).
+		start and end are wall clock (seconds since epoch), startMonotonic and endMonotonic are monotonic clock (seconds) of the host.
+		worker is the process id of the client process, client is the number of the (client) connection.
+		In stream mode stream is the number of the stream and position is the position of the query in the permutation of the stream.
+		timeout tells if the run has exceeded the statement timeout, cancelled if it has been aborted because of that.
+		In open loop mode intended is the wall clock time of arrival of the run and queue is the waiting time in ms until it actually started.
+
+		:param numQuery: Number of query
+		:param connection: Name of connection, None means all connections
+		:return: DataFrame of timestamps
+		"""
+		columns = ['connection', 'numRun', 'client', 'stream', 'position', 'timeout', 'cancelled', 'worker', 'intended', 'queue', 'start', 'end', 'startMonotonic', 'endMonotonic']
+		rows = []
+		for c, runs in self.timeseries.get(numQuery, {}).items():
+			if connection is None or c == connection:
+				rows.extend([tools.joinDicts(run, {'connection': c}) for run in runs])
+		return pd.DataFrame.from_records(rows, columns=columns)
+	def getIngestDF(self):
+		"""
+		Returns results of the ingest phase as a DataFrame (rows=connections).
+
+		:return: DataFrame of rows, bytes, time and throughput of loading per connection
+		"""
+		columns = ['numProcesses', 'batchSize', 'method', 'rows', 'bytes', 'time_ms', 'rows_per_s', 'mb_per_s', 'error']
+		ingest = self.protocol.get('ingest', {})
+		return pd.DataFrame.from_dict(ingest, orient='index', columns=columns) if len(ingest) > 0 else pd.DataFrame(columns=columns)
+	def getMixDF(self, connection=None):
+		"""
+		Returns results of the query mix as a DataFrame (rows=connections and queries).
+		Latencies of the queries are found in the timers as usual.
+
+		:param connection: Name of connection, None for all connections
+		:return: DataFrame of weight, number of runs, errors and throughput per connection and query
+		"""
+		columns = ['connection', 'query', 'weight', 'numRun', 'errors', 'throughput_per_s']
+		rows = []
+		for c, mix in sorted(self.protocol.get('mix', {}).items()):
+			if connection is not None and connection != c:
+				continue
+			for numQuery, q in sorted(mix['queries'].items(), key=lambda x: int(x[0])):
+				rows.append({'connection': c, 'query': int(numQuery), **q})
+		return pd.DataFrame(rows, columns=columns)
+	def getStreamsDF(self, connection=None):
+		"""
+		Returns results of the throughput test as a DataFrame (rows=streams).
+		Elapsed time is given in ms, start and end are wall clock (seconds since epoch).
+
+		:param connection: Name of connection, None for all connections
+		:return: DataFrame of elapsed time and permutation per connection and stream
+		"""
+		columns = ['connection', 'stream', 'permutation', 'elapsed_ms', 'start', 'end']
+		rows = []
+		for c, streams in sorted(self.protocol.get('streams', {}).items()):
+			if connection is not None and connection != c:
+				continue
+			for stream in sorted(streams['streams'], key=lambda s: s['stream']):
+				rows.append({'connection': c, **stream})
+		return pd.DataFrame(rows, columns=columns)
+	def getSweepDF(self, numQuery, connection=None):
+		"""
+		Returns scalability table of a query as a DataFrame (rows=levels of sweep of parallel clients).
+		knee marks the level where throughput stops improving.
+
+		:param numQuery: Number of query
+		:param connection: Name of connection, None means all connections
+		:return: DataFrame of throughput and latency per number of parallel clients
+		"""
+		columns = ['connection', 'numProcesses', 'runs', 'totaltime_ms', 'throughput_run_total_ps', 'latency_run_mean_ms', 'knee']
+		rows = []
+		for c, levels in self.protocol['query'][str(numQuery)].get('sweep', {}).items():
+			if connection is None or c == connection:
+				rows.extend([tools.joinDicts(level, {'connection': c}) for level in levels])
+		return pd.DataFrame.from_records(rows, columns=columns)
 
 
 
@@ -1560,10 +3107,10 @@ class inspector(benchmarker):
 	"""
 	Class for inspecting done benchmarks
 	"""
-	def __init__(self, result_path, code, anonymize=False):
+	def __init__(self, result_path, code, anonymize=False, lazy=False, cacheSize=32):
 		benchmarker.__init__(self,result_path=result_path+"/"+str(code), anonymize=anonymize)
 		self.getConfig()
-		self.readResultfolder()
+		self.readResultfolder(lazy, cacheSize)
 		print("Connections:")
 		for c in self.connections:
 			print(c['name'])
@@ -0,0 +1,417 @@
+"""
+    Classes for distributing benchmarks to agents for the Python Package DBMS Benchmarker
+    Copyright (C) 2020  Patrick Erdelt
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as
+    published by the Free Software Foundation, either version 3 of the
+    License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Affero General Public License for more details.
+
+    You should have received a copy of the GNU Affero General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import logging
+import os
+from os import makedirs, path
+import time
+import socket
+from multiprocessing.connection import Listener, Client, wait
+from dbmsbenchmarker import benchmarker, tools, reporter
+
+
+# agents start benchmarking this many seconds after the last one has arrived at the barrier
+BARRIER_DELAY = 0.5
+
+
+
+class coordinator():
+	"""
+	Class for coordinating benchmarks distributed to agents.
+	Agents connect via TCP and receive the config and units of work, i.e. connections or pairs of connection and query.
+	They send back the measurements of each query, which are merged into the result folder of the coordinator as soon as they arrive.
+	"""
+	def __init__(self, experiment, address=('localhost', 6000), authkey=b'dbmsbenchmarker', numAgents=1, split='connection', barrier=False):
+		"""
+		Construct a new 'coordinator' object.
+
+		:param experiment: Object of benchmarker containing the config, its result folder receives the merged results
+		:param address: Pair of host and port to listen at
+		:param authkey: Shared secret of coordinator and agents
+		:param numAgents: Number of agents to wait for before units are distributed
+		:param split: A unit is a connection ('connection') or a pair of connection and query ('query')
+		:param barrier: Distribute units in rounds of one unit per agent, all agents of a round start benchmarking at the same instant
+		:return: returns nothing
+		"""
+		self.experiment = experiment
+		self.address = address
+		self.authkey = authkey
+		self.numAgents = numAgents
+		self.split = split
+		self.barrier = barrier
+		# connection to agent: name of agent
+		self.agents = {}
+		# connection to agent: current unit
+		self.busy = {}
+	def getUnits(self):
+		"""
+		Returns all units of work.
+		Fixed query and fixed connection of the experiment are respected.
+
+		:return: List of dicts of connection and query (None means all queries)
+		"""
+		units = []
+		for c in sorted(self.experiment.dbms.keys()):
+			if not self.experiment.dbms[c].connectiondata['active'] or (self.experiment.fixedConnection is not None and self.experiment.fixedConnection != c):
+				continue
+			if self.split == 'query':
+				for numQuery in range(1, len(self.experiment.queries)+1):
+					if not tools.query(self.experiment.queries[numQuery-1]).active or (self.experiment.fixedQuery is not None and self.experiment.fixedQuery != numQuery):
+						continue
+					units.append({'connection': c, 'query': numQuery})
+			else:
+				units.append({'connection': c, 'query': self.experiment.fixedQuery})
+		return units
+	def getConfig(self):
+		"""
+		Returns the config sent to each agent.
+		This contains the content of the config files of the result folder and some global settings.
+
+		:return: Dict of config
+		"""
+		with open(self.experiment.path+'/connections.config', 'r') as f:
+			connections = f.read()
+		with open(self.experiment.path+'/queries.config', 'r') as f:
+			queries = f.read()
+		return {
+			'type': 'config',
+			'code': self.experiment.code,
+			'connections': connections,
+			'queries': queries,
+			'settings': {
+				'numProcesses': self.experiment.connectionmanagement['numProcesses'],
+				'anonymize': self.experiment.anonymize,
+				'unanonymize': self.experiment.unanonymize,
+				'template': tools.query.template,
+				'barrier': self.barrier,
+				'seed': self.experiment.seed,
+				# parameters are generated once, so all agents send the same parameters to their connections
+				'parameters': {str(numQuery): self.experiment.generateParameters(numQuery) for numQuery in range(1, len(self.experiment.queries)+1) if self.experiment.fixedQuery is None or self.experiment.fixedQuery == numQuery},
+			},
+		}
+	def compareResultSets(self, numQuery, reference, partial):
+		"""
+		Compares result sets of connections benchmarked by an agent to the reference of the query, i.e. the result sets received first.
+		Differing connections get a warning and keep their result sets in the protocol, like merge_partial_results() does.
+
+		:param numQuery: Number of query
+		:param reference: Protocol of the query containing the reference (dataStorage and dataStorageConnection), None if there is none yet
+		:param partial: Protocol of the query received from the agent
+		:return: True if reference has been kept
+		"""
+		if reference is None or len(reference.get('dataStorage', [])) == 0:
+			return False
+		protocol = self.experiment.protocol['query'][str(numQuery)]
+		dataStorage = reference['dataStorage']
+		for c in partial.get('resultSets', {}).keys():
+			if c == reference.get('dataStorageConnection') or len(partial.get('errors', {}).get(c, '')) > 0:
+				continue
+			# result sets of connection c have been dropped by the agent, if they are equal to its data storage
+			resultsets = partial['resultSets'][c] if len(partial['resultSets'][c]) > 0 else partial.get('dataStorage', [])
+			bDifferent = False
+			for i in range(min(len(dataStorage), len(resultsets))):
+				if resultsets[i] is None:
+					continue
+				if dataStorage[i] is None:
+					# run has been cancelled at the connection of the reference
+					dataStorage[i] = resultsets[i]
+					continue
+				if not tools.isEqualResultSet(dataStorage, i, resultsets[i]):
+					bDifferent = True
+					break
+			if bDifferent:
+				print("Agent result of {} differs from {} at run {}".format(c, reference.get('dataStorageConnection'), i))
+				protocol['warnings'][c] = 'Different'
+				protocol['resultSets'][c] = resultsets
+			elif len(partial['resultSets'][c]) == 0:
+				protocol['resultSets'][c] = []
+		protocol['dataStorage'] = dataStorage
+		protocol['dataStorageConnection'] = reference.get('dataStorageConnection')
+		return True
+	def storeResult(self, message):
+		"""
+		Merges measurements of a query received from an agent and stores the query at once.
+		Result sets are compared to those of the connection received first.
+
+		:param message: Dict of number of query, times and histograms per timer and connection, timeseries per connection, protocol of the query and result sets of the result store
+		:return: returns nothing
+		"""
+		e = self.experiment
+		numQuery = message['numQuery']
+		query = tools.query(e.queries[numQuery-1])
+		timers = [e.timerExecution, e.timerTransfer, e.timerConnect, e.timerPrepare]
+		for t in timers:
+			while len(t.times) < numQuery:
+				t.times.append({})
+				t.stats.append({})
+			for c, times in message['times'].get(t.name, {}).items():
+				hist = tools.histogram.fromDict(message['histograms'][t.name][c]) if c in message['histograms'].get(t.name, {}) else None
+				t.times[numQuery-1][c] = times
+				t.setHistogram(numQuery, c, hist)
+				t.stats[numQuery-1][c] = t.getStats(times[query.numRunBegin:query.numRunEnd], hist)
+		if not numQuery in e.timeseries:
+			e.timeseries[numQuery] = {}
+		e.timeseries[numQuery].update(message['timeseries'])
+		reference = e.protocol['query'].get(str(numQuery), {}).copy()
+		if not 'dataStorageConnection' in reference:
+			reference = None
+		e.protocol = tools.joinProtocols(e.protocol, message['protocol'])
+		for data in message.get('resultsets', {}).values():
+			tools.writeResultBlob(e.path, data)
+		self.compareResultSets(numQuery, reference, message['protocol']['query'].get(str(numQuery), {}))
+		e.reporterStore.generate(numQuery, timers)
+	def dispatch(self, pending):
+		"""
+		Sends units to idle agents.
+		With barrier, a new round starts only if all agents are idle.
+
+		:param pending: List of units not yet sent, is changed
+		:return: Number of units sent
+		"""
+		idle = [conn for conn in self.agents if not conn in self.busy]
+		if self.barrier and len(self.busy) > 0:
+			return 0
+		numSent = 0
+		for conn in idle:
+			if len(pending) == 0:
+				break
+			unit = pending.pop(0)
+			self.busy[conn] = unit
+			conn.send({'type': 'unit', 'unit': unit})
+			print("Agent {}: {}".format(self.agents[conn], unit))
+			numSent += 1
+		self.arrived = []
+		self.numRound = numSent
+		return numSent
+	def releaseBarrier(self):
+		"""
+		Lets all agents waiting at the barrier start, if all agents of the round have arrived.
+
+		:return: returns nothing
+		"""
+		if len(self.arrived) > 0 and len(self.arrived) >= self.numRound:
+			# common instant in the near future, so agents start together despite network latency
+			start = time.time() + BARRIER_DELAY
+			for conn in self.arrived:
+				conn.send({'type': 'go', 'start': start})
+			print("Barrier released for {} agents".format(len(self.arrived)))
+			self.arrived = []
+	def run(self):
+		"""
+		Waits for agents, distributes units and merges measurements until all units are done.
+		The unit of a lost agent is sent to another agent.
+		If all agents are lost, the units not done are stored in the protocol (missingUnits).
+
+		:return: List of units not done
+		"""
+		pending = self.getUnits()
+		numUnits = len(pending)
+		listener = Listener(self.address, authkey=self.authkey)
+		print("Coordinator listens at {}:{}, waiting for {} agents".format(self.address[0], self.address[1], self.numAgents))
+		try:
+			while len(self.agents) < self.numAgents:
+				conn = listener.accept()
+				message = conn.recv()
+				self.agents[conn] = message['agent']
+				print("Agent {} has connected".format(message['agent']))
+			config = self.getConfig()
+			for conn in self.agents:
+				conn.send(config)
+			self.arrived = []
+			self.numRound = 0
+			numDone = 0
+			self.dispatch(pending)
+			while len(self.busy) > 0 or (len(pending) > 0 and len(self.agents) > 0):
+				if len(self.busy) == 0:
+					# units of lost agents are left
+					self.dispatch(pending)
+					continue
+				for conn in wait(list(self.busy.keys())):
+					try:
+						message = conn.recv()
+					except (EOFError, OSError) as e:
+						logging.exception('Caught an error: %s' % str(e))
+						print("Agent {} is lost, unit {} is pending again".format(self.agents[conn], self.busy[conn]))
+						pending.insert(0, self.busy.pop(conn))
+						self.agents.pop(conn)
+						if conn in self.arrived:
+							self.arrived.remove(conn)
+						self.numRound -= 1
+						self.releaseBarrier()
+						continue
+					if message['type'] == 'result':
+						print("Agent {}: Q{} has been received".format(self.agents[conn], message['numQuery']))
+						self.storeResult(message)
+					elif message['type'] == 'barrier':
+						self.arrived.append(conn)
+						self.releaseBarrier()
+					elif message['type'] == 'done':
+						numDone += 1
+						print("Agent {}: {} done ({}/{})".format(self.agents[conn], self.busy.pop(conn), numDone, numUnits))
+				self.dispatch(pending)
+		finally:
+			for conn in self.agents:
+				try:
+					conn.send({'type': 'stop'})
+					conn.close()
+				except Exception as e:
+					logging.exception('Caught an error: %s' % str(e))
+			listener.close()
+		if len(pending) > 0:
+			logging.error("All agents are lost, {} units are not done: {}".format(len(pending), pending))
+			self.experiment.protocol['missingUnits'] = pending
+			self.experiment.reporterStore.writeProtocol()
+		self.experiment.setTimeLoadFromIngest()
+		return pending
+
+
+
+class agent():
+	"""
+	Class for an agent running benchmarks on behalf of a coordinator.
+	Each unit is benchmarked connectionwise by its own benchmarker object in a subfolder of the local result folder.
+	Measurements are sent to the coordinator after each query.
+	"""
+	def __init__(self, result_path, address=('localhost', 6000), authkey=b'dbmsbenchmarker', name=None, batch=True, timeout=60):
+		"""
+		Construct a new 'agent' object.
+
+		:param result_path: Local folder for storing results
+		:param address: Pair of host and port of the coordinator
+		:param authkey: Shared secret of coordinator and agents
+		:param name: Name of the agent, default is host and process id
+		:param batch: Batch mode (more protocol-like output)
+		:param timeout: Number of seconds to retry connecting to the coordinator
+		:return: returns nothing
+		"""
+		self.result_path = result_path
+		self.address = address
+		self.authkey = authkey
+		self.name = name if name is not None else "{}-{}".format(socket.gethostname(), os.getpid())
+		self.batch = batch
+		self.timeout = timeout
+		self.connection = None
+	def send(self, message):
+		"""
+		Sends a message to the coordinator.
+
+		:param message: Dict containing type of message
+		:return: returns nothing
+		"""
+		self.connection.send(message)
+	def connect(self):
+		"""
+		Connects to the coordinator.
+		The coordinator may start later, so this is retried until timeout.
+
+		:return: returns nothing
+		"""
+		start = time.time()
+		while True:
+			try:
+				self.connection = Client(self.address, authkey=self.authkey)
+				break
+			except ConnectionRefusedError:
+				if time.time() - start > self.timeout:
+					raise
+				time.sleep(1)
+		self.send({'type': 'hello', 'agent': self.name})
+	def waitAtBarrier(self):
+		"""
+		Waits until all agents of the round have arrived at the barrier and then until the common start instant.
+
+		:return: returns nothing
+		"""
+		self.send({'type': 'barrier'})
+		message = self.connection.recv()
+		wait = message['start'] - time.time()
+		if wait > 0:
+			time.sleep(wait)
+	def runUnit(self, folder, unit, settings):
+		"""
+		Benchmarks a unit (connection, optionally a single query) and sends measurements of each query.
+		With barrier the agent waits once per unit, right before the first runs start.
+		Without a fixed query the unit contains the ingest phase of the connection, otherwise there is no ingest.
+
+		:param folder: Local result folder of the experiment, containing the config files
+		:param unit: Dict of connection and query
+		:param settings: Dict of global settings sent by the coordinator
+		:return: returns nothing
+		"""
+		c = unit['connection']
+		subfolder = c if unit['query'] is None else c+'-Q'+str(unit['query'])
+		waited = []
+		def startBarrier(numQuery, connectionname):
+			if len(waited) == 0:
+				waited.append(numQuery)
+				self.waitAtBarrier()
+		try:
+			experiment = benchmarker.benchmarker(
+				result_path=folder,
+				working='connection',
+				batch=self.batch,
+				subfolder=subfolder,
+				fixedQuery=unit['query'],
+				fixedConnection=c,
+				anonymize=settings['anonymize'],
+				unanonymize=settings['unanonymize'],
+				numProcesses=settings['numProcesses'],
+				seed=settings['seed'])
+			experiment.getConfig(connectionfile=folder+'/connections.config', queryfile=folder+'/queries.config')
+			# all agents use the parameters generated by the coordinator
+			for numQuery, parameters in settings['parameters'].items():
+				experiment.protocol['query'][numQuery].update(parameters)
+			if unit['query'] is not None:
+				# several units of the same connection must not load data
+				experiment.queryconfig.pop('ingest', None)
+				experiment.dbms[c].connectiondata.pop('ingest', None)
+			experiment.reporterSender = reporter.sender(experiment, self.send)
+			if settings['barrier']:
+				experiment.startBarrier = startBarrier
+			experiment.runBenchmarks()
+		except Exception as e:
+			logging.exception('Caught an error: %s' % str(e))
+		finally:
+			if settings['barrier'] and len(waited) == 0:
+				# nothing has been run, but the others must not wait for this agent
+				startBarrier(None, c)
+		self.send({'type': 'done', 'unit': unit})
+	def run(self):
+		"""
+		Connects to the coordinator and runs units until the coordinator stops the agent.
+
+		:return: returns nothing
+		"""
+		self.connect()
+		config = self.connection.recv()
+		tools.query.template = config['settings']['template']
+		folder = self.result_path+'/'+config['code']
+		if not path.isdir(folder):
+			makedirs(folder)
+		with open(folder+'/connections.config', 'w') as f:
+			f.write(config['connections'])
+		with open(folder+'/queries.config', 'w') as f:
+			f.write(config['queries'])
+		print("Agent {} connected, results in {}".format(self.name, folder))
+		while True:
+			message = self.connection.recv()
+			if message['type'] == 'stop':
+				break
+			if message['type'] == 'unit':
+				print("Agent {}: {}".format(self.name, message['unit']))
+				self.runUnit(folder, message['unit'], config['settings'])
+		self.connection.close()
@@ -172,6 +172,15 @@ class evaluator():
 					evaluation['dbms'][c]['times']['load_ms'] = self.benchmarker.dbms[c].connectiondata["timeLoad"]*1000.0
 				else:
 					evaluation['dbms'][c]['times']['load_ms'] = 0
+				if c in self.benchmarker.protocol.get('ingest', {}):
+					# measured by ingest phase
+					evaluation['dbms'][c]['ingest'] = self.benchmarker.protocol['ingest'][c]
+				if c in self.benchmarker.protocol.get('streams', {}):
+					# measured by throughput test: elapsed time per stream and queries per hour
+					evaluation['dbms'][c]['streams'] = self.benchmarker.protocol['streams'][c]
+				if c in self.benchmarker.protocol.get('mix', {}):
+					# measured by query mix: throughput of the whole workload and per query
+					evaluation['dbms'][c]['mix'] = self.benchmarker.protocol['mix'][c]
 				if c in times:
 					evaluation['dbms'][c]['times']['benchmark_ms'] = times[c]
 					if 'priceperhourdollar' in self.benchmarker.dbms[c].connectiondata:
@@ -207,6 +216,8 @@ class evaluator():
 			else:
 				evaluation['query'][i]['is_parametrized'] = False
 			l = self.benchmarker.protocol['query'][str(i)]['dataStorage']
+			# cancelled runs have no result set
+			l = [x for x in l if x is not None]
 			if len(l) > 0 and len(l[0]) > 0 and len(l[0][0]) > 0:
 				l = [x for l1 in l for l2 in l1 for x in l2]
 				evaluation['query'][i]['storage_size_byte'] = sys.getsizeof(l)
@@ -243,16 +254,27 @@ class evaluator():
 					cm = self.benchmarker.getConnectionManager(numQuery, c)
 					evaluation['query'][i]['connectionmanagement'] = cm
 					evaluation['query'][i]['dbms'][c]['connectionmanagement'] = cm
+					# scalability: throughput and latency per number of parallel clients
+					if c in self.benchmarker.protocol['query'][str(numQuery)].get('sweep', {}):
+						evaluation['query'][i]['dbms'][c]['sweep'] = self.benchmarker.protocol['query'][str(numQuery)]['sweep'][c]
+					# runs that have exceeded the statement timeout
+					if c in self.benchmarker.protocol['query'][str(numQuery)].get('timeouts', {}):
+						evaluation['query'][i]['dbms'][c]['timeouts'] = self.benchmarker.protocol['query'][str(numQuery)]['timeouts'][c]
+					# adaptive number of runs: precision reached per round
+					if c in self.benchmarker.protocol['query'][str(numQuery)].get('adaptive', {}):
+						evaluation['query'][i]['dbms'][c]['adaptive'] = self.benchmarker.protocol['query'][str(numQuery)]['adaptive'][c]
 					if c in self.benchmarker.protocol['query'][str(numQuery)]['durations']:
 						# latency / throughput
 						evaluation['query'][i]['dbms'][c]['metrics'] = {}
 						totaltime_s = self.benchmarker.protocol['query'][str(numQuery)]['durations'][c]/1000.0
 						evaluation['query'][i]['dbms'][c]['metrics']['totaltime_ms'] = self.benchmarker.protocol['query'][str(numQuery)]['durations'][c]
+						# number of runs is not fixed in duration mode
+						numRun = len(self.benchmarker.timerExecution.times[numQuery-1][c]) if c in self.benchmarker.timerExecution.times[numQuery-1] else query.numRun
 						if totaltime_s > 0:
-							tps = query.numRun/totaltime_s
+							tps = numRun/totaltime_s
 							evaluation['query'][i]['dbms'][c]['metrics']['throughput_run_total_ps'] = tps
 							evaluation['query'][i]['dbms'][c]['metrics']['throughput_run_total_ph'] = tps*3600.0
-							tps = query.numRun/cm['runsPerConnection']/totaltime_s
+							tps = numRun/cm['runsPerConnection']/totaltime_s
 							evaluation['query'][i]['dbms'][c]['metrics']['throughput_session_total_ps'] = tps
 							evaluation['query'][i]['dbms'][c]['metrics']['throughput_session_total_ph'] = tps*3600.0
 						if c in self.benchmarker.timerRun.stats[numQuery-1]:
@@ -274,12 +296,22 @@ class evaluator():
 								evaluation['query'][i]['dbms'][c]['metrics']['throughput_session_mean_ph'] = tps*3600.0
 						else:
 							print(c+" missing in timerSession statistics for query Q"+str(numQuery))
+						# open loop: target rate and waiting time since arrival (part of latency of run)
+						queue = self.benchmarker.getQueueTimes(numQuery, c)
+						if cm['arrivalRate'] is not None and queue is not None:
+							queue = queue[query.numRunBegin:query.numRunEnd]
+							evaluation['query'][i]['dbms'][c]['metrics']['arrival_rate_ps'] = cm['arrivalRate']
+							evaluation['query'][i]['dbms'][c]['metrics']['queue_run_mean_ms'] = sum(queue)/len(queue) if len(queue) > 0 else 0.0
+							evaluation['query'][i]['dbms'][c]['metrics']['queue_run_max_ms'] = max(queue) if len(queue) > 0 else 0.0
 						if 'throughput_run_total_ps' in evaluation['query'][i]['dbms'][c]['metrics'] and 'latency_run_mean_ms' in evaluation['query'][i]['dbms'][c]['metrics']:
 							evaluation['query'][i]['dbms'][c]['metrics']['queuesize_run'] = evaluation['query'][i]['dbms'][c]['metrics']['throughput_run_total_ps'] * evaluation['query'][i]['dbms'][c]['metrics']['latency_run_mean_ms'] / 1000.0
 							evaluation['query'][i]['dbms'][c]['metrics']['queuesize_run_percent'] = evaluation['query'][i]['dbms'][c]['metrics']['queuesize_run'] / cm['numProcesses'] * 100.0
 						if 'throughput_session_total_ps' in evaluation['query'][i]['dbms'][c]['metrics'] and 'latency_session_mean_ms' in evaluation['query'][i]['dbms'][c]['metrics']:
 							evaluation['query'][i]['dbms'][c]['metrics']['queuesize_session'] = evaluation['query'][i]['dbms'][c]['metrics']['throughput_session_total_ps'] * evaluation['query'][i]['dbms'][c]['metrics']['latency_session_mean_ms'] / 1000.0
 							evaluation['query'][i]['dbms'][c]['metrics']['queuesize_session_percent'] = evaluation['query'][i]['dbms'][c]['metrics']['queuesize_session'] / cm['numProcesses'] * 100.0
+						# percentiles of latency, uncorrected and corrected for coordinated omission
+						if c in self.benchmarker.timerRun.times[numQuery-1]:
+							evaluation['query'][i]['dbms'][c]['latency'] = self.benchmarker.getLatencyPercentiles(numQuery, c)
 				evaluation['query'][i]['start'] = self.benchmarker.protocol['query'][str(numQuery)]['start']
 				evaluation['query'][i]['end'] = self.benchmarker.protocol['query'][str(numQuery)]['end']
 				evaluation['query'][i]['benchmarks'] = {}
@@ -348,15 +380,24 @@ class evaluator():
 		with open(filename, 'w') as f:
 			f.write(str(evaluation))
 			#pprint.pprint(evaluation, f)
-		filename = self.benchmarker.path+'/evaluation.json'
-		with open(filename, 'w') as f:
-			json.dump(evaluation, f)
+		# header and one file per query, so queries can be read on demand
+		for numQuery, queryEvaluation in evaluation['query'].items():
+			tools.writeJSON(self.benchmarker.path+'/evaluation_query_'+str(numQuery)+'.json', queryEvaluation)
+		header = {k: v for k,v in evaluation.items() if k != 'query'}
+		header['queryShards'] = [str(numQuery) for numQuery in evaluation['query'].keys()]
+		tools.writeJSON(self.benchmarker.path+'/evaluation.json', header)
 		return evaluation
 	def load(self):
 		print("Load Evaluation")
 		filename = self.benchmarker.path+'/evaluation.json'
 		with open(filename,'r') as f:
-			evaluator.evaluation = json.load(f)
+			evaluation = json.load(f)
+		if 'queryShards' in evaluation:
+			# evaluations of queries are read at access, bounded like the query cache of a lazy benchmarker
+			queryCache = getattr(self.benchmarker, 'queryCache', None)
+			size = queryCache.size if queryCache is not None else None
+			evaluation['query'] = tools.evaluationShards(self.benchmarker.path, evaluation.pop('queryShards'), size)
+		evaluator.evaluation = evaluation
 			#evaluator.evaluation = ast.literal_eval(inp.read())
 		#filename = self.benchmarker.path+'/evaluation.dict'
 		#with open(filename,'r') as f:
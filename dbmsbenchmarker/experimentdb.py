@@ -0,0 +1,329 @@
+"""
+    Classes for storing experiments in a single SQLite file for the Python Package DBMS Benchmarker
+    Copyright (C) 2020  Patrick Erdelt
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as
+    published by the Free Software Foundation, either version 3 of the
+    License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Affero General Public License for more details.
+
+    You should have received a copy of the GNU Affero General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import logging
+import sqlite3
+import json
+from dbmsbenchmarker import tools
+from os import path, stat
+import glob
+import pandas as pd
+
+
+# default name of the experiment database inside of a result folder
+FILENAME = 'experiment.sqlite'
+
+# columns of table runs, same as timeseries of benchmarker
+COLUMNS_RUNS = ['numRun', 'client', 'stream', 'position', 'timeout', 'cancelled', 'worker', 'intended', 'queue', 'start', 'end', 'startMonotonic', 'endMonotonic']
+
+SCHEMA = [
+	'CREATE TABLE IF NOT EXISTS documents (name TEXT PRIMARY KEY, content TEXT)',
+	'CREATE TABLE IF NOT EXISTS queries (query INTEGER PRIMARY KEY, title TEXT, active INTEGER)',
+	'CREATE TABLE IF NOT EXISTS connections (connection TEXT PRIMARY KEY, dbms TEXT, active INTEGER)',
+	'CREATE TABLE IF NOT EXISTS timers (query INTEGER, timer TEXT, connection TEXT, numRun INTEGER, value REAL)',
+	'CREATE INDEX IF NOT EXISTS idx_timers ON timers (query, timer, connection, numRun)',
+	'CREATE TABLE IF NOT EXISTS runs (query INTEGER, connection TEXT, '+', '.join('"{}"'.format(c) for c in COLUMNS_RUNS)+')',
+	'CREATE INDEX IF NOT EXISTS idx_runs ON runs (query, connection, "numRun")',
+	'CREATE TABLE IF NOT EXISTS errors (query INTEGER, connection TEXT, type TEXT, message TEXT)',
+	'CREATE INDEX IF NOT EXISTS idx_errors ON errors (query, connection)',
+	'CREATE TABLE IF NOT EXISTS resultsets (query INTEGER, connection TEXT, numRun INTEGER, digest TEXT)',
+	'CREATE INDEX IF NOT EXISTS idx_resultsets ON resultsets (query, connection, numRun)',
+	'CREATE TABLE IF NOT EXISTS metrics (query INTEGER, metric TEXT, connection TEXT, numSample INTEGER, value REAL)',
+	'CREATE INDEX IF NOT EXISTS idx_metrics ON metrics (query, metric, connection, numSample)',
+]
+TABLES = ['documents', 'queries', 'connections', 'timers', 'runs', 'errors', 'resultsets', 'metrics']
+
+
+
+def getDigest(resultset):
+	"""
+	Computes a digest of a result set as stored in the protocol (list of rows).
+
+	:param resultset: List of lists, None for a cancelled run
+	:return: Hex string of SHA-256, None for a cancelled run
+	"""
+	if resultset is None:
+		return None
+	return tools.resultDigest(resultset)
+
+
+def getFingerprint(folder):
+	"""
+	Computes a fingerprint of the measurements of a result folder.
+	This is the modification time of each protocol and query file, so continuing or merging benchmarks changes the fingerprint.
+
+	:param folder: Result folder
+	:return: Dict of names of files and modification times in ns
+	"""
+	filenames = glob.glob(path.join(glob.escape(folder), 'protocol*.json'))+glob.glob(path.join(glob.escape(folder), 'query_*'))
+	return {path.basename(filename): stat(filename).st_mtime_ns for filename in sorted(filenames)}
+
+
+class experimentdb():
+	"""
+	Class for storing an experiment in a single SQLite file.
+	There are indexed tables for measured times per timer, timestamps of runs, errors and warnings, digests of result sets and monitoring samples.
+	Documents (protocol, configs and evaluation) are stored as JSON.
+	Slices of the experiment can be read by SQL without loading the complete result folder.
+	"""
+	def __init__(self, filename):
+		"""
+		Construct a new 'experimentdb' object.
+		The file is created if it does not exist.
+
+		:param filename: Name of SQLite file
+		:return: returns nothing
+		"""
+		self.filename = filename
+		self.connection = sqlite3.connect(filename, check_same_thread=False)
+		for statement in SCHEMA:
+			self.connection.execute(statement)
+		self.connection.commit()
+	def close(self):
+		"""
+		Closes the SQLite file.
+
+		:return: returns nothing
+		"""
+		self.connection.close()
+	def clear(self):
+		"""
+		Removes all data from all tables.
+
+		:return: returns nothing
+		"""
+		for table in TABLES:
+			self.connection.execute('DELETE FROM '+table)
+		self.connection.commit()
+	def importExperiment(self, benchmarks, evaluation=None):
+		"""
+		Imports a loaded experiment.
+		Existing data is replaced.
+
+		:param benchmarks: Benchmarker object containing loaded results, with computed timers run and session
+		:param evaluation: Evaluation dict, optional. Monitoring samples are taken from here.
+		:return: returns nothing
+		"""
+		self.clear()
+		cursor = self.connection.cursor()
+		# documents
+		documents = {'protocol': benchmarks.protocol, 'queries': benchmarks.queryconfig, 'connections': benchmarks.connections, 'fingerprint': getFingerprint(benchmarks.path)}
+		if evaluation is not None:
+			documents['evaluation'] = evaluation
+		cursor.executemany('INSERT INTO documents VALUES (?, ?)', [(name, json.dumps(d, default=str)) for name, d in documents.items()])
+		cursor.executemany('INSERT INTO queries VALUES (?, ?, ?)', [(i+1, q.get('title', ''), int(q.get('active', True))) for i,q in enumerate(benchmarks.queries)])
+		cursor.executemany('INSERT INTO connections VALUES (?, ?, ?)', [(c['name'], c.get('dbms', c['name']), int(c.get('active', False))) for c in benchmarks.connections])
+		for numQuery in range(1, len(benchmarks.queries)+1):
+			# measured times
+			for timer in benchmarks.timers:
+				df = benchmarks.benchmarksToDataFrame(numQuery, timer)
+				rows = [(numQuery, timer.name, c, numRun, float(v)) for c, times in df.iterrows() for numRun, v in enumerate(times.tolist()) if v == v]
+				cursor.executemany('INSERT INTO timers VALUES (?, ?, ?, ?, ?)', rows)
+			# timestamps of runs
+			df = benchmarks.getTimeseriesDF(numQuery)
+			if not df.empty:
+				df = df.astype(object).where(df.notna(), None)
+				rows = [tuple([numQuery, r['connection']]+[r[k] for k in COLUMNS_RUNS]) for r in df.to_dict(orient='records')]
+				cursor.executemany('INSERT INTO runs VALUES ('+', '.join(['?']*(len(COLUMNS_RUNS)+2))+')', rows)
+			protocol = benchmarks.protocol['query'].get(str(numQuery), {})
+			# errors and warnings
+			for type in ['errors', 'warnings']:
+				rows = [(numQuery, c, type[:-1], message) for c, message in protocol.get(type, {}).items() if len(message) > 0]
+				cursor.executemany('INSERT INTO errors VALUES (?, ?, ?, ?)', rows)
+			# digests of result sets, connections without differences have received the data storage
+			dataStorage = protocol.get('dataStorage', [])
+			for c, resultsets in protocol.get('resultSets', {}).items():
+				if len(protocol.get('errors', {}).get(c, '')) > 0:
+					continue
+				if len(resultsets) == 0:
+					resultsets = dataStorage
+				if isinstance(resultsets, tools.resultSetList):
+					# digests are known without reading the result store
+					rows = [(numQuery, c, numRun, resultsets.getDigest(numRun)) for numRun in range(len(resultsets))]
+				else:
+					rows = [(numQuery, c, numRun, getDigest(resultset)) for numRun, resultset in enumerate(resultsets)]
+				cursor.executemany('INSERT INTO resultsets VALUES (?, ?, ?, ?)', rows)
+			# monitoring samples
+			if evaluation is not None:
+				hardwaremetrics = evaluation['query'].get(str(numQuery), {}).get('hardwaremetrics', {})
+				for metric, samples in hardwaremetrics.items():
+					rows = [(numQuery, metric, c, int(numSample), float(v)) for c, values in samples.items() for numSample, v in values.items() if v is not None and v == v]
+					cursor.executemany('INSERT INTO metrics VALUES (?, ?, ?, ?, ?)', rows)
+		self.connection.commit()
+	def getDocument(self, name):
+		"""
+		Returns a stored document.
+
+		:param name: protocol, queries, connections, evaluation or fingerprint
+		:return: Dict, None if not stored
+		"""
+		row = self.connection.execute('SELECT content FROM documents WHERE name = ?', (name,)).fetchone()
+		if row is None:
+			return None
+		return json.loads(row[0])
+	def isCurrent(self, folder):
+		"""
+		Checks if the database has been imported from the current state of a result folder.
+
+		:param folder: Result folder
+		:return: True if measurements have not changed since import
+		"""
+		return self.getDocument('fingerprint') == getFingerprint(folder)
+	def listQueries(self):
+		"""
+		Returns list of numbers of active queries.
+
+		:return: List of int
+		"""
+		return [row[0] for row in self.connection.execute('SELECT query FROM queries WHERE active = 1 ORDER BY query')]
+	def listConnections(self):
+		"""
+		Returns list of names of active connections.
+
+		:return: List of str
+		"""
+		return [row[0] for row in self.connection.execute('SELECT connection FROM connections WHERE active = 1 ORDER BY connection')]
+	def readSQL(self, query, parameters):
+		"""
+		Runs a SELECT and returns the result as a DataFrame.
+
+		:param query: SQL string
+		:param parameters: List of parameters
+		:return: DataFrame
+		"""
+		return pd.read_sql_query(query, self.connection, params=parameters)
+	def getSamplesDF(self, table, key, numQuery, name, connections=None, warmup=0, cooldown=0):
+		"""
+		Returns values of a timer or metric as a DataFrame (rows=connections, columns=runs or samples).
+
+		:param table: timers or metrics
+		:param key: Name of column of index of runs or samples
+		:param numQuery: Number of query
+		:param name: Name of timer or metric
+		:param connections: List of names of connections, None means all connections
+		:param warmup: Number of first runs to be ignored
+		:param cooldown: Number of last runs to be ignored
+		:return: DataFrame
+		"""
+		column = 'timer' if table == 'timers' else 'metric'
+		query = 'SELECT connection, {key}, value FROM {table} WHERE query = ? AND {column} = ?'.format(key=key, table=table, column=column)
+		parameters = [int(numQuery), name]
+		if connections is not None:
+			query += ' AND connection IN ('+', '.join(['?']*len(connections))+')'
+			parameters.extend(connections)
+		df = self.readSQL(query, parameters)
+		if df.empty:
+			return pd.DataFrame()
+		df = df.pivot(index='connection', columns=key, values='value')
+		df = df.iloc[:, warmup:len(df.columns)-cooldown]
+		df.index.name = 'DBMS'
+		df.columns.name = None
+		return df
+	def getTimerDF(self, numQuery, timer, connections=None, warmup=0, cooldown=0):
+		"""
+		Returns measured times of a query and timer as a DataFrame (rows=connections, columns=runs).
+		This is the same as evaluator.dfMeasuresQ().
+
+		:param numQuery: Number of query
+		:param timer: Name of timer
+		:param connections: List of names of connections, None means all connections
+		:param warmup: Number of first runs to be ignored
+		:param cooldown: Number of last runs to be ignored
+		:return: DataFrame of times in ms
+		"""
+		return self.getSamplesDF('timers', 'numRun', numQuery, timer, connections, warmup, cooldown)
+	def getMetricsDF(self, numQuery, metric, connections=None, warmup=0, cooldown=0):
+		"""
+		Returns monitoring samples of a query and metric as a DataFrame (rows=connections, columns=samples).
+		This is the same as evaluator.dfMonitoringQ().
+
+		:param numQuery: Number of query
+		:param metric: Name of metric
+		:param connections: List of names of connections, None means all connections
+		:param warmup: Number of first samples to be ignored
+		:param cooldown: Number of last samples to be ignored
+		:return: DataFrame of samples
+		"""
+		return self.getSamplesDF('metrics', 'numSample', numQuery, metric, connections, warmup, cooldown)
+	def getRunsDF(self, numQuery, connection=None):
+		"""
+		Returns timestamps of all runs of a query as a DataFrame (rows=runs).
+		This is the same as benchmarker.getTimeseriesDF().
+
+		:param numQuery: Number of query
+		:param connection: Name of connection, None means all connections
+		:return: DataFrame of timestamps
+		"""
+		query = 'SELECT * FROM runs WHERE query = ?'
+		parameters = [int(numQuery)]
+		if connection is not None:
+			query += ' AND connection = ?'
+			parameters.append(connection)
+		return self.readSQL(query+' ORDER BY connection, "numRun"', parameters).drop(columns=['query'])
+	def getErrorsDF(self, numQuery=None, connection=None, type=None):
+		"""
+		Returns errors and warnings as a DataFrame (rows=query and connection).
+
+		:param numQuery: Number of query, None means all queries
+		:param connection: Name of connection, None means all connections
+		:param type: error or warning, None means both
+		:return: DataFrame of messages
+		"""
+		query = 'SELECT * FROM errors WHERE 1 = 1'
+		parameters = []
+		for column, value in [('query', numQuery), ('connection', connection), ('type', type)]:
+			if value is not None:
+				query += ' AND {} = ?'.format(column)
+				parameters.append(value)
+		return self.readSQL(query+' ORDER BY query, connection', parameters)
+	def getResultDigestsDF(self, numQuery):
+		"""
+		Returns digests of received result sets of a query as a DataFrame (rows=connections, columns=runs).
+		Connections with equal digests have received the same result set.
+
+		:param numQuery: Number of query
+		:return: DataFrame of hex strings
+		"""
+		df = self.readSQL('SELECT connection, numRun, digest FROM resultsets WHERE query = ?', [int(numQuery)])
+		if df.empty:
+			return pd.DataFrame()
+		df = df.pivot(index='connection', columns='numRun', values='digest')
+		df.index.name = 'DBMS'
+		df.columns.name = None
+		return df
+
+
+def convert(result_path, code, filename=None):
+	"""
+	Imports an existing result folder into an experiment database.
+
+	:param result_path: Folder containing result folders
+	:param code: Code of experiment (name of result folder)
+	:param filename: Name of SQLite file, default is experiment.sqlite inside of the result folder
+	:return: Name of SQLite file
+	"""
+	from dbmsbenchmarker import inspector
+	if filename is None:
+		filename = path.join(result_path, str(code), FILENAME)
+	experiment = inspector.inspector(result_path)
+	# evaluation is generated, if it does not exist
+	experiment.load_experiment(str(code), load=path.isfile(path.join(result_path, str(code), 'evaluation.json')))
+	db = experimentdb(filename)
+	db.importExperiment(experiment.benchmarks, experiment.e.evaluation)
+	db.close()
+	logging.debug("Stored experiment "+str(code)+" in "+filename)
+	return filename
@@ -26,7 +26,7 @@ from colour import Color
 from numpy import nan
 from datetime import datetime, timezone
 
-from dbmsbenchmarker import benchmarker, tools, evaluator, monitor
+from dbmsbenchmarker import benchmarker, tools, evaluator, monitor, experimentdb
 
 color_ranges = [
     ["#ff0000", "#ffcccc"],
@@ -71,6 +71,7 @@ class inspector():
         self.anonymize = anonymize
         self.list_experiments = [f for f in listdir(self.result_path) if isdir(join(self.result_path, f)) and f.isdigit()]
         self.queries_successful = []
+        self.db = None
     def get_experiments_preview(self):
         workload_preview = {}
         for code in self.list_experiments:
@@ -101,15 +102,32 @@ class inspector():
                 finally:
                     pass
         return pd.DataFrame(workload_preview).T
-    def load_experiment(self, code, anonymize=None, load=True):
+    def load_experiment(self, code, anonymize=None, load=True, lazy=True, cache_size=32):
+        # lazy: times, statistics, timeseries and evaluation of a query are read at first access, cache_size queries are kept
         if anonymize is not None:
             self.anonymize = anonymize
         # TODO: force clean dbms aliases
         self.queries_successful = []
-        self.benchmarks = benchmarker.inspector(self.result_path, code, anonymize=self.anonymize)
+        self.benchmarks = benchmarker.inspector(self.result_path, code, anonymize=self.anonymize, lazy=lazy, cacheSize=cache_size)
         self.benchmarks.computeTimerRun()
         self.benchmarks.computeTimerSession()
         self.e = evaluator.evaluator(self.benchmarks, load=load, force=True)
+        # slices of times and metrics are read by SQL, if there is an experiment database
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+        filename = join(self.result_path, str(code), experimentdb.FILENAME)
+        if isfile(filename):
+            self.db = experimentdb.experimentdb(filename)
+            if not self.db.isCurrent(self.benchmarks.path):
+                # results have changed since import (continue, rerun or merge), database is outdated
+                print("Experiment database is outdated and ignored, convert again: "+filename)
+                self.db.close()
+                self.db = None
+    def dfAnonymize(self, dataframe):
+        # experiment database contains real names of connections
+        dataframe.index = dataframe.index.map(lambda c: tools.dbms.anonymizer.get(c, c))
+        return dataframe
     def get_experiment_list_queries(self):
         # list of successful queries
         return self.benchmarks.listQueries()
@@ -218,6 +236,8 @@ class inspector():
     #def get_measures(self, numQuery, timer, warmup=0, cooldown=0):
     def get_timer(self, numQuery, timer, warmup=0, cooldown=0):
         # dataframe of dbms x measures
+        if self.db is not None:
+            return self.dfAnonymize(self.db.getTimerDF(numQuery, timer, warmup=warmup, cooldown=cooldown))
         return evaluator.dfMeasuresQ(numQuery, timer, warmup, cooldown)
     def get_lat(self, numQuery, name='run', warmup=0, cooldown=0):
         # dataframe of dbms x latencies
@@ -337,11 +357,44 @@ class inspector():
     def get_resultset_dict(self, numQuery):
         return self.benchmarks.readResultSetDict(str(numQuery))
     def get_resultset_df(self, numQuery, connection, numRun=0):
-        # dataframe of received result set for query, connection and run
+        # dataframe of received result set for query, connection and run, read from result store at first access
         return self.benchmarks.readResultSet(numQuery, connection=connection, numRun=numRun)
+    def get_resultset_digests(self, numQuery):
+        # dict of connection and digest of result set in result store (store format npz), equal digests mean equal result sets
+        return self.benchmarks.protocol['query'][str(numQuery)].get('resultDigests', {})
+    def get_resultset_mismatches(self, numQuery):
+        # dict of connection and reference connection and run, where (multiset) hash values of result sets differ
+        return self.benchmarks.protocol['query'][str(numQuery)].get('mismatches', {})
+    def get_resultset_diff(self, numQuery, connection, limit=100):
+        # row-level diff of result sets of connection and its reference for a mismatch, runs the query again at both dbms
+        mismatch = self.get_resultset_mismatches(numQuery).get(connection, None)
+        if mismatch is None:
+            return None
+        return self.benchmarks.getResultSetDiff(numQuery, connection, mismatch['reference'], mismatch['numRun'], limit)
+    def get_stored_resultset_df(self, numQuery, connection):
+        # dataframe of complete result set stored for query and connection (store format dataframe or npz)
+        return self.benchmarks.getResultSetDF(numQuery, connection)
     def get_parameter_df(self, numQuery):
         # dataframe of run x parameter
         return self.benchmarks.getParameterDF(numQuery)
+    def get_timeseries(self, numQuery, connection=None):
+        # dataframe of run x timestamps (wall clock and monotonic), worker and client connection
+        return self.benchmarks.getTimeseriesDF(numQuery, connection)
+    def get_measurements(self, numQuery, timer='execution', connection=None):
+        # dataframe of connections x runs of a timer, read from result folder without loading other queries, timers or connections
+        return self.benchmarks.getMeasurementsDF(numQuery, timer, connection)
+    def get_ingest(self):
+        # dataframe of connections x rows, bytes, time and throughput of ingest phase
+        return self.benchmarks.getIngestDF()
+    def get_streams(self, connection=None):
+        # dataframe of streams x elapsed time and permutation of throughput test
+        return self.benchmarks.getStreamsDF(connection)
+    def get_mix(self, connection=None):
+        # dataframe of queries x weight, runs and throughput of query mix
+        return self.benchmarks.getMixDF(connection)
+    def get_sweep(self, numQuery, connection=None):
+        # dataframe of number of parallel clients x throughput and latency, knee marks saturation point
+        return self.benchmarks.getSweepDF(numQuery, connection)
     def get_datastorage_size(self, numQuery):
         # size of data storage for query in bytes
         l = self.get_datastorage_list(numQuery)
@@ -399,6 +452,18 @@ class inspector():
         df = self.get_total_times().T
         # is relative to mean per query
         return df.div(df.mean(axis=1)/100.0, axis=0).T
+    def get_total_latency_percentiles(self, percentile='p99'):
+        # percentile of latency per connection and query, uncorrected (Qn) and corrected for coordinated omission (Qn corrected)
+        return tools.dataframehelper.evaluateLatencyPercentilesToDataFrame(self.e.evaluation, percentile).T
+    def get_latency_percentiles(self, numQuery):
+        # dataframe of percentiles of latency per connection, uncorrected and corrected for coordinated omission
+        rows = {}
+        for c, d in self.e.evaluation['query'][str(numQuery)]['dbms'].items():
+            if 'latency' in d and d['latency'] is not None:
+                rows[c] = {p+' uncorrected': v for p, v in d['latency']['uncorrected'].items()}
+                if d['latency']['corrected'] is not None:
+                    rows[c].update({p+' corrected': v for p, v in d['latency']['corrected'].items()})
+        return pd.DataFrame.from_dict(rows, orient='index')
     def get_total_queuesize(self):
         return tools.dataframehelper.evaluateQueuesizeToDataFrame(self.e.evaluation).T
     def get_total_lat(self):
@@ -438,6 +503,8 @@ class inspector():
         else:
             return self.get_experiment_queries_successful()
     def get_hardware_metrics(self, numQuery, metric, warmup=0, cooldown=0):
+        if self.db is not None:
+            return self.dfAnonymize(self.db.getMetricsDF(numQuery, metric, warmup=warmup, cooldown=cooldown))
         return evaluator.dfMonitoringQ(numQuery, metric, warmup, cooldown)
         #hw = monitor.metrics(self.benchmarks)
         #df = hw.dfHardwareMetrics(numQuery, metric)
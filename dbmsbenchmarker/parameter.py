@@ -17,6 +17,7 @@
 """
 import random
 import time
+import re
 import pandas as pd
 from dateutil.relativedelta import relativedelta
 import logging
@@ -76,6 +77,82 @@ def generateParameters(parameters, number):
 
 # generateParameters(demoparameters,1)
 
+def parametrize(queryTemplate, params, numRun=0):
+	"""
+	Replaces parameters in a query template.
+
+	:param queryTemplate: Query string or list of query strings containing {PARAMETER}
+	:param params: Dict of parameter values
+	:param numRun: Number of benchmark run, available as {numRun}
+	:return: Query string or list of query strings
+	"""
+	params['numRun'] = numRun
+	values = params.copy()
+	values.update(defaultParameters)
+	if isinstance(queryTemplate, list):
+		return [queryPart.format(**values) for queryPart in queryTemplate]
+	else:
+		return queryTemplate.format(**values)
+
+def prepareTemplate(queryTemplate, paramstyle='qmark'):
+	"""
+	Replaces parameters in a query template by bind parameters of a prepared statement.
+	A parameter must stand for a complete literal, quotes around it are removed.
+	Default parameters are constant and replaced by their values.
+
+	:param queryTemplate: Query string containing {PARAMETER}
+	:param paramstyle: Style of bind parameters of the DB-API, one of qmark, numeric, named, format and pyformat
+	:return: Query string with bind parameters and list of names of parameters in order of appearance
+	"""
+	names = []
+	def replace(match):
+		name = match.group(1) if match.group(1) is not None else match.group(2)
+		if name in defaultParameters:
+			return match.group(0).format(**defaultParameters)
+		names.append(name)
+		if paramstyle == 'numeric':
+			return ':'+str(len(names))
+		elif paramstyle == 'named':
+			return ':'+name
+		elif paramstyle == 'format':
+			return '%s'
+		elif paramstyle == 'pyformat':
+			return '%('+name+')s'
+		else:
+			return '?'
+	queryString = re.sub(r"'\{(\w+)\}'|\{(\w+)\}", replace, queryTemplate)
+	return queryString, names
+
+def bindParameters(names, params, numRun=0, paramstyle='qmark'):
+	"""
+	Returns values of bind parameters of a prepared statement for a single run.
+
+	:param names: List of names of parameters, as returned by prepareTemplate()
+	:param params: Dict of parameter values
+	:param numRun: Number of benchmark run, available as {numRun}
+	:param paramstyle: Style of bind parameters of the DB-API
+	:return: Dict of values for named styles, list of values otherwise
+	"""
+	values = params.copy()
+	values['numRun'] = numRun
+	if paramstyle in ['named', 'pyformat']:
+		return {name: values[name] for name in names}
+	else:
+		return [values[name] for name in names]
+
+def generateParametersForRun(parameters, seed, numRun):
+	"""
+	Generates parameters for a single run.
+	The random generator is seeded by seed and number of run, so all connections get the same parameters for the same run, no matter when or where they are generated.
+
+	:param parameters: Dict of parameter definitions
+	:param seed: Seed common to all runs of a query
+	:param numRun: Number of benchmark run
+	:return: Dict of parameter values
+	"""
+	random.seed(str(seed)+"_"+str(numRun))
+	return generateParameters(parameters, 1)[0]
+
 class randomizer():
 	def __init__(self, parameter):
 		f = getattr(self, parameter['type'])
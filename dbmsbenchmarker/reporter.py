@@ -99,11 +99,24 @@ class reporter():
 class storer(reporter):
 	"""
 	Class for generating reports.
-	This class saves a protocol in json and benchmarks as csv files.
+	This class saves a protocol in json and benchmarks as NumPy container per query (optionally also as csv files).
 	It also provides a load() method to restore previous benchmarks.
 	"""
 	def __init__(self, benchmarker):
 		reporter.__init__(self, benchmarker)
+		# shards of protocol that have been written by this storer
+		self.shardsWritten = set()
+	def getMeasurementsFormats(self):
+		"""
+		Returns list of formats measured times are stored in.
+		This is set by 'measurementsFormat' in the reporting section of the query file, default is npz only.
+
+		:return: List of formats, 'npz' and/or 'csv'
+		"""
+		formats = self.benchmarker.queryconfig.get('reporting', {}).get('measurementsFormat', ['npz'])
+		if isinstance(formats, str):
+			formats = [formats]
+		return formats
 	def save(self, dataframe, filename):
 		"""
 		Saves benchmark table of a query as csv file.
@@ -132,27 +145,111 @@ class storer(reporter):
 		:param timer: Timer containing benchmark results
 		:return: returns nothing
 		"""
-		self.writeProtocol()
+		self.writeProtocol(numQuery)
+		formats = self.getMeasurementsFormats()
+		histograms = {}
+		measurements = {}
 		for t in timer:
 			# are there benchmarks for this query?
 			if not t.checkForSuccessfulBenchmarks(numQuery):
 				continue
 			logging.debug("saveBenchmarkOfQuery: "+str(numQuery))
 			query = tools.query(self.benchmarker.queries[numQuery-1])
-			df = t.toDataFrame(numQuery)
-			# save as csv
-			self.save(
-				dataframe = df,
-				filename = self.benchmarker.path+'/query_'+str(numQuery)+'_'+t.name+'.csv')
+			measurements[t.name] = t.times[numQuery-1]
+			if 'csv' in formats:
+				df = t.toDataFrame(numQuery)
+				# save as csv
+				self.save(
+					dataframe = df,
+					filename = self.benchmarker.path+'/query_'+str(numQuery)+'_'+t.name+'.csv')
+			histograms[t.name] = {c: t.getHistogram(numQuery, c, query).toDict() for c in t.times[numQuery-1].keys()}
+		if len(measurements) > 0 and 'npz' in formats:
+			tools.saveMeasurements(self.benchmarker.path+'/query_'+str(numQuery)+'_measurements.npz', measurements)
+		if len(histograms) > 0:
+			self.saveHistograms(histograms, self.benchmarker.path+'/query_'+str(numQuery)+'_histograms.json')
+		self.saveTimeseries(numQuery)
+	def saveHistograms(self, histograms, filename):
+		"""
+		Saves histograms of measured runs of a query as JSON file.
+
+		:param histograms: Dict (timers) of dicts (connections) of histograms as dicts
+		:param filename: Filename for JSON file
+		:return: returns nothing
+		"""
+		with open(filename, 'w') as f:
+			json.dump(histograms, f)
+	def loadHistograms(self, numQuery):
+		"""
+		Loads histograms of measured runs of a given query from JSON file.
+
+		:param numQuery: Number of query to load histograms of
+		:return: Dict (timers) of dicts (connections) of histogram objects
+		"""
+		filename = self.benchmarker.path+'/query_'+str(numQuery)+'_histograms.json'
+		if not os.path.isfile(filename):
+			logging.debug(filename + " not found")
+			return {}
+		with open(filename, 'r') as f:
+			histograms = json.load(f)
+		logging.debug("Read "+filename)
+		return {name: {c: tools.histogram.fromDict(h) for c,h in hists.items()} for name,hists in histograms.items()}
+	def saveTimeseries(self, numQuery):
+		"""
+		Saves timestamps of all runs of a given query as csv file (one row per run).
+
+		:param numQuery: Number of query to save timestamps of
+		:return: returns nothing
+		"""
+		df = self.benchmarker.getTimeseriesDF(numQuery)
+		if df.empty:
+			return
+		filename = self.benchmarker.path+'/query_'+str(numQuery)+'_timeseries.csv'
+		df.to_csv(filename, index_label=False, index=False)
+	def readTimeseries(self, numQuery):
+		"""
+		Reads timestamps of all runs of a given query from csv file.
+
+		:param numQuery: Number of query to read timestamps of
+		:return: Dict (connections) of lists (runs) of dicts, None if there is no file
+		"""
+		filename = self.benchmarker.path+'/query_'+str(numQuery)+'_timeseries.csv'
+		if not os.path.isfile(filename):
+			logging.debug(filename + " not found")
+			return None
+		df = pd.read_csv(filename)
+		timeseries = {}
+		for c, df_c in df.groupby('connection', sort=False):
+			timeseries[c] = df_c.drop(columns=['connection']).to_dict(orient='records')
+		logging.debug("Read "+filename)
+		return timeseries
+	def loadTimeseries(self, numQuery):
+		"""
+		Loads timestamps of all runs of a given query from csv file.
+
+		:param numQuery: Number of query to load timestamps of
+		:return: True if successful
+		"""
+		timeseries = self.readTimeseries(numQuery)
+		if timeseries is None:
+			return False
+		self.benchmarker.timeseries[numQuery] = timeseries
+		return True
 	def load(self, query, numQuery, timer):
 		"""
-		Loads benchmark table of a given query from csv files per timer.
+		Loads benchmark table of a given query from NumPy container, or from csv files per timer if there is no container.
 
 		:param numQuery: Number of query to save benchmarks of
 		:param query: Query object, because number of warmups is needed
 		:param timer: Timer containing benchmark results
 		:return: True if successful
 		"""
+		histograms = self.loadHistograms(numQuery)
+		filename = self.benchmarker.path+'/query_'+str(numQuery)+'_measurements.npz'
+		if os.path.isfile(filename):
+			measurements = tools.loadMeasurements(filename, timers=[t.name for t in timer])
+			for t in timer:
+				t.appendTimes(measurements.get(t.name, {}), query, histograms.get(t.name, {}))
+			return True
 		for t in timer:
 			# load execution benchmarks
 			filename = self.benchmarker.path+'/query_'+str(numQuery)+'_'+t.name+'.csv'
@@ -160,32 +257,36 @@ class storer(reporter):
 				df = pd.read_csv(filename)
 				df_t = df.transpose()
 				d = df.to_dict(orient="list")
-				t.appendTimes(d, query)#.warmup)
+				# remove padding of runs of different lengths (duration mode)
+				d = {k: [x for x in v if x == x] for k,v in d.items()}
+				t.appendTimes(d, query, histograms.get(t.name, {}))#.warmup)
 				logging.debug("Read "+filename)
 			else:
 				t.appendTimes({}, query)#.warmup)
 				logging.debug(filename + " not found")
 				#return False
 		return True
-	def writeProtocol(self):
+	def writeProtocol(self, numQuery=None):
 		"""
 		Saves procol of benchmarker in JSON format.
+		The header (protocol.json) is always written, the shard of a query only if it has changed.
+		All shards are written once per storer, so older result folders are converted when continued.
 
+		:param numQuery: Number of query that has changed, None means header only
 		:return: returns nothing
 		"""
-		filename = self.benchmarker.path+'/protocol.json'
-		with open(filename, 'w') as f:
-			json.dump(self.benchmarker.protocol, f)
+		numQueries = [k for k in self.benchmarker.protocol['query'].keys() if k == str(numQuery) or not k in self.shardsWritten]
+		tools.writeProtocolFolder(self.benchmarker.path, self.benchmarker.protocol, numQueries)
+		self.shardsWritten.update(numQueries)
 	def readProtocol(self):
 		"""
 		Loads procol of benchmarker in JSON format.
+		Shards per query are read at first access.
 
 		:return: returns nothing
 		"""
 		try:
-			filename = self.benchmarker.path+'/protocol.json'
-			with open(filename, 'r') as f:
-				self.benchmarker.protocol = json.load(f)
+			self.benchmarker.protocol = tools.readProtocolFolder(self.benchmarker.path)
 		except Exception as e:
 				print("No protocol found")
 		finally:
@@ -195,6 +296,57 @@ class storer(reporter):
 
 
 
+class sender(reporter):
+	"""
+	Class for generating reports.
+	This class sends measurements of a query to somewhere else, for example from an agent to the coordinator.
+	It is called immediately after each benchmark, also in batch mode.
+	"""
+	def __init__(self, benchmarker, send):
+		"""
+		Construct a new 'sender' object.
+
+		:param benchmarker: Object of benchmarker containing information about queries, connections and benchmark times
+		:param send: Function that receives the measurements as a dict
+		:return: returns nothing
+		"""
+		reporter.__init__(self, benchmarker)
+		self.send = send
+	def generate(self, numQuery, timer):
+		"""
+		Sends times, histograms and timeseries of a given query and the part of the protocol about this query.
+		Result sets in the local result store (per connection) are sent as well.
+
+		:param numQuery: Number of query to send measurements of
+		:param timer: Timer containing benchmark results
+		:return: returns nothing
+		"""
+		query = tools.query(self.benchmarker.queries[numQuery-1])
+		times = {}
+		histograms = {}
+		for t in timer:
+			if not t.checkForBenchmarks(numQuery):
+				continue
+			times[t.name] = t.times[numQuery-1]
+			histograms[t.name] = {c: t.getHistogram(numQuery, c, query).toDict() for c in t.times[numQuery-1].keys()}
+		protocol = {k: v for k, v in self.benchmarker.protocol.items() if k in ['ingest', 'streams', 'mix', 'streamPermutations', 'mixSequence']}
+		protocol['query'] = {str(numQuery): self.benchmarker.protocol['query'][str(numQuery)]}
+		digests = protocol['query'][str(numQuery)].get('resultDigests', {}).values()
+		resultsets = {digest: tools.readResultBlob(self.benchmarker.path, digest) for digest in set(digests)}
+		self.send({
+			'type': 'result',
+			'numQuery': numQuery,
+			'times': times,
+			'histograms': histograms,
+			'timeseries': self.benchmarker.timeseries.get(numQuery, {}),
+			'protocol': protocol,
+			'resultsets': resultsets,
+		})
+
+
+
+
+
 class printer(reporter):
 	"""
 	Class for generating reports.
@@ -549,7 +701,8 @@ class boxploter(reporter):
 			if t.perRun:
 				# leave out warumup/cooldown
 				df = df.drop(range(query.warmup),axis=1)
-				df = df.drop(range(query.numRunEnd, query.numRun),axis=1)
+				if query.numRunEnd is not None:
+					df = df.drop(range(query.numRunEnd, query.numRun),axis=1)
 			df = df.loc[:, (df != 0).any(axis=0)]
 			# save as boxplot
 			self.save(
@@ -787,6 +940,70 @@ class tps(reporter):
 		self.generate(numQuery=None, timer=timer)
 
 
+class scalability(reporter):
+	"""
+	Class for generating reports.
+	Generates a scalability table (csv) and plot of throughput and latency per number of parallel clients of a sweep and saves it to disk.
+	"""
+	def __init__(self, benchmarker):
+		reporter.__init__(self, benchmarker)
+	def save(self, dataframe, title, filename):
+		"""
+		Saves scalability table as csv and plot of throughput and latency per connection.
+		Anonymizes dbms if activated.
+
+		:param dataframe: Report data given as a pandas DataFrame (rows=levels of sweep)
+		:param title: Title of the report
+		:param filename: Name of the file the report will be saved to, without extension
+		:return: returns nothing
+		"""
+		dataframe.to_csv(filename+'.csv', index_label=False, index=False)
+		fig, (ax_tps, ax_lat) = plt.subplots(1, 2, figsize=(12,5))
+		for c, df in dataframe.groupby('connection', sort=True):
+			color = tools.dbms.dbmscolors.get(c, '#333333')
+			ax_tps.plot(df['numProcesses'], df['throughput_run_total_ps'], marker='o', label=c, color=color)
+			ax_lat.plot(df['numProcesses'], df['latency_run_mean_ms'], marker='o', label=c, color=color)
+			df_knee = df[df['knee'] == True]
+			ax_tps.plot(df_knee['numProcesses'], df_knee['throughput_run_total_ps'], marker='*', markersize=15, linestyle='', color=color)
+		ax_tps.set_title("Throughput [Hz]")
+		ax_lat.set_title("Latency [ms]")
+		for ax in [ax_tps, ax_lat]:
+			try:
+				ax.set_xscale('log', base=2)
+			except TypeError:
+				# matplotlib < 3.3
+				ax.set_xscale('log', basex=2)
+			ax.set_xticks(sorted(dataframe['numProcesses'].unique()))
+			ax.get_xaxis().set_major_formatter(matplotlib.ticker.ScalarFormatter())
+			ax.set_xlabel("Number of parallel clients")
+			ax.set_ylim(bottom=0)
+		ax_tps.legend(title="DBMS")
+		fig.suptitle(title)
+		plt.savefig(filename+'.png', bbox_inches='tight')
+		plt.close('all')
+	def generate(self, numQuery, timer):
+		"""
+		Generates a scalability table and plot of a given query if there is a sweep of parallel clients.
+		Anonymizes dbms if activated.
+
+		:param numQuery: Number of query to generate report of
+		:param timer: Timer containing benchmark results
+		:return: returns nothing
+		"""
+		dataframe = self.benchmarker.getSweepDF(numQuery)
+		if dataframe.empty:
+			return
+		dataframe['connection'] = dataframe['connection'].map(tools.dbms.anonymizer)
+		query = tools.query(self.benchmarker.queries[numQuery-1])
+		logging.debug("Scalability Q"+str(numQuery))
+		self.save(
+			dataframe = dataframe,
+			title = "Q"+str(numQuery)+": "+query.title,
+			filename = self.benchmarker.path+'/query_'+str(numQuery)+'_scalability')
+
+
+
+
 class hister(reporter):
 	"""
 	Class for generating reports.
@@ -874,7 +1091,8 @@ class hister(reporter):
 				# leave out warumup/cooldown
 				#print(df)
 				df = df.drop(range(0,query.warmup),axis=1)
-				df = df.drop(range(query.numRunEnd, query.numRun),axis=1)
+				if query.numRunEnd is not None:
+					df = df.drop(range(query.numRunEnd, query.numRun),axis=1)
 			#df = df.replace(np.nan, 0)
 			df = df.replace(0, np.nan)
 			#df = df.loc[(df != 0).any(axis=0),:]
@@ -1750,6 +1968,8 @@ class latexer(reporter):
 			if len(self.benchmarker.protocol['query'][str(i)]['parameter']) > 0:
 				result['querySurvey'] += "\\\\\\hyperref[parameter:{code}-Q{queryNumber}]{{Parametrized}}".format(**result, queryNumber=i)
 			l = self.benchmarker.protocol['query'][str(i)]['dataStorage']
+			# cancelled runs have no result set
+			l = [x for x in l if x is not None]
 			if len(l) > 0 and len(l[0]) > 0 and len(l[0][0]) > 0:
 				l = [x for l1 in l for l2 in l1 for x in l2]
 				result['querySurvey'] += "\\\\\\hyperref[data:{code}-Q{queryNumber}]{{Storage size}}: ".format(**result, queryNumber=i)+str(sys.getsizeof(l))+" bytes ("+queryObject.result+")"
@@ -18,12 +18,25 @@
 from statistics import *
 import numpy as np
 import jaydebeapi
+import importlib
+import hashlib
+import pickle
+import struct
+import zlib
+import glob
+import time
+import sys
+import csv
+import random
+from operator import itemgetter
+from collections import OrderedDict
 from timeit import default_timer #as timer
 import pandas as pd
 import logging
 import math
 import re
 import ast
+import os
 from os import path
 import matplotlib.pyplot as plt
 
@@ -42,7 +55,8 @@ class timer():
 	---- startTimerRun() and abortTimerRun() / finishTimerRun()
 	--- abortTimer() or finishTimer()
 	"""
-	header_stats = ["DBMS [ms]", "n", "mean", "stdev", "cv %", "qcod %", "iqr", "median", "min", "max"]
+	header_stats = ["DBMS [ms]", "n", "mean", "stdev", "cv %", "qcod %", "iqr", "median", "min", "max", "p50", "p90", "p95", "p99", "p99.9"]
+	percentiles = [50, 90, 95, 99, 99.9]
 	def __init__(self, name):
 		"""
 		Stores name of benchmark container (e.g. execution or data transfer)
@@ -65,15 +79,24 @@ class timer():
 		"""
 		self.times = []
 		self.stats = []
+		# dict (queries) of dicts (connections) of histograms
+		self.histograms = {}
 	@staticmethod
-	def getStats(data):
+	def getStats(data, hist=None):
 		"""
 		Computes statistics to list of data.
 		This is: mean, median, stdev, cv (coefficient of variation), qcod (Quartile coefficient of dispersion), iqr (Interquartile range), min and max.
+		Tail percentiles p50, p90, p95, p99 and p99.9 are taken from a histogram.
 
-		:param data: List of numbers
-		:return: returns 6 statistical numbers as a list
+		:param data: List of numbers, NaN (for example cancelled runs) is ignored
+		:param hist: Histogram of the same data (optional), otherwise it is built from data
+		:return: returns 14 statistical numbers as a list
 		"""
+		# remove runs without measurement
+		data = [x for x in data if not math.isnan(x)]
+		if len(data) == 0:
+			# no measured run at all
+			data = [0.0]
 		# remove zeros for some statistics
 		data_no_zeros = list(filter((0.0).__ne__, data))
 		if len(data_no_zeros) == 0:
@@ -104,8 +127,35 @@ class timer():
 			t_iqr = (Q3-Q1)
 		else:
 			t_iqr = 0
+		if hist is None:
+			hist = histogram.fromValues(data)
 		result = [numRun, t_mean, t_stdev, t_cv, t_qcod, t_iqr, t_median, t_min, t_max]
+		result.extend([hist.getPercentile(p) for p in timer.percentiles])
 		return result
+	@staticmethod
+	def getConfidenceInterval(data, confidence=0.95, statistic='mean'):
+		"""
+		Computes confidence interval of mean (Student's t) or median (distribution-free, order statistics) of list of data.
+
+		:param data: List of numbers
+		:param confidence: Confidence level
+		:param statistic: mean or median
+		:return: returns center and half-width of confidence interval, half-width is inf if there are too few numbers
+		"""
+		from scipy import stats
+		numRun = len(data)
+		if numRun < 2:
+			return (mean(data) if numRun > 0 else 0.0), float('inf')
+		if statistic == 'median':
+			data_sorted = sorted(data)
+			# rank of lower bound (1-based), upper bound is symmetric
+			j = int(stats.binom.ppf((1.0-confidence)/2.0, numRun, 0.5))
+			if j < 1:
+				return median(data), float('inf')
+			return median(data), (data_sorted[numRun-j] - data_sorted[j-1])/2.0
+		else:
+			t = stats.t.ppf((1.0+confidence)/2.0, numRun-1)
+			return mean(data), t*stdev(data)/math.sqrt(numRun)
 	def startTimer(self, numQuery, query, nameConnection):
 		"""
 		Stores number of warmup runs and benchmark runs.
@@ -153,12 +203,13 @@ class timer():
 		self.finishTimerQuery()
 		self.times[self.currentQuery][self.nameConnection] = self.time_c
 		self.stats[self.currentQuery][self.nameConnection] = self.stat_c
+		self.setHistogram(self.currentQuery+1, self.nameConnection, self.histogram_c)
 		#if benchmarker.BENCHMARKER_VERBOSE_STATISTICS:
 		#	print("Benchmark "+self.name+" has been stored for "+self.nameConnection+" mean: "+str(self.stats[self.currentQuery][self.nameConnection][0]))
 	def skipTimer(self, numQuery, query, nameConnection):
 		self.nameConnection = nameConnection
 		self.startTimerQuery(numQuery, query)#numWarmup, numRun)
-		if len(self.times) <= self.currentQuery:
+		while len(self.times) <= self.currentQuery:
 			self.times.append({})
 			self.stats.append({})
 		self.finishTimerQuery()
@@ -191,6 +242,8 @@ class timer():
 		"""
 		self.time_c = []
 		self.stat_c = []
+		# histogram of measured runs, merged from workers
+		self.histogram_c = None
 	def abortTimerConnection(self):
 		"""
 		Augments list of benchmarks of current connection by filling missing values with 0.
@@ -208,6 +261,7 @@ class timer():
 		"""
 		# fill missing runs with 0
 		self.time_c = [0]*(self.query.numRun)
+		self.histogram_c = None
 	def finishTimerConnection(self):
 		"""
 		Appends completed benchmarks to storage.
@@ -217,9 +271,9 @@ class timer():
 		"""
 		# compute statistics, ignore warmup
 		if self.perRun:
-			self.stat_c = timer.getStats(self.time_c[self.query.numRunBegin:self.query.numRunEnd])
+			self.stat_c = timer.getStats(self.time_c[self.query.numRunBegin:self.query.numRunEnd], self.histogram_c)
 		else:
-			self.stat_c = timer.getStats(self.time_c)
+			self.stat_c = timer.getStats(self.time_c, self.histogram_c)
 	def startTimerRun(self):
 		"""
 		Starts benchmark of one single run.
@@ -251,25 +305,60 @@ class timer():
 		duration = self.end - self.start
 		self.time_c.append(1000.0*duration)
 		return self.end - self.start
-	def appendTimes(self, times, query):# numWarmup):
+	def appendTimes(self, times, query, histograms={}):# numWarmup):
 		"""
 		Appends results of one single query.
 		This is a list (connections) of benchmarks (runs).
 		It also computes statistics and thereby ignores warmup runs.
 
 		:param numWarmup: Number of warmup runs
+		:param histograms: Dict of histograms per connection (optional)
 		:return: returns nothing
 		"""
 		if len(times)>0:
 			if self.perRun:
-				stats = {k: timer.getStats(v[query.numRunBegin:query.numRunEnd]) for k,v in times.items()}
+				stats = {k: timer.getStats(v[query.numRunBegin:query.numRunEnd], histograms.get(k, None)) for k,v in times.items()}
 			else:
-				stats = {k: timer.getStats(v) for k,v in times.items()}
+				stats = {k: timer.getStats(v, histograms.get(k, None)) for k,v in times.items()}
 			#stats = {k: self.getStats(v[numWarmup:]) for k,v in times.items()}
 		else:
 			stats = {}
 		self.times.append(times)
 		self.stats.append(stats)
+		for k,v in histograms.items():
+			self.setHistogram(len(self.times), k, v)
+	def setHistogram(self, numQuery, nameConnection, hist):
+		"""
+		Stores histogram of measured runs of a given query and connection.
+		None removes the histogram, it is then built from the times if needed.
+
+		:param numQuery: Number of query
+		:param nameConnection: Name of connection
+		:param hist: Histogram object or None
+		:return: returns nothing
+		"""
+		if hist is None:
+			self.histograms.get(numQuery, {}).pop(nameConnection, None)
+		else:
+			if not numQuery in self.histograms:
+				self.histograms[numQuery] = {}
+			self.histograms[numQuery][nameConnection] = hist
+	def getHistogram(self, numQuery, nameConnection, query=None):
+		"""
+		Returns histogram of measured runs (without warmup and cooldown) of a given query and connection.
+		If there is no stored histogram, it is built from the times.
+
+		:param numQuery: Number of query
+		:param nameConnection: Name of connection
+		:param query: Query object, because number of warmups is needed
+		:return: Histogram object
+		"""
+		if nameConnection in self.histograms.get(numQuery, {}):
+			return self.histograms[numQuery][nameConnection]
+		times = self.times[numQuery-1].get(nameConnection, []) if len(self.times) >= numQuery else []
+		if self.perRun and query is not None:
+			times = times[query.numRunBegin:query.numRunEnd]
+		return histogram.fromValues(times)
 	def checkForBenchmarks(self, numQuery, nameConnection = None):
 		"""
 		Checks if there is a list of benchmark runs for a given query and connection.
@@ -342,6 +431,375 @@ class timer():
 
 
 
+class histogram():
+	"""
+	Histogram of latencies with logarithmic buckets (HDR style).
+	Bucket k covers [base^k, base^(k+1)) with base = (1+precision)/(1-precision), so every value is represented with a relative error of at most precision.
+	Zeros (failed runs) are counted separately.
+	Histograms of the same precision can be merged without loss by adding counts, for example of several workers or partial result folders.
+	"""
+	def __init__(self, precision=0.01):
+		"""
+		Construct a new empty histogram.
+
+		:param precision: Maximum relative error of represented values
+		:return: returns nothing
+		"""
+		self.precision = precision
+		self.base = (1.0+precision)/(1.0-precision)
+		self.counts = {}
+		self.count = 0
+		self.zeros = 0
+		self.sum = 0.0
+		self.min = None
+		self.max = None
+	@classmethod
+	def fromValues(cls, values, precision=0.01):
+		"""
+		Construct a new histogram containing a list of values.
+
+		:param values: List of numbers
+		:param precision: Maximum relative error of represented values
+		:return: returns histogram object
+		"""
+		hist = cls(precision)
+		for value in values:
+			hist.add(value)
+		return hist
+	@classmethod
+	def fromDict(cls, d):
+		"""
+		Construct a histogram from dict (as generated by toDict()).
+
+		:param d: Dict of histogram
+		:return: returns histogram object
+		"""
+		hist = cls(d['precision'])
+		hist.counts = {int(k): v for k,v in d['counts'].items()}
+		hist.count = d['count']
+		hist.zeros = d['zeros']
+		hist.sum = d['sum']
+		hist.min = d['min']
+		hist.max = d['max']
+		return hist
+	def toDict(self):
+		"""
+		Returns histogram as dict, for example to be stored as JSON.
+
+		:return: Dict of histogram
+		"""
+		return {'precision': self.precision, 'count': self.count, 'zeros': self.zeros, 'sum': self.sum, 'min': self.min, 'max': self.max, 'counts': {str(k): v for k,v in sorted(self.counts.items())}}
+	def getBucket(self, value):
+		"""
+		Returns number of bucket of a positive value.
+
+		:param value: Positive number
+		:return: Number of bucket
+		"""
+		return math.floor(math.log(value)/math.log(self.base))
+	def getValue(self, bucket):
+		"""
+		Returns representative value of a bucket.
+
+		:param bucket: Number of bucket
+		:return: Value with relative error of at most precision to all values of the bucket
+		"""
+		return self.base**bucket/(1.0-self.precision)
+	def add(self, value, count=1):
+		"""
+		Adds a value.
+
+		:param value: Non-negative number, NaN is ignored
+		:param count: Number of occurrences
+		:return: returns nothing
+		"""
+		if math.isnan(value):
+			# run without measurement
+			return
+		self.count += count
+		if value <= 0:
+			self.zeros += count
+			return
+		self.sum += value*count
+		self.min = value if self.min is None else min(self.min, value)
+		self.max = value if self.max is None else max(self.max, value)
+		bucket = self.getBucket(value)
+		self.counts[bucket] = self.counts.get(bucket, 0) + count
+	def addWithExpectedInterval(self, value, interval, count=1):
+		"""
+		Adds a value and back-fills samples that have been missed while waiting for it (coordinated omission).
+		If a run should have been started every interval ms, a run taking value ms delays the runs in between.
+		Those would have seen latencies value-interval, value-2*interval, ... as long as these are at least interval.
+
+		:param value: Non-negative number
+		:param interval: Expected interval between starts of runs
+		:param count: Number of occurrences
+		:return: Number of back-filled samples
+		"""
+		self.add(value, count)
+		numMissing = 0
+		if interval is None or interval <= 0:
+			return numMissing
+		missing = value - interval
+		while missing >= interval:
+			self.add(missing, count)
+			numMissing += count
+			missing -= interval
+		return numMissing
+	def merge(self, other):
+		"""
+		Adds all values of another histogram of the same precision.
+
+		:param other: Histogram object
+		:return: returns self
+		"""
+		if other.precision != self.precision:
+			raise ValueError('Histograms of different precision cannot be merged')
+		for bucket, count in other.counts.items():
+			self.counts[bucket] = self.counts.get(bucket, 0) + count
+		self.count += other.count
+		self.zeros += other.zeros
+		self.sum += other.sum
+		if other.min is not None:
+			self.min = other.min if self.min is None else min(self.min, other.min)
+		if other.max is not None:
+			self.max = other.max if self.max is None else max(self.max, other.max)
+		return self
+	def getPercentile(self, percentile):
+		"""
+		Returns percentile (nearest rank) of non-zero values.
+		This is 0 if there are no such values.
+
+		:param percentile: Percentile between 0 and 100
+		:return: Value of percentile
+		"""
+		numValues = self.count - self.zeros
+		if numValues <= 0:
+			return 0.0
+		rank = max(1, math.ceil(percentile/100.0*numValues))
+		seen = 0
+		for bucket in sorted(self.counts.keys()):
+			seen += self.counts[bucket]
+			if seen >= rank:
+				return min(max(self.getValue(bucket), self.min), self.max)
+		return self.max
+
+
+
+class journal():
+	"""
+	Append-only journal of finished runs, written by a worker process.
+	Each record is a pickled object, prefixed by its length and CRC32, so an incomplete record at the end (crash while writing) is detected and ignored.
+	Records are synced to disk in batches, at most syncInterval seconds after they have been appended, and when the journal is closed.
+	Every worker writes a file of its own, named prefix_pid.journal.
+	"""
+	header = struct.Struct('<II')
+	def __init__(self, prefix, syncInterval=1.0):
+		"""
+		Construct a new journal object and open the file of the current process for appending.
+
+		:param prefix: Path and prefix of journal files, for example result_folder/query_1_journal_MySQL
+		:param syncInterval: Maximum number of seconds between appending and syncing a record
+		:return: returns nothing
+		"""
+		self.filename = prefix+'_'+str(os.getpid())+'.journal'
+		self.syncInterval = syncInterval
+		self.file = open(self.filename, 'ab')
+		self.lastSync = time.monotonic()
+		self.unsynced = 0
+	def append(self, record):
+		"""
+		Appends a record to the journal.
+
+		:param record: Picklable object
+		:return: returns nothing
+		"""
+		payload = pickle.dumps(record)
+		self.file.write(journal.header.pack(len(payload), zlib.crc32(payload)) + payload)
+		self.unsynced += 1
+		if time.monotonic() - self.lastSync >= self.syncInterval:
+			self.sync()
+	def sync(self):
+		"""
+		Writes appended records durably to disk.
+
+		:return: returns nothing
+		"""
+		if self.unsynced > 0:
+			self.file.flush()
+			os.fsync(self.file.fileno())
+			self.unsynced = 0
+		self.lastSync = time.monotonic()
+	def close(self):
+		"""
+		Syncs and closes the journal.
+
+		:return: returns nothing
+		"""
+		self.sync()
+		self.file.close()
+	@staticmethod
+	def getFiles(prefix):
+		"""
+		Returns list of journal files of all workers.
+		Only files named prefix_pid.journal are taken, so connections whose names start with the name of another connection are not mixed up.
+
+		:param prefix: Path and prefix of journal files
+		:return: List of filenames
+		"""
+		pattern = re.compile(re.escape(os.path.basename(prefix))+r'_\d+\.journal$')
+		return sorted([filename for filename in glob.glob(glob.escape(prefix)+'_*.journal') if pattern.match(os.path.basename(filename))])
+	@staticmethod
+	def read(filename):
+		"""
+		Reads all complete records of a journal file.
+		Reading stops at the first incomplete or corrupt record.
+
+		:param filename: Name of journal file
+		:return: List of records
+		"""
+		records = []
+		with open(filename, 'rb') as f:
+			while True:
+				header = f.read(journal.header.size)
+				if len(header) < journal.header.size:
+					break
+				length, crc = journal.header.unpack(header)
+				payload = f.read(length)
+				if len(payload) < length or zlib.crc32(payload) != crc:
+					logging.debug("Incomplete record in "+filename)
+					break
+				records.append(pickle.loads(payload))
+		return records
+	@staticmethod
+	def readRuns(prefix):
+		"""
+		Reads finished runs of all workers.
+		If a run has been journaled more than once, the last one is taken.
+
+		:param prefix: Path and prefix of journal files
+		:return: Dict of number of run and result
+		"""
+		runs = {}
+		for filename in journal.getFiles(prefix):
+			for record in journal.read(filename):
+				runs[record.numRun] = record
+		return runs
+	@staticmethod
+	def remove(prefix):
+		"""
+		Removes journal files of all workers.
+
+		:param prefix: Path and prefix of journal files
+		:return: returns nothing
+		"""
+		for filename in journal.getFiles(prefix):
+			os.remove(filename)
+
+
+
+class queryCache():
+	"""
+	Bounded cache of data of queries of a result folder, read at first access.
+	An entry is a dict per query, for example times, statistics and histograms per timer.
+	Derived parts of an entry (for example computed timers) are computed at first access as well.
+	If the cache is full, the least recently used query is forgotten.
+	"""
+	def __init__(self, load, derive={}, size=32):
+		"""
+		Construct a new 'queryCache' object.
+
+		:param load: Function reading the entry of a query, gets the number of query
+		:param derive: Dict of keys and functions computing a part of an entry, gets the number of query
+		:param size: Maximum number of queries in cache
+		:return: returns nothing
+		"""
+		self.load = load
+		self.derive = derive
+		self.size = size
+		self.entries = OrderedDict()
+	def get(self, numQuery, key):
+		"""
+		Returns a part of the entry of a query.
+
+		:param numQuery: Number of query
+		:param key: Key of part of entry
+		:return: Part of entry
+		"""
+		if numQuery in self.entries:
+			self.entries.move_to_end(numQuery)
+		else:
+			self.entries[numQuery] = self.load(numQuery)
+			while len(self.entries) > self.size:
+				self.entries.popitem(last=False)
+		entry = self.entries[numQuery]
+		if not key in entry:
+			entry[key] = self.derive[key](numQuery)
+		return entry[key]
+	def clear(self):
+		"""
+		Forgets all entries.
+
+		:return: returns nothing
+		"""
+		self.entries.clear()
+
+class lazyQueryList(list):
+	"""
+	List (queries) of data read from a queryCache at access, for example times of a timer.
+	Position i is query i+1.
+	"""
+	def __init__(self, cache, numQueries, key, subkey=None):
+		list.__init__(self, [None]*numQueries)
+		self.cache = cache
+		self.key = key
+		self.subkey = subkey
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return [self[i] for i in range(*index.indices(len(self)))]
+		if index < 0:
+			index += len(self)
+		if index < 0 or index >= len(self):
+			raise IndexError('list index out of range')
+		data = self.cache.get(index+1, self.key)
+		return data if self.subkey is None else data[self.subkey]
+	def __iter__(self):
+		for i in range(len(self)):
+			yield self[i]
+
+class lazyQueryDict(dict):
+	"""
+	Dict (numbers of queries) of data read from a queryCache at access, for example histograms of a timer.
+	"""
+	def __init__(self, cache, numQueries, key, subkey=None):
+		dict.__init__(self)
+		self.cache = cache
+		self.numQueries = numQueries
+		self.key = key
+		self.subkey = subkey
+	def __contains__(self, numQuery):
+		return isinstance(numQuery, int) and numQuery >= 1 and numQuery <= self.numQueries
+	def __getitem__(self, numQuery):
+		if not numQuery in self:
+			raise KeyError(numQuery)
+		data = self.cache.get(numQuery, self.key)
+		return data if self.subkey is None else data[self.subkey]
+	def get(self, numQuery, default=None):
+		return self[numQuery] if numQuery in self else default
+	def __len__(self):
+		return self.numQueries
+	def __iter__(self):
+		return iter(range(1, self.numQueries+1))
+	def keys(self):
+		return list(range(1, self.numQueries+1))
+	def items(self):
+		return [(k, self[k]) for k in self.keys()]
+	def values(self):
+		return [self[k] for k in self.keys()]
+
+
+
+
 class query():
 	template = None
 	"""
@@ -361,6 +819,15 @@ class query():
 		self.numParallel = 1
 		self.warmup = 0
 		self.cooldown = 0
+		self.duration = 0
+		self.durationWarmup = 0
+		self.targetPrecision = 0
+		self.confidence = 0.95
+		self.precisionStatistic = 'mean'
+		self.numRunMax = 0
+		self.expectedInterval = None
+		self.prepared = False
+		self.statementTimeout = 0
 		self.active = True
 		self.title = ''
 		self.DBMS = {}
@@ -372,6 +839,8 @@ class query():
 		self.sorted = False
 		self.storeResultSet = False
 		self.storeResultSetFormat = []
+		self.fetchSize = 0
+		self.sample = 0
 		self.queryList = []
 		self.query = ""
 		self.withConnect = False
@@ -390,10 +859,29 @@ class query():
 			self.dictToObject(query.template)
 		if self.numRun == 0:
 			self.numRun = self.numRunStd
-		self.numRunBegin = self.warmup
-		self.numRunEnd = self.numRun-self.cooldown
+		if self.numRunMax == 0:
+			self.numRunMax = 10*self.numRun
+		if self.duration > 0 and len(self.queryList) == 0:
+			# number of runs is not known in advance, warmup is given in seconds and not part of the runs
+			self.warmup = 0
+			self.cooldown = 0
+			self.numRunBegin = 0
+			self.numRunEnd = None
+		else:
+			self.duration = 0
+			self.durationWarmup = 0
+			self.numRunBegin = self.warmup
+			self.numRunEnd = self.numRun-self.cooldown
+		if self.targetPrecision > 0:
+			# runs are repeated in rounds until target precision is reached, warmup only in first round
+			self.cooldown = 0
+			self.numRunEnd = None
+		if isinstance(self.query, list) or len(self.queryList) > 0:
+			# only a single statement can be prepared
+			self.prepared = False
 		self.timer['run'] = {'active': True}
 		self.timer['session'] = {'active': True}
+		self.timer['prepare'] = {'active': self.prepared}
 	def dictToObject(self, query):
 		if 'query' in query:
 			self.query = query['query']
@@ -407,8 +895,26 @@ class query():
 			self.warmup = int(query['numWarmup'])
 		if 'numCooldown' in query:
 			self.cooldown = int(query['numCooldown'])
+		if 'duration' in query:
+			self.duration = parseDuration(query['duration'])
+		if 'durationWarmup' in query:
+			self.durationWarmup = parseDuration(query['durationWarmup'])
 		if 'delay' in query:
 			self.delay_run = float(query['delay'])
+		if 'targetPrecision' in query:
+			self.targetPrecision = float(query['targetPrecision'])
+		if 'confidence' in query:
+			self.confidence = float(query['confidence'])
+		if 'precisionStatistic' in query:
+			self.precisionStatistic = query['precisionStatistic']
+		if 'numRunMax' in query:
+			self.numRunMax = int(query['numRunMax'])
+		if 'expectedInterval' in query:
+			self.expectedInterval = query['expectedInterval']
+		if 'prepared' in query:
+			self.prepared = query['prepared']
+		if 'statementTimeout' in query:
+			self.statementTimeout = parseDuration(query['statementTimeout'])
 		if 'title' in query:
 			self.title = query['title']
 		if 'DBMS' in query:
@@ -435,6 +941,10 @@ class query():
 			if 'sorted' in self.timer['datatransfer']:
 				self.sorted = self.timer['datatransfer']['sorted']
 				self.storeData = True
+			if 'fetchsize' in self.timer['datatransfer'] and self.timer['datatransfer']['fetchsize']:
+				self.fetchSize = int(self.timer['datatransfer']['fetchsize'])
+			if 'sample' in self.timer['datatransfer'] and self.timer['datatransfer']['sample']:
+				self.sample = int(self.timer['datatransfer']['sample'])
 			if 'store' in self.timer['datatransfer'] and not self.timer['datatransfer']['store'] == False:
 				self.storeResultSet = True
 				self.storeData = True
@@ -455,6 +965,20 @@ class query():
 
 
 
+def parseDuration(duration):
+	"""
+	Parses duration given as number of seconds or as string with unit s, m or h, for example 300s or 5m
+
+	:param duration: Duration as number or string
+	:return: returns duration in seconds
+	"""
+	if isinstance(duration, str):
+		duration = duration.strip()
+		units = {'s': 1.0, 'm': 60.0, 'h': 3600.0}
+		if len(duration) > 0 and duration[-1] in units:
+			return float(duration[:-1])*units[duration[-1]]
+	return float(duration)
+
 def formatDuration(ms):
 	"""
 	Formats duration given in ms to HH:ii:ss and using "," for 1000s
@@ -476,6 +1000,161 @@ def formatDuration(ms):
 
 
 
+def getArrivalOffsets(numRun, rate, process='constant'):
+	"""
+	Computes intended start times of runs for an open loop, i.e. runs arrive independently of finished runs.
+
+	:param numRun: Number of runs
+	:param rate: Arrival rate in runs per second
+	:param process: 'constant' for equidistant arrivals, 'poisson' for exponentially distributed interarrival times
+	:return: List of offsets in seconds, relative to start of first run
+	"""
+	if process == 'constant':
+		return [i/rate for i in range(numRun)]
+	elif process == 'poisson':
+		offsets = [0.0]
+		for i in range(1, numRun):
+			offsets.append(offsets[-1] + random.expovariate(rate))
+		return offsets
+	else:
+		raise ValueError('Unknown arrival process '+str(process))
+
+
+
+class fileRange():
+	"""
+	File-like object (binary) containing the lines of a file that start in a range of bytes.
+	Ranges of parallel readers cover the file, so each line is read by exactly one of them.
+	Lines are separated by newline, so fields must not contain line breaks.
+	"""
+	def __init__(self, filename, start, end):
+		"""
+		Construct a new 'fileRange' object.
+
+		:param filename: Name of the file
+		:param start: First byte of range
+		:param end: Byte after the range
+		:return: returns nothing
+		"""
+		self.file = open(filename, 'rb')
+		self.end = end
+		self.last = b'\n'
+		if start > 0:
+			# line starting before the range belongs to the previous range
+			self.file.seek(start-1)
+			self.file.readline()
+	def read(self, size=-1):
+		if self.file.tell() >= self.end:
+			# complete the line that has started inside of the range
+			data = self.file.readline() if self.last != b'\n' else b''
+		else:
+			n = self.end - self.file.tell()
+			data = self.file.read(n if size is None or size < 0 else min(size, n))
+		if len(data) > 0:
+			self.last = data[-1:]
+		return data
+	def close(self):
+		self.file.close()
+	def __enter__(self):
+		return self
+	def __exit__(self, *args):
+		self.close()
+	def __iter__(self):
+		# pandas treats objects having read() and __iter__ as file handles
+		return iter(self.read().splitlines(keepends=True))
+
+def readBatches(filename, batchSize, fileformat=None, columns=None, options={}, numPart=0, numParts=1):
+	"""
+	Reads rows of a local CSV or Parquet file in batches, without loading the complete file.
+	Missing values become None.
+	Parallel readers of the same file only parse their own share:
+	A CSV file is split into numParts ranges of bytes at line breaks, a Parquet file into its row groups (every numParts-th, starting at numPart).
+	Compressed CSV files and options skiprows, nrows, skipfooter cannot be split, then reader numPart takes every numParts-th batch.
+
+	:param filename: Name of the file
+	:param batchSize: Number of rows per batch
+	:param fileformat: 'csv' or 'parquet', default is taken from the extension of the file
+	:param columns: List of names of columns to keep (optional), for CSV without header these are the first columns
+	:param options: Dict of additional arguments for pandas.read_csv(), for example sep or header
+	:param numPart: Number of this reader
+	:param numParts: Number of parallel readers
+	:return: Generator of lists of rows (tuples)
+	"""
+	if fileformat is None:
+		fileformat = 'parquet' if filename.lower().endswith(('.parquet', '.pq')) else 'csv'
+	if fileformat == 'parquet':
+		try:
+			import pyarrow.parquet as pq
+		except ImportError:
+			raise ImportError('Reading Parquet file '+filename+' needs the package pyarrow (pip install dbmsbenchmarker[parquet])')
+		parquetfile = pq.ParquetFile(filename)
+		rowGroups = [i for i in range(parquetfile.num_row_groups) if i % numParts == numPart]
+		if len(rowGroups) == 0:
+			return
+		for batch in parquetfile.iter_batches(batch_size=batchSize, row_groups=rowGroups, columns=columns):
+			yield list(zip(*[column.to_pylist() for column in batch.columns]))
+	elif fileformat == 'csv':
+		kwargs = {'header': None}
+		kwargs.update(options)
+		if columns is not None and kwargs['header'] is None:
+			# for example trailing delimiter of TPC-H .tbl files
+			kwargs['usecols'] = range(len(columns))
+		bSplit = numParts > 1 and kwargs.get('compression', 'infer') in ['infer', None] and not filename.lower().endswith(('.gz', '.bz2', '.zip', '.xz', '.zst', '.tar')) and not any(k in kwargs for k in ['skiprows', 'nrows', 'skipfooter'])
+		if not bSplit:
+			for numBatch, df in enumerate(pd.read_csv(filename, chunksize=batchSize, **kwargs)):
+				if numBatch % numParts != numPart:
+					continue
+				if columns is not None and kwargs['header'] is not None:
+					df = df[columns]
+				df = df.astype(object).where(df.notna(), None)
+				yield [tuple(row) for row in df.values.tolist()]
+			return
+		bHeader = kwargs['header'] is not None
+		if bHeader and numPart > 0:
+			# header line is in the first range only
+			kwargs['names'] = list(pd.read_csv(filename, nrows=0, **kwargs).columns)
+			kwargs['header'] = None
+		size = os.path.getsize(filename)
+		with fileRange(filename, size*numPart//numParts, size*(numPart+1)//numParts) as f:
+			try:
+				reader = pd.read_csv(f, chunksize=batchSize, **kwargs)
+			except pd.errors.EmptyDataError:
+				# range does not contain the start of a line
+				return
+			for df in reader:
+				if columns is not None and bHeader:
+					df = df[columns]
+				df = df.astype(object).where(df.notna(), None)
+				yield [tuple(row) for row in df.values.tolist()]
+	else:
+		raise ValueError('Unknown file format '+str(fileformat))
+
+
+
+def startJVM(jars):
+	"""
+	Starts the JVM of the current process and loads the given JDBC jars once.
+	This mirrors what jaydebeapi does at the first connect, so later connections of this process reuse the running JVM.
+	Nothing happens if the JVM is already running or no jars are given.
+
+	:param jars: List of JDBC jar files
+	:return: True if the JVM is running afterwards
+	"""
+	import jpype
+	if jpype.isJVMStarted():
+		return True
+	if len(jars) == 0:
+		return False
+	import os
+	class_path = list(jars)
+	if os.environ.get('CLASSPATH'):
+		class_path.append(os.environ['CLASSPATH'])
+	args = ['-Djava.class.path=%s' % os.path.pathsep.join(class_path)]
+	jpype.startJVM(jpype.getDefaultJVMPath(), *args, ignoreUnrecognized=True, convertStrings=True)
+	return True
+
+
+
 class dbms():
 	"""
 	Container for storing queries.
@@ -487,6 +1166,8 @@ class dbms():
 	anonymizer = {}
 	deanonymizer = {}
 	dbmscolors = {}
+	# converters of JDBC result sets, initialized when first used (JVM is running)
+	jdbcConverters = None
 	def __init__(self, connectiondata, anonymous = False):
 		"""
 		Converts dict into object.
@@ -498,7 +1179,11 @@ class dbms():
 		self.connectiondata = connectiondata
 		self.connection = None
 		self.cursor = None
-		if not connectiondata['JDBC']['jar'] in dbms.jars:
+		# prepared statement running at the moment (JDBC), for cancelling
+		self.statement = None
+		# result set of the prepared statement (JDBC), fetched by fetchJDBC()
+		self.resultSet = None
+		if 'JDBC' in connectiondata and not connectiondata['JDBC']['jar'] in dbms.jars:
 			if isinstance(connectiondata['JDBC']['jar'], list):
 				# accept list of jars
 				dbms.jars.extend(connectiondata['JDBC']['jar'])
@@ -547,22 +1232,304 @@ class dbms():
 		colors = plt.rcParams['axes.prop_cycle'].by_key()['color']
 		if self.connectiondata['active']:
 			dbms.dbmscolors[self.name] = colors[len(dbms.dbmscolors) % len(plt.rcParams['axes.prop_cycle'].by_key()['color'])]
+	def getDriver(self):
+		"""
+		Returns the backend used to connect to the dbms.
+		This is 'JDBC' (jaydebeapi) or 'DBAPI' (a native Python DB-API 2.0 module).
+
+		:return: Name of the backend, None if there is no connection data
+		"""
+		for driver in dbms.drivers:
+			if driver in self.connectiondata:
+				return driver
+		return None
+	def getHost(self):
+		"""
+		Returns the host the dbms is running at.
+		This is given as 'host' in the connection data, otherwise it is taken from the JDBC url or the keyword arguments of the DB-API module.
+
+		:return: Name of the host, None if unknown
+		"""
+		if 'host' in self.connectiondata:
+			return self.connectiondata['host']
+		driver = self.getDriver()
+		if driver == 'JDBC':
+			match = re.search(r'//([^/:;?]+)', self.connectiondata['JDBC']['url'])
+			if match is not None:
+				return match.group(1)
+		elif driver == 'DBAPI':
+			return self.connectiondata['DBAPI'].get('kwargs', {}).get('host', None)
+		return None
+	def getDriverModule(self):
+		"""
+		Returns the Python module implementing the DB-API of the connection.
+
+		:return: Module, for example jaydebeapi or sqlite3
+		"""
+		if self.getDriver() == 'DBAPI':
+			return importlib.import_module(self.connectiondata['DBAPI']['module'])
+		else:
+			return jaydebeapi
 	def connect(self):
 		"""
 		Connects to one single dbms.
-		Currently only JDBC is supported.
+		This uses JDBC via jaydebeapi or a native Python DB-API module, depending on the connection data.
 
 		:return: returns nothing
 		"""
-		if 'JDBC' in self.connectiondata:
-			self.connection = jaydebeapi.connect(
-				self.connectiondata['JDBC']['driver'],
-				self.connectiondata['JDBC']['url'],
-				self.connectiondata['JDBC']['auth'],
-				dbms.jars,)
-			#self.connection.jconn.setAutoCommit(True)
-		else:
+		driver = self.getDriver()
+		if driver is None:
 			raise ValueError('No connection data for '+self.getName())
+		self.connection = dbms.drivers[driver](self.connectiondata[driver])
+	@staticmethod
+	def connectJDBC(connectiondata):
+		"""
+		Opens a connection via JDBC.
+
+		:param connectiondata: Dict containing driver, url, auth and jar
+		:return: DB-API connection
+		"""
+		connection = jaydebeapi.connect(
+			connectiondata['driver'],
+			connectiondata['url'],
+			connectiondata['auth'],
+			dbms.jars,)
+		#connection.jconn.setAutoCommit(True)
+		return connection
+	@staticmethod
+	def connectDBAPI(connectiondata):
+		"""
+		Opens a connection via a native Python DB-API 2.0 module, for example sqlite3, psycopg or pymysql.
+		The module's connect() is called with the given args and kwargs.
+
+		:param connectiondata: Dict containing module, args (optional) and kwargs (optional)
+		:return: DB-API connection
+		"""
+		module = importlib.import_module(connectiondata['module'])
+		args = connectiondata.get('args', [])
+		kwargs = connectiondata.get('kwargs', {})
+		return module.connect(*args, **kwargs)
+	def getParamstyle(self):
+		"""
+		Returns the style of bind parameters of the DB-API of the connection.
+		JDBC uses qmark. A native module can be overwritten by 'paramstyle' in the DBAPI connection data.
+
+		:return: One of qmark, numeric, named, format and pyformat
+		"""
+		if self.getDriver() == 'DBAPI':
+			return self.connectiondata['DBAPI'].get('paramstyle', self.getDriverModule().paramstyle)
+		else:
+			return 'qmark'
+	def prepareStatement(self, queryString):
+		"""
+		Prepares a statement containing bind parameters for current connection.
+		JDBC prepares at the DBMS. The DB-API has no explicit prepare, so here the statement string is kept and the driver reuses its parsed statement (for example the statement cache of sqlite3).
+
+		:param queryString: SQL query with bind parameters
+		:return: Prepared statement, to be used in executePrepared()
+		"""
+		if self.getDriver() == 'JDBC':
+			return self.connection.jconn.prepareStatement(queryString)
+		else:
+			return queryString
+	def executePrepared(self, statement, values):
+		"""
+		Executes a prepared statement with bound values for current connection and cursor.
+		The result can be fetched via fetchResult() as usual.
+		For JDBC the result set of the statement is kept and fetched by fetchJDBC(), not by the cursor.
+
+		:param statement: Prepared statement from prepareStatement()
+		:param values: List or dict of values of bind parameters
+		:return: returns nothing
+		"""
+		if self.cursor is None:
+			return
+		if self.getDriver() == 'JDBC':
+			self.closeResultSet()
+			self.statement = statement
+			for i, value in enumerate(values):
+				statement.setObject(i+1, value)
+			if statement.execute():
+				self.resultSet = statement.getResultSet()
+		else:
+			self.cursor.execute(statement, values)
+	@staticmethod
+	def getJDBCConverters():
+		"""
+		Returns functions converting a column of a JDBC result set into a Python value, per java.sql.Types constant.
+		Values are represented like jaydebeapi does, so results of prepared and other statements can be compared.
+
+		:return: Dict of type constant and function, gets result set and number of column
+		"""
+		if dbms.jdbcConverters is None:
+			import jpype
+			import datetime
+			Types = jpype.JClass('java.sql.Types')
+			def toPython(method):
+				def convert(rs, col):
+					value = rs.getObject(col)
+					if value is None or isinstance(value, (str, int, float, bool)):
+						return value
+					return getattr(value, method)()
+				return convert
+			def toDecimal(rs, col):
+				value = rs.getObject(col)
+				if value is None:
+					return None
+				if hasattr(value, 'scale'):
+					return value.longValue() if value.scale() == 0 else value.doubleValue()
+				return float(value)
+			def toTimestamp(rs, col):
+				value = rs.getTimestamp(col)
+				if value is None:
+					return None
+				d = datetime.datetime.strptime(str(value)[:19], "%Y-%m-%d %H:%M:%S")
+				return str(d.replace(microsecond=int(str(value.getNanos())[:6])))
+			def toString(getter, length=None):
+				def convert(rs, col):
+					value = getattr(rs, getter)(col)
+					if value is None:
+						return None
+					return str(value)[:length]
+				return convert
+			dbms.jdbcConverters = {
+				Types.TIMESTAMP: toTimestamp,
+				Types.TIME: toString('getTime'),
+				Types.DATE: toString('getDate', 10),
+				Types.BINARY: toString('getObject'),
+				Types.DECIMAL: toDecimal,
+				Types.NUMERIC: toDecimal,
+				Types.DOUBLE: toPython('doubleValue'),
+				Types.FLOAT: toPython('doubleValue'),
+				Types.TINYINT: toPython('intValue'),
+				Types.INTEGER: toPython('intValue'),
+				Types.SMALLINT: toPython('intValue'),
+				Types.BOOLEAN: toPython('booleanValue'),
+				Types.BIT: toPython('booleanValue'),
+			}
+		return dbms.jdbcConverters
+	def fetchJDBC(self, size=None):
+		"""
+		Fetches rows from the result set of the prepared statement (JDBC).
+
+		:param size: Maximum number of rows to fetch, None means all
+		:return: List of rows (tuples)
+		"""
+		converters = dbms.getJDBCConverters()
+		meta = self.resultSet.getMetaData()
+		columns = [(col, converters.get(meta.getColumnType(col), lambda rs, col: rs.getObject(col))) for col in range(1, meta.getColumnCount()+1)]
+		if size is not None:
+			self.resultSet.setFetchSize(size)
+		rows = []
+		while (size is None or len(rows) < size) and self.resultSet.next():
+			rows.append(tuple(convert(self.resultSet, col) for col, convert in columns))
+		return rows
+	def closeResultSet(self):
+		"""
+		Closes the result set of the prepared statement (JDBC), the statement stays open.
+
+		:return: returns nothing
+		"""
+		if self.resultSet is not None:
+			self.resultSet.close()
+			self.resultSet = None
+	def getColumnNames(self):
+		"""
+		Returns names of columns of the current result, upper case.
+
+		:return: List of names of columns
+		"""
+		if self.resultSet is not None:
+			meta = self.resultSet.getMetaData()
+			return [str(meta.getColumnName(col)).upper() for col in range(1, meta.getColumnCount()+1)]
+		return [i[0].upper() for i in self.cursor.description]
+	def executeMany(self, queryString, rows):
+		"""
+		Executes a statement containing bind parameters once per row for current connection and cursor.
+		jaydebeapi sends this as a JDBC batch.
+
+		:param queryString: SQL query with bind parameters
+		:param rows: List of rows of values
+		:return: returns nothing
+		"""
+		if self.cursor is not None:
+			self.cursor.executemany(queryString, rows)
+	def copyFrom(self, table, filename, options={}):
+		"""
+		Streams a CSV file into a table by the bulk API of the driver.
+		This is COPY FROM STDIN of PostgreSQL via psycopg (version 2 or 3).
+
+		:param table: Name of the table, optionally with list of columns
+		:param filename: Name of the CSV file
+		:param options: Dict of arguments of pandas.read_csv(), sep and header are used
+		:return: returns nothing
+		"""
+		queryString = "COPY {} FROM STDIN WITH (FORMAT csv, DELIMITER '{}', HEADER {})".format(table, options.get('sep', ','), 'false' if options.get('header', None) is None else 'true')
+		with open(filename, 'r') as f:
+			if hasattr(self.cursor, 'copy_expert'):
+				self.cursor.copy_expert(queryString, f)
+			elif hasattr(self.cursor, 'copy'):
+				with self.cursor.copy(queryString) as copy:
+					while True:
+						chunk = f.read(1 << 20)
+						if not chunk:
+							break
+						copy.write(chunk)
+			else:
+				raise ValueError('Driver of '+self.getName()+' does not support copy')
+	def commit(self):
+		"""
+		Commits the current transaction, if the connection is not in autocommit mode.
+
+		:return: returns nothing
+		"""
+		if self.connection is None:
+			return
+		if self.getDriver() == 'JDBC' and self.connection.jconn.getAutoCommit():
+			return
+		self.connection.commit()
+	def rollback(self):
+		"""
+		Rolls back the current transaction, if the connection is not in autocommit mode.
+		This is needed after a cancelled statement, for example.
+
+		:return: returns nothing
+		"""
+		if self.connection is None:
+			return
+		if self.getDriver() == 'JDBC' and self.connection.jconn.getAutoCommit():
+			return
+		self.connection.rollback()
+	def cancelQuery(self):
+		"""
+		Cancels the statement running at current connection.
+		This is called from another thread (statement timeout).
+		JDBC cancels the running java statement, DB-API uses cancel() of the connection (psycopg) or interrupt() (sqlite3).
+
+		:return: True if the driver has been asked to cancel, False if there is no way to cancel
+		"""
+		if self.connection is None:
+			return False
+		if self.getDriver() == 'JDBC':
+			statement = self.statement if self.statement is not None else getattr(self.cursor, '_prep', None)
+			if statement is None:
+				return False
+			statement.cancel()
+			return True
+		for method in ['cancel', 'interrupt']:
+			if hasattr(self.connection, method):
+				getattr(self.connection, method)()
+				return True
+		return False
+	def closeStatement(self, statement):
+		"""
+		Closes a prepared statement.
+
+		:param statement: Prepared statement from prepareStatement()
+		:return: returns nothing
+		"""
+		if self.getDriver() == 'JDBC' and statement is not None:
+			statement.close()
 	def openCursor(self):
 		"""
 		Opens cursor for current connection.
@@ -577,6 +1544,8 @@ class dbms():
 
 		:return: returns nothing
 		"""
+		self.closeResultSet()
+		self.statement = None
 		if self.cursor is not None:
 			self.cursor.close()
 			self.cursor = None
@@ -596,10 +1565,25 @@ class dbms():
 		:param queryString: SQL query to be executed
 		:return: returns nothing
 		"""
-		if self.cursor is not None:
+		if self.resultSet is not None:
+			return self.fetchJDBC()
+		elif self.cursor is not None:
 			return self.cursor.fetchall()
 		else:
 			return []
+	def fetchResultChunk(self, size):
+		"""
+		Fetches next chunk of result from current cursor.
+
+		:param size: Maximum number of rows to fetch
+		:return: List of rows, empty if result has been fetched completely
+		"""
+		if self.resultSet is not None:
+			return self.fetchJDBC(size)
+		elif self.cursor is not None:
+			return self.cursor.fetchmany(size)
+		else:
+			return []
 	def disconnect(self):
 		"""
 		Disconnects from one single dbms.
@@ -626,6 +1610,179 @@ class dbms():
 		return self.connection is not None and self.cursor is not None
 
 
+# backends for connecting to a dbms
+dbms.drivers = {'JDBC': dbms.connectJDBC, 'DBAPI': dbms.connectDBAPI}
+
+
+class resultset():
+	"""
+	Reduces a result set chunk by chunk while it is fetched from a cursor.
+	Cells are trimmed strings, floats can be rounded to a given precision.
+	Rows are only kept if they are needed at the end, i.e. for comparing complete result sets, for sorting or for storing a dataframe.
+	Otherwise only size and hash are updated and the chunk is forgotten.
+	The multiset hash is the sum of the hashes of all rows, so it does not depend on the order of rows and needs no sorting.
+	"""
+	# multiset hash is computed modulo 2^224, i.e. it has the size of a sha224 digest
+	multisetModulus = 2**224
+	def __init__(self, query, columnnames, filename=None):
+		"""
+		Prepares reduction of a result set.
+
+		:param query: Query object
+		:param columnnames: List of column names
+		:param filename: Path and name of result set file without extension, if it should be stored
+		:return: returns nothing
+		"""
+		self.query = query
+		self.columnnames = columnnames
+		self.filename = filename
+		self.formats = query.storeResultSetFormat if filename is not None else []
+		self.keep = query.result == 'result' or (query.sorted and query.result == 'hash') or 'dataframe' in self.formats or 'npz' in self.formats or (query.sorted and 'csv' in self.formats)
+		self.data = []
+		self.sample = []
+		self.numRows = 0
+		self.size = 0
+		self.hasher = hashlib.sha224()
+		self.multiset = 0
+		# digest of result set in result store of the result folder
+		self.digest = None
+		self.file = None
+		self.writer = None
+		if 'csv' in self.formats and not query.sorted:
+			# csv file can be written while fetching
+			self.file = open(self.filename+".csv", "w", newline='')
+			self.writer = csv.writer(self.file)
+			self.writer.writerow(self.columnnames)
+	def normalize(self, rows):
+		"""
+		Converts rows to lists of trimmed strings.
+		Floats are rounded if a precision is given.
+
+		:param rows: List of rows as fetched from cursor
+		:return: List of normalized rows
+		"""
+		rows = [[str(item).strip() for item in row] for row in rows]
+		if self.query.restrict_precision is not None:
+			rows = [[round(float(item), int(self.query.restrict_precision)) if convertToFloat(item) == float else item for item in row] for row in rows]
+		return rows
+	def addChunk(self, rows):
+		"""
+		Adds a chunk of rows to the result set.
+
+		:param rows: List of rows as fetched from cursor
+		:return: returns nothing
+		"""
+		rows = self.normalize(rows)
+		self.numRows += len(rows)
+		# same as memory usage of a DataFrame without index, i.e. 8 bytes per cell
+		self.size += 8*sum([len(row) for row in rows])
+		if self.writer is not None:
+			self.writer.writerows(rows)
+		if len(self.sample) < self.query.sample:
+			self.sample.extend(rows[:self.query.sample-len(self.sample)])
+		if self.keep:
+			self.data.extend(rows)
+		elif self.query.result == 'hash':
+			self.updateHash(rows)
+		if self.query.result == 'multiset':
+			self.updateMultiset(rows)
+	def updateHash(self, rows):
+		"""
+		Updates hash value of result set row by row, so it does not depend on the size of chunks.
+
+		:param rows: List of normalized rows
+		:return: returns nothing
+		"""
+		for row in rows:
+			self.hasher.update(repr(row).encode())
+	def updateMultiset(self, rows):
+		"""
+		Updates multiset hash of result set.
+		Hashes of rows are added, which is commutative, so equal rows in any order yield the same hash.
+		Duplicate rows are counted.
+
+		:param rows: List of normalized rows
+		:return: returns nothing
+		"""
+		for row in rows:
+			self.multiset += int.from_bytes(hashlib.sha224(repr(row).encode()).digest(), 'big')
+	def finish(self):
+		"""
+		Finishes reduction after the last chunk.
+		Sorts the kept rows and stores the result set files, if wished.
+		Format npz stores the result set in the content-addressed result store instead of a file per connection.
+
+		:return: returns nothing
+		"""
+		self.size += int(pd.RangeIndex(self.numRows).memory_usage())
+		if self.file is not None:
+			self.file.close()
+			self.file = None
+			self.writer = None
+		if self.query.sorted and len(self.data) > 0:
+			self.data = sorted(self.data, key=itemgetter(*list(range(0,len(self.data[0])))))
+			self.sample = self.data[:self.query.sample]
+		if self.keep and self.query.result == 'hash':
+			self.updateHash(self.data)
+		if 'dataframe' in self.formats:
+			f = open(self.filename+".pickle", "wb")
+			pickle.dump(self.toDataFrame(), f)
+			f.close()
+		if 'csv' in self.formats and self.query.sorted:
+			self.toDataFrame().to_csv(self.filename+".csv", index_label=False, index=False)
+		if 'npz' in self.formats:
+			self.digest = writeResultBlob(os.path.dirname(self.filename), [self.columnnames] + self.data)
+	def toDataFrame(self):
+		"""
+		Returns kept rows as a DataFrame.
+
+		:return: DataFrame of result set
+		"""
+		df = pd.DataFrame.from_records(self.data)
+		if not df.empty:
+			df.columns = self.columnnames
+		return df
+	def getHash(self):
+		"""
+		Returns hash value of result set.
+
+		:return: Hex digest
+		"""
+		return self.hasher.hexdigest()
+	def getMultisetHash(self):
+		"""
+		Returns order-insensitive hash value of result set.
+
+		:return: Hex digest
+		"""
+		return format(self.multiset % resultset.multisetModulus, '056x')
+	def getData(self):
+		"""
+		Returns reduced result set for comparison.
+		This is a list of rows, the first one containing column names.
+
+		:return: List of rows
+		"""
+		if self.query.result == 'hash':
+			return [['hash'], [self.getHash()]]
+		elif self.query.result == 'size':
+			return [['size'], [self.size]]
+		elif self.query.result == 'multiset':
+			return [['multiset', 'rows'], [self.getMultisetHash(), self.numRows]]
+		else:
+			return [self.columnnames] + self.data
+	def getSample(self):
+		"""
+		Returns the first rows of the result set (after sorting, if kept), the first one containing column names.
+
+		:return: List of rows, empty if no sample is wished
+		"""
+		if self.query.sample > 0:
+			return [self.columnnames] + self.sample
+		else:
+			return []
+
+
 class dataframehelper():
 	"""
 	Class for some handy DataFrame manipulations
@@ -1131,6 +2288,34 @@ class dataframehelper():
 		#print(df)
 		return df
 	@staticmethod
+	def evaluateLatencyPercentilesToDataFrame(evaluation, percentile='p99'):
+		"""
+		Returns a percentile of latency (in ms) per query and connection, uncorrected and corrected for coordinated omission side by side.
+		Rows are 'Qn' and 'Qn corrected', columns are connections.
+
+		:param evaluation: Evaluation dict
+		:param percentile: Name of percentile, one of p50, p90, p95, p99 and p99.9
+		:return: DataFrame of percentiles
+		"""
+		factors = {}
+		rows = []
+		for i,q in evaluation['query'].items():
+			if q['config'].get('active', True):
+				rows.append('Q'+str(i))
+				rows.append('Q'+str(i)+' corrected')
+				for c,d in q['dbms'].items():
+					if c in evaluation['dbms']:
+						if not c in factors:
+							factors[c] = {}
+						if 'latency' in d and d['latency'] is not None:
+							factors[c]['Q'+str(i)] = d['latency']['uncorrected'][percentile]
+							if d['latency']['corrected'] is not None:
+								factors[c]['Q'+str(i)+' corrected'] = d['latency']['corrected'][percentile]
+		df = pd.DataFrame(factors, index=rows)
+		df.columns = df.columns.map(dbms.anonymizer)
+		df = df.reindex(sorted(df.columns), axis=1)
+		return df
+	@staticmethod
 	def evaluateQueuesizeToDataFrame(evaluation):
 		factors = {}
 		rows = []
@@ -1404,6 +2589,361 @@ def joinDicts(d1, d2):
 			result[k] = d2[k]
 	return result
 
+def joinProtocols(protocol, partial):
+	"""
+	Joins a partial protocol (for example of some connections) into a protocol.
+	Entries per query and per connection are joined, values of the partial protocol win.
+
+	:param protocol: Protocol, dict format
+	:param partial: Partial protocol, dict format
+	:return: returns joined protocol
+	"""
+	protocol = protocol.copy()
+	protocol['query'] = protocol.get('query', {}).copy()
+	for k,v in partial['query'].items():
+		if isinstance(v, dict):
+			protocol['query'][k] = joinDicts(protocol['query'].get(k, {}), v)
+	# ingest phase, throughput test and query mix per connection
+	for key in ['ingest', 'streams', 'mix']:
+		if key in partial:
+			protocol[key] = joinDicts(protocol.get(key, {}), partial[key])
+	for key in ['streamPermutations', 'mixSequence']:
+		if key in partial:
+			protocol[key] = partial[key]
+	return protocol
+
+def writeJSON(filename, data):
+	"""
+	Writes data as JSON file atomically, i.e. readers see either the old or the new file.
+
+	:param filename: Name of JSON file
+	:param data: JSON serializable data
+	:return: returns nothing
+	"""
+	filename_tmp = filename+'.tmp'
+	with open(filename_tmp, 'w') as f:
+		json.dump(data, f)
+	os.replace(filename_tmp, filename)
+
+def resultDigest(data):
+	"""
+	Computes the canonical digest of a result set (list of rows, the first one containing column names).
+	Equal result sets have equal digests, no matter which connection or run they have been received from.
+
+	:param data: List of lists
+	:return: Hex string of SHA-256
+	"""
+	return hashlib.sha256(json.dumps(data, default=str).encode()).hexdigest()
+
+def writeResultBlob(folder, data):
+	"""
+	Stores a result set in the content-addressed result store of a result folder (subfolder resultsets).
+	The file is named by the digest of the result set, so equal result sets are stored only once.
+	It is a compressed NumPy container with one array per column.
+	Columns of floats, ints or strings are stored typed, other columns (e.g. mixed) as JSON per cell.
+
+	:param folder: Result folder
+	:param data: List of rows, the first one containing column names
+	:return: Digest of result set, this is the name of the file
+	"""
+	digest = resultDigest(data)
+	filename = folder+'/resultsets/'+digest+'.npz'
+	if os.path.isfile(filename):
+		return digest
+	arrays = {}
+	if len(data) > 0 and len(data[0]) > 0 and all([len(row) == len(data[0]) for row in data[1:]]):
+		arrays['header'] = np.array(json.dumps(data[0], default=str))
+		kinds = ''
+		for i in range(len(data[0])):
+			column = [row[i] for row in data[1:]]
+			types = set([type(x) for x in column])
+			try:
+				if types <= {float}:
+					arrays['column_'+str(i)] = np.array(column, dtype='float64')
+					kinds += 'f'
+					continue
+				if types == {int}:
+					arrays['column_'+str(i)] = np.array(column, dtype='int64')
+					kinds += 'i'
+					continue
+			except OverflowError as e:
+				pass
+			if types == {str}:
+				arrays['column_'+str(i)] = np.array(column, dtype=str)
+				kinds += 's'
+			else:
+				arrays['column_'+str(i)] = np.array([json.dumps(x, default=str) for x in column], dtype=str)
+				kinds += 'j'
+		arrays['kinds'] = np.array(kinds)
+	else:
+		# not tabular, e.g. no columns or rows of different lengths
+		arrays['json'] = np.array(json.dumps(data, default=str))
+	os.makedirs(folder+'/resultsets', exist_ok=True)
+	# write to temporary file first, concurrent writers of the same result set do not disturb each other
+	filename_tmp = filename+'.'+str(os.getpid())+'.tmp.npz'
+	np.savez_compressed(filename_tmp, **arrays)
+	os.replace(filename_tmp, filename)
+	return digest
+
+def readResultBlob(folder, digest):
+	"""
+	Reads a result set from the content-addressed result store of a result folder.
+
+	:param folder: Result folder
+	:param digest: Digest of result set, as returned by writeResultBlob()
+	:return: List of rows, the first one containing column names
+	"""
+	with np.load(folder+'/resultsets/'+digest+'.npz', allow_pickle=False) as blob:
+		if 'json' in blob.files:
+			return json.loads(str(blob['json']))
+		header = json.loads(str(blob['header']))
+		columns = []
+		for i, kind in enumerate(str(blob['kinds'])):
+			column = blob['column_'+str(i)].tolist()
+			if kind == 'j':
+				column = [json.loads(x) for x in column]
+			columns.append(column)
+	return [header] + [list(row) for row in zip(*columns)]
+
+class resultSetList(list):
+	"""
+	List of result sets (one per run) of a protocol shard.
+	Result sets that are in the result store are references {'resultset': digest} until they are accessed.
+	"""
+	def __init__(self, folder, items):
+		list.__init__(self, items)
+		self.folder = folder
+		self.cache = {}
+	@staticmethod
+	def isReference(item):
+		return isinstance(item, dict) and 'resultset' in item
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return [self[i] for i in range(*index.indices(len(self)))]
+		item = list.__getitem__(self, index)
+		if resultSetList.isReference(item):
+			digest = item['resultset']
+			if not digest in self.cache:
+				self.cache[digest] = readResultBlob(self.folder, digest)
+			return self.cache[digest]
+		return item
+	def __iter__(self):
+		for i in range(len(self)):
+			yield self[i]
+	def getDigest(self, index):
+		"""
+		Returns digest of a result set without reading it from the result store.
+
+		:param index: Number of run
+		:return: Digest of result set
+		"""
+		item = list.__getitem__(self, index)
+		if item is None:
+			# placeholder of cancelled run
+			return None
+		if resultSetList.isReference(item):
+			return item['resultset']
+		return resultDigest(item)
+
+def isEqualResultSet(resultsets, index, data):
+	"""
+	Compares a result set with the one at a given position of a list of result sets.
+	Result sets that have not been read from the result store are compared by digest.
+
+	:param resultsets: List of result sets, for example dataStorage of a protocol
+	:param index: Position in list
+	:param data: Result set to compare
+	:return: True if equal, or if one of them is a placeholder (None) of a cancelled run
+	"""
+	if data is None or list.__getitem__(resultsets, index) is None:
+		return True
+	if isinstance(resultsets, resultSetList) and resultSetList.isReference(list.__getitem__(resultsets, index)):
+		return resultsets.getDigest(index) == resultDigest(data)
+	return resultsets[index] == data
+
+def writeProtocolShard(folder, numQuery, shard):
+	"""
+	Writes the protocol of a query to its own file protocol_query_N.json.
+	Result sets (dataStorage and resultSets) are moved to the result store, the shard only contains references {'resultset': digest}.
+
+	:param folder: Result folder
+	:param numQuery: Number of query
+	:param shard: Protocol of query, dict format
+	:return: returns nothing
+	"""
+	def toReferences(resultsets):
+		references = []
+		for i in range(len(resultsets)):
+			item = list.__getitem__(resultsets, i)
+			if item is None:
+				# placeholder of cancelled run
+				references.append(None)
+			elif resultSetList.isReference(item) and getattr(resultsets, 'folder', None) == folder:
+				# already in result store of this folder
+				references.append(item)
+			else:
+				references.append({'resultset': writeResultBlob(folder, resultsets[i])})
+		return references
+	shard = shard.copy()
+	shard['dataStorage'] = toReferences(shard.get('dataStorage', []))
+	shard['resultSets'] = {c: toReferences(l) for c,l in shard.get('resultSets', {}).items()}
+	writeJSON(folder+'/protocol_query_'+str(numQuery)+'.json', shard)
+
+def readProtocolShard(folder, numQuery):
+	"""
+	Reads the protocol of a query from its own file.
+	References to the result store are resolved at first access.
+
+	:param folder: Result folder
+	:param numQuery: Number of query
+	:return: Protocol of query, dict format
+	"""
+	with open(folder+'/protocol_query_'+str(numQuery)+'.json', 'r') as f:
+		shard = json.load(f)
+	shard['dataStorage'] = resultSetList(folder, shard.get('dataStorage', []))
+	shard['resultSets'] = {c: resultSetList(folder, l) for c,l in shard.get('resultSets', {}).items()}
+	return shard
+
+class protocolShards(dict):
+	"""
+	Dict of protocols per query.
+	Each is read from its shard at first access.
+	"""
+	def __init__(self, folder, keys):
+		dict.__init__(self, {k: None for k in keys})
+		self.folder = folder
+	def __getitem__(self, key):
+		value = dict.__getitem__(self, key)
+		if value is None:
+			value = readProtocolShard(self.folder, key)
+			dict.__setitem__(self, key, value)
+		return value
+	def isLoaded(self, key):
+		return dict.__getitem__(self, key) is not None
+	def get(self, key, default=None):
+		return self[key] if key in self else default
+	def items(self):
+		return [(k, self[k]) for k in self.keys()]
+	def values(self):
+		return [self[k] for k in self.keys()]
+	def copy(self):
+		return dict(self.items())
+
+def writeProtocolFolder(folder, protocol, numQueries=None):
+	"""
+	Writes a protocol split into a small header (protocol.json) and shards per query.
+	Shards that have not been read (lazily) are not written again.
+
+	:param folder: Result folder
+	:param protocol: Protocol, dict format
+	:param numQueries: List of numbers of queries to write shards of, None means all
+	:return: returns nothing
+	"""
+	queries = protocol.get('query', {})
+	for k in queries.keys():
+		if numQueries is not None and not k in numQueries:
+			continue
+		if isinstance(queries, protocolShards) and not queries.isLoaded(k):
+			continue
+		writeProtocolShard(folder, k, queries[k])
+	header = {k: v for k,v in protocol.items() if k != 'query'}
+	header['queryShards'] = list(queries.keys())
+	writeJSON(folder+'/protocol.json', header)
+
+def readProtocolFolder(folder, lazy=True):
+	"""
+	Reads a protocol, either split into header and shards per query or as a single file (older result folders).
+
+	:param folder: Result folder
+	:param lazy: Read shards at first access
+	:return: Protocol, dict format
+	"""
+	with open(folder+'/protocol.json', 'r') as f:
+		protocol = json.load(f)
+	if 'queryShards' in protocol:
+		protocol['query'] = protocolShards(folder, protocol.pop('queryShards'))
+		if not lazy:
+			protocol['query'] = protocol['query'].copy()
+	return protocol
+
+class evaluationShards(dict):
+	"""
+	Dict of evaluations per query (read only).
+	Each is read from evaluation_query_N.json at access.
+	If size is given, only the size most recently used are kept in memory.
+	"""
+	def __init__(self, folder, keys, size=None):
+		dict.__init__(self, {k: None for k in keys})
+		self.folder = folder
+		self.size = size
+		self.loaded = OrderedDict()
+	def __getitem__(self, key):
+		if not dict.__contains__(self, key):
+			raise KeyError(key)
+		if key in self.loaded:
+			self.loaded.move_to_end(key)
+		else:
+			with open(self.folder+'/evaluation_query_'+str(key)+'.json', 'r') as f:
+				self.loaded[key] = json.load(f)
+			if self.size is not None:
+				while len(self.loaded) > self.size:
+					self.loaded.popitem(last=False)
+		return self.loaded[key]
+	def get(self, key, default=None):
+		return self[key] if key in self else default
+	def items(self):
+		return [(k, self[k]) for k in self.keys()]
+	def values(self):
+		return [self[k] for k in self.keys()]
+	def copy(self):
+		return dict(self.items())
+
+def saveMeasurements(filename, measurements):
+	"""
+	Saves measured times of a query as NumPy container (npz).
+	There is one float array per timer and connection, named timer/connection.
+	Connections may have different numbers of runs, so there is no padding.
+
+	:param filename: Filename of npz file
+	:param measurements: Dict (timers) of dicts (connections) of lists (runs)
+	:return: returns nothing
+	"""
+	arrays = {}
+	for timername, times in measurements.items():
+		for c, l in times.items():
+			arrays[timername+'/'+c] = np.asarray(l, dtype='float64')
+	# write to temporary file first, readers never see an incomplete container
+	filename_tmp = filename+'.tmp.npz'
+	np.savez(filename_tmp, **arrays)
+	os.replace(filename_tmp, filename)
+
+def loadMeasurements(filename, timers=None, connections=None):
+	"""
+	Loads measured times of a query from NumPy container (npz).
+	Only the arrays of the given timers and connections are read.
+
+	:param filename: Filename of npz file
+	:param timers: List of names of timers, None means all
+	:param connections: List of names of connections, None means all
+	:return: Dict (timers) of dicts (connections) of lists (runs)
+	"""
+	measurements = {}
+	if not os.path.isfile(filename):
+		logging.debug(filename + " not found")
+		return measurements
+	with np.load(filename, allow_pickle=False) as data:
+		for key in data.files:
+			timername, c = key.split('/', 1)
+			if timers is not None and not timername in timers:
+				continue
+			if connections is not None and not c in connections:
+				continue
+			if not timername in measurements:
+				measurements[timername] = {}
+			measurements[timername][c] = data[key].tolist()
+	logging.debug("Read "+filename)
+	return measurements
+
 def anonymize_dbms(dbms_names):
     if type(dbms_names) == list:
         return anonymize_list(dbms_names)
@@ -1446,7 +2986,7 @@ def merge_partial_results(result_path, code):
 	# result folder
 	folder = result_path+code
 	# connection subfolders 
-	list_connections = [f for f in listdir(folder) if isdir(join(folder, f))]
+	list_connections = [f for f in listdir(folder) if isdir(join(folder, f)) and isfile(join(folder, f, 'protocol.json'))]
 	def joinDicts(d1, d2):
 		result = d1.copy()
 		for k, v in d2.items():
@@ -1459,26 +2999,41 @@ def merge_partial_results(result_path, code):
 	# load partial protocols
 	protocols = []
 	for connection in list_connections:
-		filename = '{folder}/{connection}/protocol.json'.format(folder=folder, connection=connection)
-		with open(filename, 'r') as f:
-			protocols.append(json.load(f))
+		protocols.append(readProtocolFolder('{folder}/{connection}'.format(folder=folder, connection=connection), lazy=False))
 	# merged protocol
 	protocol = {}
 	protocol['query'] = {}
 	protocol['connection'] = {}
-	for k,v in protocols[0]['query'].items():
-		if isinstance(v, dict):
-			protocol['query'][k] = {}
-			for p in protocols:
-				protocol['query'][k] = joinDicts(protocol['query'][k], p['query'][k])
-	filename_protocol = '{folder}/protocol.json'.format(folder=folder)
-	with open(filename_protocol, 'w') as f:
-		json.dump(protocol, f)
+	for p in protocols:
+		protocol = joinProtocols(protocol, p)
+	writeProtocolFolder(folder, protocol)
 	# compare result sets
 	for numQuery, query in protocol['query'].items():
 		#print(query)
 		df_first = None
+		digest_first = None
 		for connection in list_connections:
+			digest = query.get('resultDigests', {}).get(connection, None)
+			if digest is not None:
+				# result set is in result store of subfolder, compare digests
+				subfolder = '{folder}/{connection}'.format(folder=folder, connection=connection)
+				if not isfile(folder+'/resultsets/'+digest+'.npz'):
+					os.makedirs(folder+'/resultsets', exist_ok=True)
+					copyfile(subfolder+'/resultsets/'+digest+'.npz', folder+'/resultsets/'+digest+'.npz')
+				print(connection+": ", end='')
+				if digest_first is None:
+					digest_first = digest
+					print("first")
+					protocol['query'][numQuery]['warnings'][connection] = ""
+				elif digest != digest_first:
+					print("different")
+					protocol['query'][numQuery]['warnings'][connection] = 'Different'
+					protocol['query'][numQuery]['resultSets'][connection] = [readResultBlob(folder, digest)]
+				else:
+					print("OK")
+					protocol['query'][numQuery]['resultSets'][connection] = []
+					protocol['query'][numQuery]['warnings'][connection] = ""
+				continue
 			try:
 				filename = '{folder}/{connection}/query_{numQuery}_resultset_{connection}.pickle'.format(folder=folder, connection=connection, numQuery=numQuery)
 				print(connection+": ", end='')#, df)
@@ -1511,35 +3066,84 @@ def merge_partial_results(result_path, code):
 				protocol['query'][numQuery]['warnings'][connection] = 'Missing'
 			finally:
 				pass
-	with open(filename_protocol, 'w') as f:
-		json.dump(protocol, f)
+	writeProtocolFolder(folder, protocol)
 	# merge timers
 	# load partial timers, join and save
-	timer = ['connection', 'execution', 'datatransfer']
+	timer = ['connection', 'execution', 'datatransfer', 'prepare']
 	numQuery = 1
 	for numQuery, query in protocols[0]['query'].items():
+		measurements = {}
 		for t in timer:
 			connection = list_connections[0]
 			d = {}
+			bCSV = False
 			for connection in list_connections:
 				# load execution benchmarks
+				filename_npz = '{folder}/{connection}/query_{numQuery}_measurements.npz'.format(folder=folder, connection=connection, numQuery=numQuery)
 				filename = '{folder}/{connection}/query_{numQuery}_{timer}.csv'.format(folder=folder, connection=connection, numQuery=numQuery, timer=t)
 				if isfile(filename):
+					bCSV = True
+				if isfile(filename_npz):
+					d1 = loadMeasurements(filename_npz, timers=[t]).get(t, {})
+				elif isfile(filename):
 					df1 = pd.read_csv(filename)
 					df1_t = df1.transpose()
 					d1 = df1.to_dict(orient="list")
+					# columns are padded with NaN, if number of runs differs per connection (duration mode)
+					# other NaN are cancelled runs and are kept, the NumPy container does not need this
+					for k, v in d1.items():
+						while len(v) > 0 and v[-1] != v[-1]:
+							v.pop()
 				else:
 					continue
 				d = joinDicts(d,d1)
 			if len(d) > 0:
-				df = pd.DataFrame(d)
+				measurements[t] = d
+			# csv is only written if partial results contain csv
+			if len(d) > 0 and bCSV:
+				# number of runs may differ per connection (duration mode)
+				df = pd.DataFrame({k: pd.Series(v, dtype='float64') for k,v in d.items()})
 				# convert to csv
-				csv = df.to_csv(index_label=False,index=False,line_terminator='\n')
+				csv = df.to_csv(index_label=False,index=False)
 				# save
 				filename = '{folder}/query_{numQuery}_{timer}.csv'.format(folder=folder, numQuery=numQuery, timer=t)
 				csv_file = open(filename, "w")
 				csv_file.write(csv)
 				csv_file.close()
+		if len(measurements) > 0:
+			filename = '{folder}/query_{numQuery}_measurements.npz'.format(folder=folder, numQuery=numQuery)
+			saveMeasurements(filename, measurements)
+	# merge histograms
+	# histograms of the same timer and connection are added
+	for numQuery, query in protocols[0]['query'].items():
+		histograms = {}
+		for connection in list_connections:
+			filename = '{folder}/{connection}/query_{numQuery}_histograms.json'.format(folder=folder, connection=connection, numQuery=numQuery)
+			if isfile(filename):
+				with open(filename, 'r') as f:
+					for name, hists in json.load(f).items():
+						if not name in histograms:
+							histograms[name] = {}
+						for c, h in hists.items():
+							if c in histograms[name]:
+								histograms[name][c].merge(histogram.fromDict(h))
+							else:
+								histograms[name][c] = histogram.fromDict(h)
+		if len(histograms) > 0:
+			filename = '{folder}/query_{numQuery}_histograms.json'.format(folder=folder, numQuery=numQuery)
+			with open(filename, 'w') as f:
+				json.dump({name: {c: h.toDict() for c,h in hists.items()} for name,hists in histograms.items()}, f)
+	# merge timeseries
+	# partial files contain one row per run, so they are concatenated
+	for numQuery, query in protocols[0]['query'].items():
+		dfs = []
+		for connection in list_connections:
+			filename = '{folder}/{connection}/query_{numQuery}_timeseries.csv'.format(folder=folder, connection=connection, numQuery=numQuery)
+			if isfile(filename):
+				dfs.append(pd.read_csv(filename))
+		if len(dfs) > 0:
+			filename = '{folder}/query_{numQuery}_timeseries.csv'.format(folder=folder, numQuery=numQuery)
+			pd.concat(dfs).to_csv(filename, index_label=False, index=False)
 	# merge metrics
 	# copy partial metrics
 	for connection in list_connections:
@@ -0,0 +1,80 @@
+"""
+    Command line interface for distributed benchmarks of the Python Package DBMS Benchmarker
+    Copyright (C) 2020  Patrick Erdelt
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Affero General Public License as
+    published by the Free Software Foundation, either version 3 of the
+    License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Affero General Public License for more details.
+
+    You should have received a copy of the GNU Affero General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import logging
+import argparse
+
+from dbmsbenchmarker import *
+
+
+if __name__ == '__main__':
+	# argparse
+	parser = argparse.ArgumentParser(description='Runs benchmarks distributed to agents. The coordinator sends units of work to agents and merges the measurements they send back into its result folder.')
+	parser.add_argument('mode', help='coordinate agents and merge results, or run benchmarks as an agent', choices=['coordinator','agent'])
+	parser.add_argument('-d', '--debug', help='dump debug informations', action='store_true')
+	parser.add_argument('-b', '--batch', help='batch mode (more protocol-like output), automatically on for debug mode', action='store_true')
+	parser.add_argument('-H', '--host', help='host the coordinator listens at, or agents connect to', default='localhost')
+	parser.add_argument('-P', '--port', help='port the coordinator listens at, or agents connect to', default=6000)
+	parser.add_argument('-k', '--authkey', help='shared secret of coordinator and agents', default='dbmsbenchmarker')
+	parser.add_argument('-f', '--config-folder', help='coordinator: folder containing query and connection config files. If set, the names connections.config and queries.config are assumed automatically.', default=None)
+	parser.add_argument('-qf', '--query-file', help='coordinator: name of query config file', default='queries.config')
+	parser.add_argument('-cf', '--connection-file', help='coordinator: name of connection config file', default='connections.config')
+	parser.add_argument('-r', '--result-folder', help='folder for storing benchmark result files, default is given by timestamp', default=None)
+	parser.add_argument('-q', '--query', help='coordinator: number of query to benchmark', default=None)
+	parser.add_argument('-c', '--connection', help='coordinator: name of connection to benchmark', default=None)
+	parser.add_argument('-n', '--num-agents', help='coordinator: number of agents to wait for', default=1)
+	parser.add_argument('-sp', '--split', help='coordinator: a unit of work is a connection or a pair of connection and query', default='connection', choices=['connection','query'])
+	parser.add_argument('-sb', '--start-barrier', help='coordinator: all agents of a round of units start benchmarking at the same instant', action='store_true', default=False)
+	parser.add_argument('-e', '--generate-evaluation', help='coordinator: generate new evaluation file', default='no', choices=['no','yes'])
+	parser.add_argument('-a', '--anonymize', help='anonymize all dbms', action='store_true', default=False)
+	parser.add_argument('-u', '--unanonymize', help='unanonymize some dbms, only sensible in combination with anonymize', nargs='*', default=[])
+	parser.add_argument('-p', '--numProcesses', help='Number of parallel client processes. Global setting, can be overwritten by connection.', default=None)
+	parser.add_argument('-s', '--seed', help='random seed', default=None)
+	parser.add_argument('-an', '--agent-name', help='agent: name of the agent, default is host and process id', default=None)
+	args = parser.parse_args()
+	# evaluate args
+	if args.debug:
+		logging.basicConfig(level=logging.DEBUG)
+		bBatch = True
+	else:
+		logging.basicConfig(level=logging.ERROR)
+		bBatch = args.batch
+	address = (args.host, int(args.port))
+	authkey = args.authkey.encode()
+	if args.mode == 'coordinator':
+		# merged results of all agents
+		experiments = benchmarker.benchmarker(
+			result_path=args.result_folder,
+			batch=bBatch,
+			fixedQuery=args.query,
+			fixedConnection=args.connection,
+			anonymize=args.anonymize,
+			unanonymize=args.unanonymize,
+			numProcesses=args.numProcesses,
+			seed=args.seed)
+		experiments.getConfig(args.config_folder, args.connection_file, args.query_file)
+		missing = distributed.coordinator(experiments, address, authkey, int(args.num_agents), args.split, args.start_barrier).run()
+		if len(missing) > 0:
+			print('Experiment {} is incomplete, {} units are missing'.format(experiments.code, len(missing)))
+		else:
+			print('Experiment {} has been finished'.format(experiments.code))
+		if args.generate_evaluation == 'yes':
+			experiments.overwrite = True
+			evaluator.evaluator(experiments, load=False, force=True)
+	elif args.mode == 'agent':
+		result_folder = args.result_folder if args.result_folder is not None else '.'
+		distributed.agent(result_folder, address, authkey, args.agent_name, bBatch).run()
@@ -98,7 +98,8 @@ if __name__ == '__main__':
                         #print(s[numRun][0])
                         print(s)
                         #exit()
-                        for numRun, result in enumerate(s):
+                        # result sets are read from result store only if needed
+                        for numRun in range(len(s)):
                             if args.num_run is not None and int(args.num_run) != numRun:
                                 continue
                             if not args.diff:
@@ -110,6 +111,9 @@ if __name__ == '__main__':
                                 continue
                             if len(r[c]) == 0:
                                 continue
+                            if isinstance(s, tools.resultSetList) and isinstance(r[c], tools.resultSetList) and s.getDigest(numRun) == r[c].getDigest(numRun):
+                                # equal digests, nothing to compare
+                                continue
                             print("numRun: "+str(numRun+1))
                             #print(data)
                             #print(data_stored, r[c][numRun])
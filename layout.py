@@ -318,6 +318,7 @@ def serve_layout(preview) -> html.Div:
                             dict(label='Heatmap Warnings', value='heatmap_warnings'),
                             dict(label='Heatmap Result Set Size', value='heatmap_result_set_size'),
                             dict(label='Heatmap Total Time', value='heatmap_total_time'),
+                            dict(label='Heatmap Latency Percentiles', value='heatmap_latency_percentiles'),
                             dict(label='Heatmap Latency Run', value='heatmap_latency_run'),
                             dict(label='Heatmap Throughput Run', value='heatmap_throughput_run'),
                             dict(label='Heatmap Timer Run Factor', value='heatmap_timer_run_factor'),
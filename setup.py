@@ -25,6 +25,7 @@ setuptools.setup(
     python_requires='>=3.6',
     include_package_data=True,
     install_requires=requirements,
+    extras_require={'parquet': ['pyarrow>=3.0.0']},
     package_dir={'dbmsbenchmarker': 'dbmsbenchmarker'},
     package_data={'dbmsbenchmarker': ['dbmsbenchmarker/latex/*']},
 )
\ No newline at end of file